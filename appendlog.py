@@ -0,0 +1,184 @@
+"""
+Append-only Logdatei mit Group-Commit
+=====================================
+
+Langlebiger Writer für ``placetel_logs.jsonl`` und ``fritzbox_calls.log``.
+
+Statt die Datei für jeden Eintrag zu öffnen und zu schließen, bleibt sie
+offen. Schreiben mehrere Threads gleichzeitig, übernimmt einer die Rolle
+des "Leaders" und schreibt alle bis dahin gesammelten Zeilen mit einem
+einzigen ``write``; die anderen warten, bis ihr Eintrag geschrieben ist.
+
+Haltbarkeit (``fsync``):
+    none     - nur ins Betriebssystem schreiben (wie bisher)
+    interval - höchstens alle ``fsync_interval`` Sekunden fsync; ein Timer
+               holt den fsync nach, wenn danach nichts mehr geschrieben wird
+    batch    - fsync nach jedem geschriebenen Batch
+
+Mehrere Prozesse (z.B. Worker) dürfen dieselbe Datei beschreiben: die Datei
+ist mit O_APPEND geöffnet und jeder Batch wird unter einem exklusiven
+``flock`` geschrieben, Zeilen werden also nie ineinander geschoben.
+
+Verwendung:
+    audit_log = AppendLog(LOG_FILE, fsync="batch")
+    audit_log.append({"ts": ts, "body": data})
+"""
+
+import json
+import os
+import threading
+import time
+
+try:
+    import fcntl
+except ImportError:  # Windows: O_APPEND allein muss reichen
+    fcntl = None
+
+FSYNC_POLICIES = ("none", "interval", "batch")
+
+
+class _Batch:
+    """Sammelt Zeilen, die gemeinsam geschrieben werden."""
+
+    __slots__ = ("chunks", "done", "error")
+
+    def __init__(self):
+        self.chunks = []
+        self.done = threading.Event()
+        self.error = None
+
+
+class AppendLog:
+    """Thread-sicherer Append-only Writer mit gebündelten Schreibzugriffen."""
+
+    def __init__(self, path, fsync="none", fsync_interval=1.0):
+        """
+        Args:
+            path: Pfad zur Logdatei (wird beim ersten Schreiben angelegt)
+            fsync: "none", "interval" oder "batch"
+            fsync_interval: Sekunden zwischen zwei fsync bei "interval"
+        """
+        if fsync not in FSYNC_POLICIES:
+            raise ValueError(f"fsync must be one of {', '.join(FSYNC_POLICIES)}")
+
+        self.path = path
+        self.fsync = fsync
+        self.fsync_interval = fsync_interval
+
+        self._lock = threading.Lock()
+        self._current = _Batch()
+        self._writing = False
+        self._fd = None
+        self._last_fsync = time.monotonic()
+
+        # fsync-Zustand bei "interval" (auch vom Timer-Thread benutzt)
+        self._sync_lock = threading.Lock()
+        self._sync_pending = False
+        self._sync_timer = None
+
+    def append(self, record):
+        """Schreibt ein JSON-Objekt als eine Zeile (blockiert bis geschrieben)."""
+        data = json.dumps(record, ensure_ascii=False).encode("utf-8") + b"\n"
+        self._append(data)
+
+    def append_line(self, text):
+        """Schreibt eine Textzeile (ohne abschließenden Zeilenumbruch übergeben)."""
+        self._append(text.encode("utf-8") + b"\n")
+
+    def _append(self, data):
+        with self._lock:
+            batch = self._current
+            batch.chunks.append(data)
+            leader = not self._writing
+            if leader:
+                self._writing = True
+
+        if leader:
+            self._drain()
+
+        batch.done.wait()
+        if batch.error is not None:
+            raise batch.error
+
+    def _drain(self):
+        """Leader: schreibt Batches, solange neue Zeilen nachkommen."""
+        while True:
+            with self._lock:
+                batch = self._current
+                if not batch.chunks:
+                    self._writing = False
+                    return
+                self._current = _Batch()
+
+            try:
+                self._write(b"".join(batch.chunks))
+            except Exception as e:
+                batch.error = e
+            finally:
+                batch.done.set()
+
+    def _open(self):
+        if self._fd is None:
+            self._fd = os.open(self.path, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+        return self._fd
+
+    def _write(self, data):
+        fd = self._open()
+
+        if fcntl is not None:
+            fcntl.flock(fd, fcntl.LOCK_EX)
+        try:
+            view = memoryview(data)
+            while view:
+                written = os.write(fd, view)
+                view = view[written:]
+        finally:
+            if fcntl is not None:
+                fcntl.flock(fd, fcntl.LOCK_UN)
+
+        if self.fsync == "batch":
+            os.fsync(fd)
+        elif self.fsync == "interval":
+            self._sync_later(fd)
+
+    def _sync_later(self, fd):
+        """fsync, wenn das Intervall um ist - sonst per Timer, sobald es abläuft."""
+        with self._sync_lock:
+            self._sync_pending = True
+            wait = self._last_fsync + self.fsync_interval - time.monotonic()
+            if wait <= 0:
+                self._sync(fd)
+            elif self._sync_timer is None:
+                self._sync_timer = threading.Timer(wait, self._sync_due)
+                self._sync_timer.daemon = True
+                self._sync_timer.start()
+
+    def _sync_due(self):
+        """Timer: synchronisiert Zeilen, nach denen nichts mehr geschrieben wurde."""
+        with self._sync_lock:
+            self._sync_timer = None
+            if self._sync_pending and self._fd is not None:
+                try:
+                    self._sync(self._fd)
+                except OSError:
+                    pass  # bleibt ausstehend, der nächste Append versucht es erneut
+
+    def _sync(self, fd):
+        # Aufruf nur mit self._sync_lock
+        os.fsync(fd)
+        self._sync_pending = False
+        self._last_fsync = time.monotonic()
+
+    def close(self):
+        """Synchronisiert und schließt die Datei (weitere Appends öffnen sie neu)."""
+        with self._lock:
+            fd, self._fd = self._fd, None
+        with self._sync_lock:
+            if self._sync_timer is not None:
+                self._sync_timer.cancel()
+                self._sync_timer = None
+            self._sync_pending = False
+        if fd is not None:
+            if self.fsync != "none":
+                os.fsync(fd)
+            os.close(fd)
@@ -0,0 +1,189 @@
+#!/usr/bin/env python3
+"""
+Benchmark: FritzBox-Monitor gegen den Call-Monitor-Simulator
+============================================================
+
+Startet ``bench/fritzbox_simulator.py`` auf einem freien lokalen Port und
+``fritzbox_monitor.py`` als eigenen Prozess mit einem temporären
+``DATA_DIR``. Während der Simulator Anrufe sendet, wird ``phone_lookup``
+alle paar Millisekunden abgefragt.
+
+Gemessen wird:
+
+- Durchsatz: Call-Monitor-Zeilen pro Sekunde, bis alle RINGs und
+  Sitzungen gespeichert sind
+- RING-bis-Zeile-Latenz: Zeit vom Senden des ersten RINGs bis die Zeile
+  in ``phone_lookup`` sichtbar ist (p50/p95/max, Auflösung = ``--poll``)
+- Verluste: fehlende RING-Zeilen und Sitzungen, doppelt gespeicherte RINGs
+
+Verwendung:
+    python3 bench/bench_monitor.py [--calls 2000] [--rate 200] [--burst 5] [--json out.json]
+"""
+
+import asyncio
+import json
+import os
+import pathlib
+import signal
+import sqlite3
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+
+BENCH_DIR = pathlib.Path(__file__).resolve().parent
+REPO_DIR = BENCH_DIR.parent
+sys.path.insert(0, str(BENCH_DIR))
+
+from fritzbox_simulator import build_parser, simulator_from_args  # noqa: E402
+
+
+def start_simulator(args):
+    """Startet den Simulator mit eigener Event-Loop in einem Hintergrund-Thread."""
+    ready = threading.Event()
+    holder = {}
+
+    def run():
+        loop = asyncio.new_event_loop()
+        simulator = simulator_from_args(args, port=0)
+        loop.run_until_complete(simulator.start())
+        holder.update(simulator=simulator, loop=loop)
+        ready.set()
+        loop.run_forever()
+
+    threading.Thread(target=run, name="simulator", daemon=True).start()
+    ready.wait()
+    return holder["simulator"], holder["loop"]
+
+
+def start_monitor(data_dir, port, praxis_number):
+    env = dict(
+        os.environ,
+        DATA_DIR=str(data_dir),
+        FRITZBOX_ENDPOINTS=f"127.0.0.1:{port}:{praxis_number}",
+        RING_SOCKET=str(pathlib.Path(data_dir) / "ringmatch.sock"),
+        LOG_CONSOLE="0",
+        LOG_LEVEL="WARNING",
+    )
+    return subprocess.Popen([sys.executable, str(REPO_DIR / "fritzbox_monitor.py")], cwd=REPO_DIR, env=env)
+
+
+def percentile(values, p):
+    if not values:
+        return None
+    values = sorted(values)
+    return values[min(len(values) - 1, int(round(p / 100 * (len(values) - 1))))]
+
+
+def run(args):
+    simulator, loop = start_simulator(args)
+
+    with tempfile.TemporaryDirectory(prefix="bench_monitor_") as data_dir:
+        monitor = start_monitor(data_dir, simulator.port, args.praxis_number)
+        try:
+            return measure(args, simulator, monitor, pathlib.Path(data_dir) / "database.db")
+        finally:
+            monitor.send_signal(signal.SIGTERM)
+            try:
+                monitor.wait(timeout=15)
+            except subprocess.TimeoutExpired:
+                monitor.kill()
+            loop.call_soon_threadsafe(loop.stop)
+
+
+def measure(args, simulator, monitor, db_file):
+    deadline = time.monotonic() + 30
+    while simulator.stats["connections"] == 0:
+        if monitor.poll() is not None or time.monotonic() > deadline:
+            raise SystemExit("❌ Monitor hat sich nicht mit dem Simulator verbunden")
+        time.sleep(0.01)
+
+    db = sqlite3.connect(db_file)
+    started = time.monotonic()
+    latencies = []
+    seen = {}
+    last_id = 0
+    sessions = 0
+    finished_at = None
+
+    while True:
+        rows = db.execute(
+            "SELECT id, caller_number FROM phone_lookup WHERE id > ? ORDER BY id", (last_id,)
+        ).fetchall()
+        now = time.monotonic()
+        for row_id, number in rows:
+            last_id = row_id
+            seen[number] = seen.get(number, 0) + 1
+            sent = simulator.sent.get(number)
+            if sent is not None and seen[number] == 1:
+                latencies.append(now - sent)
+
+        if simulator.finished.is_set():
+            sessions = db.execute("SELECT COUNT(*) FROM call_sessions").fetchone()[0]
+            expected_sessions = simulator.stats["calls"] + simulator.stats["outgoing"]
+            if len(seen) >= simulator.stats["calls"] and sessions >= expected_sessions:
+                finished_at = now
+                break
+            if finished_at is None and now - started > args.timeout:
+                break
+        elif now - started > args.timeout:
+            break
+
+        time.sleep(args.poll)
+
+    db.close()
+    elapsed = (finished_at or time.monotonic()) - started
+    stats = simulator.stats
+    return {
+        "calls": stats["calls"],
+        "lines": stats["lines"],
+        "rings_sent": stats["rings"],
+        "connections": stats["connections"],
+        "elapsed_s": round(elapsed, 3),
+        "lines_per_s": round(stats["lines"] / elapsed, 1) if elapsed else None,
+        "ring_latency_ms": {
+            "p50": _ms(percentile(latencies, 50)),
+            "p95": _ms(percentile(latencies, 95)),
+            "max": _ms(max(latencies) if latencies else None),
+        },
+        "dropped_rings": stats["calls"] - len(seen),
+        "duplicate_rows": sum(seen.values()) - len(seen),
+        "dropped_sessions": stats["calls"] + stats["outgoing"] - sessions,
+        "complete": finished_at is not None,
+    }
+
+
+def _ms(seconds):
+    return None if seconds is None else round(seconds * 1000, 2)
+
+
+def main():
+    parser = build_parser()
+    parser.description = "Benchmark des FritzBox-Monitors gegen den Call-Monitor-Simulator"
+    parser.set_defaults(rate=200.0, calls=2000, seed=1)
+    parser.add_argument("--poll", type=float, default=0.005, help="Abfrageintervall für phone_lookup (s)")
+    parser.add_argument("--timeout", type=float, default=120.0, help="Abbruch nach so vielen Sekunden")
+    parser.add_argument("--json", help="Ergebnis zusätzlich als JSON in diese Datei schreiben")
+    args = parser.parse_args()
+
+    result = run(args)
+
+    latency = result["ring_latency_ms"]
+    print(f"Anrufe:            {result['calls']} ({result['lines']} Zeilen, {result['connections']} Verbindung(en))")
+    print(f"Dauer:             {result['elapsed_s']:.2f} s")
+    print(f"Durchsatz:         {result['lines_per_s']} Zeilen/s")
+    print(f"RING -> Zeile:     p50 {latency['p50']} ms, p95 {latency['p95']} ms, max {latency['max']} ms")
+    print(f"Verloren:          {result['dropped_rings']} RINGs, {result['dropped_sessions']} Sitzungen")
+    print(f"Doppelt:           {result['duplicate_rows']} RING-Zeilen")
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(result, f, indent=2)
+
+    ok = result["complete"] and result["dropped_rings"] == 0 and result["duplicate_rows"] == 0
+    sys.exit(0 if ok else 1)
+
+
+if __name__ == "__main__":
+    main()
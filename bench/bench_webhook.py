@@ -0,0 +1,362 @@
+#!/usr/bin/env python3
+"""
+Benchmark: /placetel-Webhook
+============================
+
+Erzeugt realistische Placetel-Payloads und misst den Webhook-Pfad
+(Auth, JSON, Audit-Log, Insert, ggf. FritzBox-Zuordnung) getrennt nach
+Payload-Typ:
+
+- ``rueckruf``: Rückrufnummer im ``content`` (aus ``bench/data/content_corpus.jsonl``)
+- ``telefon``: keine Nummer im ``content``, ``phone``-Feld wird verwendet
+- ``weiterleitung``: ``phone`` ist die Praxisnummer - Zuordnung über ``phone_lookup``
+
+Alle Payloads haben ``category`` als Liste. Gemessen wird zweimal:
+
+- ``client``: Flask-Test-Client im selben Prozess (ohne HTTP)
+- ``server``: echter Multi-Thread-Server (Werkzeug) auf einem freien
+  Port, ``--concurrency`` Clients parallel
+
+Mit ``--url`` wird statt des eingebauten Servers ein laufender Server
+gemessen (dann nur ``server``; ``weiterleitung`` findet nur dort
+vorhandene RINGs).
+
+Mit ``--ring-socket`` läuft die RING-Zuordnung wie im Betrieb über den
+Socket des FritzBox-Monitors (im selben Prozess gestartet); der Lauf
+schlägt fehl, wenn dabei eine Weiterleitung auf SQLite ausweichen musste.
+
+Der Webhook-Server läuft mit einem temporären ``DATA_DIR``; ``INGEST_MODE``
+und die SQLite-Einstellungen werden aus dem Environment übernommen. Das
+Ergebnis kann mit ``--json`` gespeichert und zwischen Versionen
+verglichen werden.
+
+Verwendung:
+    python3 bench/bench_webhook.py [--requests 2000] [--concurrency 8] [--json webhook.json]
+    INGEST_MODE=async python3 bench/bench_webhook.py --mode server
+    python3 bench/bench_webhook.py --ring-socket --mix 0 0 100
+"""
+
+import argparse
+import http.client
+import json
+import os
+import pathlib
+import platform
+import random
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import urllib.parse
+
+BENCH_DIR = pathlib.Path(__file__).resolve().parent
+REPO_DIR = BENCH_DIR.parent
+CORPUS_FILE = BENCH_DIR / "data" / "content_corpus.jsonl"
+
+SECRET = "bench-secret"
+PAYLOAD_TYPES = ("rueckruf", "telefon", "weiterleitung")
+
+CATEGORIES = ["Termin", "Rezept", "Überweisung", "Befund", "Krankmeldung", "Sonstiges"]
+NAMES = ["Anna Schmidt", "Peter Meier", "Maria Schulz", "Jonas Becker", "Fatma Yilmaz", "Lukas Wagner"]
+INSURANCES = ["AOK", "TK", "Barmer", "DAK", "privat", None]
+CONTENTS_WITHOUT_NUMBER = [
+    "Der Anrufer hat keine Nummer hinterlassen und ruft später wieder an.",
+    "Patientin möchte einen Termin zur Kontrolle in der nächsten Woche.",
+    "Frage nach den Öffnungszeiten über die Feiertage.",
+    "Rezept für Ibuprofen 600 bitte zur Abholung vorbereiten.",
+]
+
+
+def load_numbered_contents():
+    with open(CORPUS_FILE, encoding="utf-8") as f:
+        cases = [json.loads(line) for line in f if line.strip()]
+    return [case["content"] for case in cases if case["expected"]]
+
+
+def make_payloads(count, mix, praxis_number, seed):
+    """Liste von (typ, payload) in zufälliger, aber reproduzierbarer Reihenfolge."""
+    rng = random.Random(seed)
+    numbered = load_numbered_contents()
+    types = rng.choices(PAYLOAD_TYPES, weights=mix, k=count)
+
+    payloads = []
+    for i, kind in enumerate(types):
+        payload = {
+            "caller_name": rng.choice(NAMES),
+            "caller_gender": rng.choice(["female", "male"]),
+            "caller_dob": f"{rng.randint(1, 28):02d}.{rng.randint(1, 12):02d}.{rng.randint(1940, 2010)}",
+            "insurance_provider": rng.choice(INSURANCES),
+            "category": rng.sample(CATEGORIES, rng.randint(1, 2)),
+        }
+        if kind == "rueckruf":
+            payload["content"] = rng.choice(numbered)
+            payload["phone"] = f"0151{i:08d}"
+        elif kind == "telefon":
+            payload["content"] = rng.choice(CONTENTS_WITHOUT_NUMBER)
+            payload["phone"] = f"0171{i:08d}"
+        else:
+            payload["content"] = rng.choice(CONTENTS_WITHOUT_NUMBER)
+            payload["phone"] = praxis_number
+        payloads.append((kind, payload))
+    return payloads
+
+
+def load_server(data_dir, ring_socket=False):
+    """
+    Importiert den Webhook-Server mit temporärem DATA_DIR und Benchmark-Secret.
+
+    Mit ``ring_socket`` wird der Zuordnungs-Dienst des FritzBox-Monitors
+    gestartet, sonst läuft die Zuordnung nur über SQLite.
+    """
+    os.environ.update(
+        DATA_DIR=str(data_dir),
+        PLACETEL_SECRET=SECRET,
+        DASHBOARD_USERNAME=os.environ.get("DASHBOARD_USERNAME", "bench"),
+        DASHBOARD_PASSWORD=os.environ.get("DASHBOARD_PASSWORD", "bench"),
+        RING_SOCKET=str(pathlib.Path(data_dir) / "ringmatch.sock") if ring_socket else "",
+        LOG_CONSOLE="0",
+        LOG_LEVEL=os.environ.get("LOG_LEVEL", "WARNING"),
+    )
+    sys.path.insert(0, str(REPO_DIR))
+    import fritzbox_monitor
+    import webhook_server_prod as server
+
+    server.init_storage(server.DB_FILE, log=server.logger.info)
+    server.init_db()
+    fritzbox_monitor.create_lookup_table()
+    if ring_socket:
+        fritzbox_monitor.start_ring_service()
+        if fritzbox_monitor.ring_service is None:
+            raise SystemExit("❌ RING-Socket konnte nicht geöffnet werden")
+    server.start_background_services()
+    return server
+
+
+def seed_rings(server, count):
+    """Legt ``count`` ungematchte RINGs um die aktuelle Zeit an (für ``weiterleitung``)."""
+    ring_service = sys.modules["fritzbox_monitor"].ring_service
+    now = int(time.time())
+    rows = [(now + i % 60, f"0160{i:08d}", f"+49160{i:08d}", server.PRAXIS_NUMBER) for i in range(count)]
+    with server.get_db() as db:
+        db.execute("BEGIN IMMEDIATE")
+        ids = [db.execute(
+            "INSERT INTO phone_lookup (timestamp, caller_number, caller_e164, called_number) VALUES (?, ?, ?, ?)",
+            row,
+        ).lastrowid for row in rows]
+        db.commit()
+
+    # Wie save_events im Monitor: gespeicherte RINGs auch im Speicher vorhalten
+    if ring_service is not None:
+        for row, entry_id in zip(rows, ids):
+            ring_service.add(row[0], {"id": entry_id, "caller_number": row[1]})
+
+
+def run_client(server, payloads):
+    """Sequentiell über den Flask-Test-Client."""
+    client = server.app.test_client()
+    headers = {"Authorization": f"Bearer {SECRET}"}
+    samples = []
+
+    started = time.perf_counter()
+    for kind, payload in payloads:
+        t0 = time.perf_counter()
+        response = client.post("/placetel", json=payload, headers=headers)
+        samples.append((kind, time.perf_counter() - t0, response.status_code == 200))
+    return samples, time.perf_counter() - started
+
+
+def run_http(url, secret, payloads, concurrency):
+    """Parallel über HTTP, eine Keep-Alive-Verbindung pro Client-Thread."""
+    target = urllib.parse.urlsplit(url)
+    path = target.path.rstrip("/") + "/placetel"
+    headers = {"Authorization": f"Bearer {secret}", "Content-Type": "application/json"}
+    bodies = [(kind, json.dumps(payload).encode("utf-8")) for kind, payload in payloads]
+    samples = []
+    lock = threading.Lock()
+    next_index = iter(range(len(bodies)))
+
+    def worker():
+        conn = http.client.HTTPConnection(target.hostname, target.port, timeout=30)
+        local = []
+        while True:
+            with lock:
+                i = next(next_index, None)
+            if i is None:
+                break
+            kind, body = bodies[i]
+            t0 = time.perf_counter()
+            for attempt in (1, 2):
+                try:
+                    conn.request("POST", path, body, headers)
+                    response = conn.getresponse()
+                    response.read()
+                    ok = response.status == 200
+                    break
+                except (http.client.RemoteDisconnected, ConnectionResetError, BrokenPipeError):
+                    # Server hat die Keep-Alive-Verbindung geschlossen (z.B. Worker-Recycling)
+                    conn.close()
+                    ok = False
+                except (OSError, http.client.HTTPException):
+                    conn.close()
+                    ok = False
+                    break
+            local.append((kind, time.perf_counter() - t0, ok))
+        conn.close()
+        with lock:
+            samples.extend(local)
+
+    threads = [threading.Thread(target=worker) for _ in range(concurrency)]
+    started = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return samples, time.perf_counter() - started
+
+
+def run_server(server, payloads, concurrency):
+    """Startet den Werkzeug-Server (threaded) auf einem freien Port und misst per HTTP."""
+    from werkzeug.serving import WSGIRequestHandler, make_server
+
+    class QuietHandler(WSGIRequestHandler):
+        protocol_version = "HTTP/1.1"  # Keep-Alive
+
+        def log_request(self, *args, **kwargs):
+            pass
+
+    httpd = make_server("127.0.0.1", 0, server.app, threaded=True, request_handler=QuietHandler)
+    thread = threading.Thread(target=httpd.serve_forever, daemon=True)
+    thread.start()
+    try:
+        return run_http(f"http://127.0.0.1:{httpd.server_port}", SECRET, payloads, concurrency)
+    finally:
+        httpd.shutdown()
+        thread.join()
+
+
+def percentile(values, p):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(round(p / 100 * (len(values) - 1))))]
+
+
+def summarize(samples, elapsed):
+    def stats(latencies, errors):
+        if not latencies:
+            return {"requests": 0, "errors": errors}
+        return {
+            "requests": len(latencies) + errors,
+            "errors": errors,
+            "mean_ms": round(sum(latencies) / len(latencies) * 1000, 3),
+            "p50_ms": round(percentile(latencies, 50) * 1000, 3),
+            "p95_ms": round(percentile(latencies, 95) * 1000, 3),
+            "p99_ms": round(percentile(latencies, 99) * 1000, 3),
+        }
+
+    result = {
+        "requests": len(samples),
+        "elapsed_s": round(elapsed, 3),
+        "requests_per_s": round(len(samples) / elapsed, 1) if elapsed else None,
+        "all": stats([t for _, t, ok in samples if ok], sum(1 for _, _, ok in samples if not ok)),
+        "by_type": {},
+    }
+    for kind in PAYLOAD_TYPES:
+        latencies = [t for k, t, ok in samples if k == kind and ok]
+        errors = sum(1 for k, _, ok in samples if k == kind and not ok)
+        if latencies or errors:
+            result["by_type"][kind] = stats(latencies, errors)
+    return result
+
+
+def print_result(name, result):
+    print(f"\n{name}: {result['requests']} Requests in {result['elapsed_s']:.2f} s "
+          f"= {result['requests_per_s']} req/s")
+    print(f"  {'Typ':<14} {'n':>6} {'Fehler':>6} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8}")
+    for kind, stats in [("alle", result["all"])] + list(result["by_type"].items()):
+        print(f"  {kind:<14} {stats['requests']:>6} {stats['errors']:>6} {stats.get('p50_ms', '-'):>8} "
+              f"{stats.get('p95_ms', '-'):>8} {stats.get('p99_ms', '-'):>8}")
+
+
+def git_revision():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=REPO_DIR, capture_output=True,
+                              text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark des /placetel-Webhooks")
+    parser.add_argument("--requests", type=int, default=2000, help="Requests pro Messung")
+    parser.add_argument("--concurrency", type=int, default=8, help="Parallele Clients im Server-Modus")
+    parser.add_argument("--mode", choices=("both", "client", "server"), default="both")
+    parser.add_argument("--mix", type=float, nargs=3, default=(50, 30, 20), metavar=("RUECKRUF", "TELEFON", "WL"),
+                        help="Gewichtung der Payload-Typen rueckruf/telefon/weiterleitung")
+    parser.add_argument("--url", help="Laufenden Server messen statt des eingebauten (z.B. http://127.0.0.1:54351)")
+    parser.add_argument("--secret", default=os.environ.get("PLACETEL_SECRET"), help="Bearer-Token für --url")
+    parser.add_argument("--praxis-number", default="200893")
+    parser.add_argument("--ring-socket", action="store_true",
+                        help="Zuordnung über den Socket des FritzBox-Monitors statt nur über SQLite")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--json", help="Ergebnis zusätzlich als JSON in diese Datei schreiben")
+    args = parser.parse_args()
+
+    output = {
+        "meta": {
+            "revision": git_revision(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "requests": args.requests,
+            "concurrency": args.concurrency,
+            "mix": dict(zip(PAYLOAD_TYPES, args.mix)),
+            "ingest_mode": os.environ.get("INGEST_MODE", "sync"),
+            "url": args.url,
+            "ring_socket": args.ring_socket,
+        },
+        "results": {},
+    }
+
+    if args.url:
+        if not args.secret:
+            raise SystemExit("❌ --secret oder PLACETEL_SECRET für --url angeben")
+        payloads = make_payloads(args.requests, args.mix, args.praxis_number, args.seed)
+        output["results"]["server"] = summarize(*run_http(args.url, args.secret, payloads, args.concurrency))
+    else:
+        with tempfile.TemporaryDirectory(prefix="bench_webhook_") as data_dir:
+            server = load_server(data_dir, ring_socket=args.ring_socket)
+            try:
+                modes = ("client", "server") if args.mode == "both" else (args.mode,)
+                for i, mode in enumerate(modes):
+                    payloads = make_payloads(args.requests, args.mix, server.PRAXIS_NUMBER, args.seed + i)
+                    seed_rings(server, sum(1 for kind, _ in payloads if kind == "weiterleitung"))
+                    if mode == "client":
+                        samples, elapsed = run_client(server, payloads)
+                    else:
+                        samples, elapsed = run_server(server, payloads, args.concurrency)
+                    output["results"][mode] = summarize(samples, elapsed)
+                output["meta"]["match_stats"] = dict(server.match_stats)
+            finally:
+                server.stop_background_services()
+                sys.modules["fritzbox_monitor"].stop_ring_service()
+
+    for mode, result in output["results"].items():
+        print_result(mode, result)
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(output, f, indent=2, ensure_ascii=False)
+        print(f"\n💾 Ergebnis gespeichert: {args.json}")
+
+    errors = sum(result["all"]["errors"] for result in output["results"].values())
+    if args.ring_socket and not args.url:
+        match_stats = output["meta"]["match_stats"]
+        print(f"\n🔌 Socket: {match_stats['socket_matched']} zugeordnet, "
+              f"{match_stats['socket_fallbacks']} auf SQLite ausgewichen")
+        if match_stats["socket_fallbacks"]:
+            print("❌ Zuordnung über den Socket ist auf SQLite ausgewichen")
+            errors += match_stats["socket_fallbacks"]
+    sys.exit(0 if errors == 0 else 1)
+
+
+if __name__ == "__main__":
+    main()
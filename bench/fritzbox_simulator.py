@@ -0,0 +1,216 @@
+#!/usr/bin/env python3
+"""
+FritzBox Call-Monitor-Simulator
+===============================
+
+Lauscht auf einem lokalen TCP-Port und sendet Call-Monitor-Zeilen wie
+eine FritzBox (Port 1012):
+
+    RING (mehrfach pro Anruf) -> CONNECT -> DISCONNECT   (angenommen)
+    RING (mehrfach pro Anruf) -> DISCONNECT;0            (verpasst)
+    CALL -> CONNECT -> DISCONNECT                        (ausgehend)
+
+Einstellbar sind Anrufrate, Bursts, doppelte RINGs, Zeilen, die auf
+mehrere TCP-Pakete verteilt werden, und Verbindungsabbrüche. Damit lässt
+sich ``fritzbox_monitor.py`` ohne echte FritzBox testen:
+
+    python3 bench/fritzbox_simulator.py --port 10120 --rate 20 --calls 500
+    FRITZBOX_ENDPOINTS=127.0.0.1:10120:200893 python3 fritzbox_monitor.py
+
+Jeder Anruf hat eine eindeutige Anrufernummer; ``sent`` enthält den
+Sendezeitpunkt des ersten RINGs pro Nummer (für Latenzmessungen in
+``bench/bench_monitor.py``).
+"""
+
+import argparse
+import asyncio
+import random
+import time
+from datetime import datetime
+
+
+class FritzBoxSimulator:
+    """Call-Monitor-Server, der eine konfigurierbare Anruf-Last erzeugt."""
+
+    def __init__(self, host="127.0.0.1", port=0, praxis_number="200893", rate=10.0, calls=100,
+                 burst=1, duplicate_rings=2, answered_ratio=0.7, outgoing_ratio=0.1,
+                 split_lines=0.1, disconnect_every=0, seed=None):
+        """
+        Args:
+            rate: Anrufe pro Sekunde (0 = so schnell wie möglich)
+            calls: Anzahl eingehender Anrufe insgesamt
+            burst: Anrufe, die jeweils gleichzeitig klingeln
+            duplicate_rings: RING-Zeilen pro Anruf (FritzBox sendet pro Klingelton eine)
+            answered_ratio: Anteil angenommener Anrufe
+            outgoing_ratio: Zusätzliche ausgehende Anrufe pro eingehendem
+            split_lines: Anteil der Schreibvorgänge, die mitten in einer Zeile getrennt werden
+            disconnect_every: Verbindung nach so vielen Anrufen schließen (0 = nie)
+        """
+        self.host = host
+        self.port = port
+        self.praxis_number = praxis_number
+        self.rate = rate
+        self.calls = calls
+        self.burst = max(1, burst)
+        self.duplicate_rings = max(1, duplicate_rings)
+        self.answered_ratio = answered_ratio
+        self.outgoing_ratio = outgoing_ratio
+        self.split_lines = split_lines
+        self.disconnect_every = disconnect_every
+        self.random = random.Random(seed)
+
+        self.sent = {}  # Anrufernummer -> Sendezeit (time.monotonic) des ersten RINGs
+        self.stats = {"lines": 0, "rings": 0, "calls": 0, "answered": 0, "outgoing": 0,
+                      "connections": 0, "disconnects": 0}
+        self.finished = asyncio.Event()
+
+        self._server = None
+        self._next_call = 0
+        self._connection_ids = iter(range(10 ** 9))
+
+    async def start(self):
+        self._server = await asyncio.start_server(self._serve, self.host, self.port)
+        self.port = self._server.sockets[0].getsockname()[1]
+        return self.port
+
+    async def stop(self):
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+
+    def _line(self, *fields):
+        stamp = datetime.now().strftime("%d.%m.%y %H:%M:%S")
+        return ";".join((stamp,) + tuple(str(field) for field in fields)) + ";\n"
+
+    async def _write(self, writer, lines):
+        """Sendet Zeilen; ein Teil wird mitten in einer Zeile auf zwei Writes verteilt."""
+        data = "".join(lines).encode("utf-8")
+        if len(data) > 1 and self.random.random() < self.split_lines:
+            cut = self.random.randrange(1, len(data))
+            writer.write(data[:cut])
+            await writer.drain()
+            await asyncio.sleep(0)
+            data = data[cut:]
+        writer.write(data)
+        await writer.drain()
+        self.stats["lines"] += len(lines)
+
+    def _burst_lines(self, count):
+        """Zeilen für ``count`` gleichzeitig eingehende Anrufe (RINGs zuerst, dann Ende)."""
+        calls = []
+        for _ in range(count):
+            number = f"0151{self._next_call:08d}"
+            self._next_call += 1
+            calls.append((next(self._connection_ids) % 1000, number, self.random.random() < self.answered_ratio))
+
+        rings = []
+        for _ in range(self.duplicate_rings):
+            rings += [self._line("RING", cid, number, self.praxis_number, "SIP0") for cid, number, _ in calls]
+
+        endings = []
+        for cid, number, answered in calls:
+            if answered:
+                duration = self.random.randint(10, 600)
+                endings.append(self._line("CONNECT", cid, 4, number))
+                endings.append(self._line("DISCONNECT", cid, duration))
+                self.stats["answered"] += 1
+            else:
+                endings.append(self._line("DISCONNECT", cid, 0))
+
+        if self.random.random() < self.outgoing_ratio:
+            cid = next(self._connection_ids) % 1000
+            target = f"030{self.random.randint(1000000, 9999999)}"
+            endings += [self._line("CALL", cid, 4, self.praxis_number, target, "SIP0"),
+                        self._line("CONNECT", cid, 4, target),
+                        self._line("DISCONNECT", cid, self.random.randint(10, 300))]
+            self.stats["outgoing"] += 1
+
+        return calls, rings, endings
+
+    async def _serve(self, reader, writer):
+        self.stats["connections"] += 1
+        interval = self.burst / self.rate if self.rate > 0 else 0
+        since_connect = 0
+        next_at = time.monotonic()
+
+        try:
+            while self._next_call < self.calls:
+                count = min(self.burst, self.calls - self._next_call)
+                calls, rings, endings = self._burst_lines(count)
+
+                now = time.monotonic()
+                for _, number, _ in calls:
+                    self.sent[number] = now
+                await self._write(writer, rings)
+                await self._write(writer, endings)
+                self.stats["rings"] += len(rings)
+                self.stats["calls"] += count
+                since_connect += count
+
+                if self.disconnect_every and since_connect >= self.disconnect_every:
+                    self.stats["disconnects"] += 1
+                    return
+
+                next_at += interval
+                delay = next_at - time.monotonic()
+                if delay > 0:
+                    await asyncio.sleep(delay)
+                else:
+                    await asyncio.sleep(0)
+
+            self.finished.set()
+            # Verbindung offen halten wie eine echte FritzBox
+            await reader.read()
+
+        except (ConnectionError, asyncio.CancelledError):
+            pass
+
+        finally:
+            writer.close()
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(description="Simuliert den Call Monitor einer FritzBox")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=10120)
+    parser.add_argument("--praxis-number", default="200893")
+    parser.add_argument("--rate", type=float, default=10.0, help="Anrufe pro Sekunde (0 = unbegrenzt)")
+    parser.add_argument("--calls", type=int, default=100, help="Anzahl eingehender Anrufe")
+    parser.add_argument("--burst", type=int, default=1, help="Gleichzeitig klingelnde Anrufe")
+    parser.add_argument("--duplicate-rings", type=int, default=2, help="RING-Zeilen pro Anruf")
+    parser.add_argument("--answered-ratio", type=float, default=0.7)
+    parser.add_argument("--outgoing-ratio", type=float, default=0.1)
+    parser.add_argument("--split-lines", type=float, default=0.1,
+                        help="Anteil der Writes, die mitten in einer Zeile getrennt werden")
+    parser.add_argument("--disconnect-every", type=int, default=0,
+                        help="Verbindung nach N Anrufen trennen (0 = nie)")
+    parser.add_argument("--seed", type=int, default=None)
+    return parser
+
+
+def simulator_from_args(args, port=None):
+    return FritzBoxSimulator(
+        host=args.host, port=args.port if port is None else port, praxis_number=args.praxis_number,
+        rate=args.rate, calls=args.calls, burst=args.burst, duplicate_rings=args.duplicate_rings,
+        answered_ratio=args.answered_ratio, outgoing_ratio=args.outgoing_ratio,
+        split_lines=args.split_lines, disconnect_every=args.disconnect_every, seed=args.seed,
+    )
+
+
+async def _main(args):
+    simulator = simulator_from_args(args)
+    port = await simulator.start()
+    print(f"📞 FritzBox-Simulator auf {args.host}:{port} - {args.calls} Anrufe mit {args.rate}/s")
+    try:
+        await simulator.finished.wait()
+        print(f"✅ Fertig: {simulator.stats}")
+        await asyncio.Event().wait()  # weiterlaufen, bis Ctrl+C
+    finally:
+        await simulator.stop()
+
+
+if __name__ == "__main__":
+    try:
+        asyncio.run(_main(build_parser().parse_args()))
+    except KeyboardInterrupt:
+        pass
@@ -0,0 +1,108 @@
+#!/usr/bin/env python3
+"""
+Micro-Benchmark: Rückrufnummern-Extraktion
+==========================================
+
+Vergleicht ``phone_extract.extract_phone`` mit der früheren Implementierung
+(drei unkompilierte Patterns nacheinander, zwei ``re.sub`` pro Treffer) auf
+dem Korpus ``bench/data/content_corpus.jsonl``.
+
+Vorher wird geprüft, ob die neue Implementierung für jeden Korpus-Eintrag
+das erwartete Ergebnis liefert.
+
+Verwendung:
+    python3 bench/phone_extract_bench.py [--repeat 2000] [--rounds 5]
+"""
+
+import argparse
+import json
+import pathlib
+import re
+import sys
+import time
+
+sys.path.insert(0, str(pathlib.Path(__file__).resolve().parent.parent))
+
+from phone_extract import extract_phone, extract_phones  # noqa: E402
+
+CORPUS_FILE = pathlib.Path(__file__).with_name("data") / "content_corpus.jsonl"
+
+
+def legacy_extract_phone_from_content(content):
+    """Frühere Implementierung (ohne print), nur zum Vergleich."""
+    if not content:
+        return None
+
+    import re
+
+    patterns = [
+        r'[Rr]ückrufnummer:\s*(\+?\d[\d\s\-\(\)]+)',
+        r'[Tt]elefonnummer:\s*(\+?\d[\d\s\-\(\)]+)',
+        r'[Rr]ückruf:\s*(\+?\d[\d\s\-\(\)]+)',
+    ]
+
+    for pattern in patterns:
+        match = re.search(pattern, content)
+        if match:
+            phone = match.group(1)
+            phone = re.sub(r'[\s\-\(\)]', '', phone)
+            if len(re.sub(r'[^\d]', '', phone)) >= 6:
+                return phone
+
+    return None
+
+
+def load_corpus():
+    with open(CORPUS_FILE, encoding="utf-8") as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+
+def check(corpus):
+    """Prüft die neue Implementierung gegen die erwarteten Werte."""
+    failures = 0
+    for case in corpus:
+        result = extract_phone(case["content"])
+        if result != case["expected"]:
+            failures += 1
+            print(f"❌ {case['content']!r}: {result!r} (erwartet {case['expected']!r})")
+    print(f"✓ {len(corpus) - failures}/{len(corpus)} Korpus-Einträge korrekt")
+    return failures == 0
+
+
+def timed(label, func, contents, repeat, rounds):
+    """Bester von ``rounds`` Durchgängen (wie timeit), damit Störungen nicht mitzählen."""
+    elapsed = float("inf")
+    for _ in range(rounds):
+        started = time.perf_counter()
+        for _ in range(repeat):
+            func(contents)
+        elapsed = min(elapsed, time.perf_counter() - started)
+    per_call = elapsed / (repeat * len(contents)) * 1e6
+    print(f"{label:<28} {per_call:8.2f} µs/content   ({repeat * len(contents) / elapsed:>12,.0f} contents/s)")
+    return per_call
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark der Rückrufnummern-Extraktion")
+    parser.add_argument("--repeat", type=int, default=2000, help="Durchläufe über den Korpus")
+    parser.add_argument("--rounds", type=int, default=5, help="Durchgänge, der schnellste zählt")
+    args = parser.parse_args()
+
+    corpus = load_corpus()
+    ok = check(corpus)
+
+    contents = [case["content"] for case in corpus]
+    legacy = timed("legacy (3 Patterns + re.sub)", lambda cs: [legacy_extract_phone_from_content(c) for c in cs],
+                   contents, args.repeat, args.rounds)
+    single = timed("extract_phone", lambda cs: [extract_phone(c) for c in cs], contents, args.repeat, args.rounds)
+    timed("extract_phones (Batch)", extract_phones, contents, args.repeat, args.rounds)
+    print(f"Faktor: {legacy / single:.1f}x")
+
+    # Kompilierte Patterns des legacy-Codes nicht versehentlich im re-Cache verstecken
+    re.purge()
+
+    sys.exit(0 if ok else 1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,160 @@
+"""
+Zähler für die Statistik-Karten (Trigger statt COUNT(*))
+========================================================
+
+``call_counters`` hält je Name eine Zahl:
+
+    total            alle Anrufe
+    status:new       offene Anrufe
+    status:done      erledigte Anrufe
+    day:2024-05-17   Anrufe pro Tag (Ortszeit des Servers)
+    version          Datenstand: steigt bei jeder Änderung an ``calls``
+
+Trigger auf ``calls`` passen die Zähler bei INSERT, DELETE und bei
+Änderungen von ``status`` oder ``timestamp`` an. Die Karten im Dashboard
+und ``/api/stats`` lesen so nur wenige Zeilen über den Primärschlüssel,
+egal wie viele Anrufe gespeichert sind.
+
+``version`` erhöht sich bei jedem INSERT, UPDATE und DELETE - egal ob
+Webhook, Dashboard, Import oder ein anderer Prozess schreibt. Solange sie
+gleich bleibt, hat sich an den Anrufen nichts geändert (ETags).
+
+Der Bulk-Import entfernt die Trigger vorübergehend und zählt am Ende
+einmal neu (``recompute_counters``); ``version`` steigt dabei weiter.
+
+Verwendung:
+    create_counters(db)                     # in init_db
+    stats = read_stats(db)                  # {"total": …, "new": …, "done": …, "today": …}
+    version = read_version(db)              # für ETags
+"""
+
+from datetime import date, timedelta
+
+# Trigger auf calls, die die Zähler aktuell halten (Bulk-Import entfernt sie vorübergehend)
+COUNTER_TRIGGERS = ("call_counters_insert", "call_counters_delete", "call_counters_update",
+                    "call_counters_version")
+
+# Tag eines Anrufs wie datetime.now() im Server: Unix-Zeit in Ortszeit
+_DAY_SQL = "'day:' || date({row}.timestamp, 'unixepoch', 'localtime')"
+
+
+def _bump(name_sql, delta, condition="1"):
+    return f"""
+        INSERT INTO call_counters (name, value) SELECT {name_sql}, {delta} WHERE {condition}
+        ON CONFLICT(name) DO UPDATE SET value = value + ({delta});"""
+
+
+def _bump_row(row, delta):
+    return (_bump("'total'", delta)
+            + _bump(f"'status:' || {row}.status", delta, f"{row}.status IS NOT NULL")
+            + _bump(_DAY_SQL.format(row=row), delta, f"{row}.timestamp IS NOT NULL"))
+
+
+_CREATE_TABLE_SQL = """
+CREATE TABLE IF NOT EXISTS call_counters (
+    name TEXT PRIMARY KEY,
+    value INTEGER NOT NULL
+) WITHOUT ROWID
+"""
+
+_CREATE_TRIGGERS_SQL = (
+    f"""
+    CREATE TRIGGER IF NOT EXISTS call_counters_insert AFTER INSERT ON calls BEGIN
+        {_bump_row("new", 1)}
+        {_bump("'version'", 1)}
+    END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS call_counters_delete AFTER DELETE ON calls BEGIN
+        {_bump_row("old", -1)}
+        {_bump("'version'", 1)}
+    END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS call_counters_update AFTER UPDATE OF status, timestamp ON calls
+    WHEN old.status IS NOT new.status OR old.timestamp IS NOT new.timestamp BEGIN
+        {_bump_row("old", -1)}
+        {_bump_row("new", 1)}
+    END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS call_counters_version AFTER UPDATE ON calls BEGIN
+        {_bump("'version'", 1)}
+    END
+    """,
+)
+
+
+def create_counters(db):
+    """
+    Legt ``call_counters`` und die Trigger an; eine neue Tabelle wird einmal gefüllt.
+
+    Returns:
+        True wenn die Zähler neu angelegt wurden
+    """
+    exists = db.execute("SELECT 1 FROM sqlite_master WHERE name = 'call_counters'").fetchone() is not None
+    if not exists:
+        db.execute(_CREATE_TABLE_SQL)
+        recompute_counters(db)
+    create_counter_triggers(db)
+    return not exists
+
+
+def create_counter_triggers(db):
+    for sql in _CREATE_TRIGGERS_SQL:
+        db.execute(sql)
+
+
+def drop_counter_triggers(db):
+    for name in COUNTER_TRIGGERS:
+        db.execute(f"DROP TRIGGER IF EXISTS {name}")
+
+
+def recompute_counters(db):
+    """Zählt alle Anrufe einmal neu durch (z.B. nach dem Bulk-Import)."""
+    db.execute("DELETE FROM call_counters WHERE name != 'version'")
+    db.execute("""
+    INSERT INTO call_counters (name, value)
+    SELECT 'total', COUNT(*) FROM calls
+    UNION ALL
+    SELECT 'status:' || status, COUNT(*) FROM calls WHERE status IS NOT NULL GROUP BY status
+    UNION ALL
+    SELECT 'day:' || date(timestamp, 'unixepoch', 'localtime'), COUNT(*) FROM calls
+    WHERE timestamp IS NOT NULL GROUP BY date(timestamp, 'unixepoch', 'localtime')
+    """)
+    db.execute(_bump("'version'", 1))
+
+
+def read_version(db):
+    """Aktueller Datenstand von ``calls`` (ein Lookup über den Primärschlüssel)."""
+    row = db.execute("SELECT value FROM call_counters WHERE name = 'version'").fetchone()
+    return row[0] if row else 0
+
+
+def read_stats(db, today=None, days=0):
+    """
+    Zahlen für die Statistik-Karten.
+
+    Args:
+        db: Verbindung zur Datenbank
+        today: Stichtag für "Heute" (Standard: date.today())
+        days: zusätzlich die Anrufe der letzten ``days`` Tage einzeln (``by_day``)
+
+    Returns:
+        dict mit total, new, done, today (und by_day: {"2024-05-17": 12, ...})
+    """
+    today = today or date.today()
+    day_names = [f"day:{today - timedelta(days=offset)}" for offset in range(max(days, 1))]
+    names = ["total", "status:new", "status:done"] + day_names
+    placeholders = ", ".join("?" * len(names))
+    counts = dict(db.execute(f"SELECT name, value FROM call_counters WHERE name IN ({placeholders})", names).fetchall())
+
+    stats = {
+        "total": counts.get("total", 0),
+        "new": counts.get("status:new", 0),
+        "done": counts.get("status:done", 0),
+        "today": counts.get(day_names[0], 0),
+    }
+    if days:
+        stats["by_day"] = {name[len("day:"):]: counts.get(name, 0) for name in day_names}
+    return stats
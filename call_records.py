@@ -0,0 +1,188 @@
+"""
+Anrufdatensätze aus dem Placetel-Log
+====================================
+
+Reine Verarbeitungsfunktionen ohne Seiteneffekte beim Import: aus einem
+Webhook-Body werden die Spaltenwerte der ``calls``-Tabelle.
+
+Das Modul wird vom Webhook-Server und von den Worker-Prozessen des
+parallelen Bulk-Imports geladen. Es darf deshalb weder Environment
+Variables voraussetzen noch Verbindungen oder Threads anlegen.
+
+Paralleler Import:
+    ranges = split_log_ranges(LOG_FILE, parts=8)
+    with ProcessPoolExecutor() as pool:
+        for records in pool.map(parse_log_range, repeat(LOG_FILE), *zip(*ranges)):
+            ...  # Reihenfolge der Datei bleibt erhalten
+"""
+
+import json
+import logging
+import os
+
+from phone_extract import extract_phone, extract_phones
+from phone_normalize import to_e164
+
+# Mindestgröße eines Bereichs für den parallelen Import
+MIN_RANGE_BYTES = 1024 * 1024
+# Zeilen, deren content gemeinsam per extract_phones verarbeitet wird
+EXTRACT_BATCH = 500
+
+# Kind-Logger des Webhook-Servers (landet in dessen Logdatei, ohne hier Handler anzulegen)
+logger = logging.getLogger("webhook_server.call_records")
+
+# Platzhalter: Nummer wurde noch nicht aus dem content extrahiert
+_NOT_EXTRACTED = object()
+
+
+def prepare_call(log_ts, body, extracted_phone=_NOT_EXTRACTED):
+    """
+    Baut aus einem Webhook-Body die Spaltenwerte für die calls-Tabelle.
+
+    Die FritzBox-Zuordnung bei Weiterleitungen passiert erst beim
+    Speichern (``store_call`` im Webhook-Server), da sie eine
+    DB-Verbindung braucht.
+
+    Args:
+        log_ts: Zeitstempel des Log-Eintrags
+        body: Webhook-Body (dict)
+        extracted_phone: Bereits per ``extract_phones`` ermittelte
+            Rückrufnummer (Batch-Import); sonst wird sie hier extrahiert
+
+    Returns:
+        dict mit den Spaltenwerten (Keys wie in INSERT_CALL_SQL)
+    """
+    # Extract category (comes as array, store as comma-separated string)
+    category_data = body.get("category")
+    category_str = None
+    if category_data:
+        if isinstance(category_data, list):
+            category_str = ", ".join(category_data)
+        else:
+            category_str = str(category_data)
+
+    # STRATEGIE 1: Versuche Rückrufnummer aus content zu extrahieren (BESTE Methode!)
+    phone_number = None
+    content = body.get("content")
+
+    if extracted_phone is _NOT_EXTRACTED:
+        extracted_phone = extract_phone(content)
+    if extracted_phone:
+        phone_number = extracted_phone
+
+    # STRATEGIE 2: Falls keine Nummer im content, nutze phone-Feld
+    if not phone_number:
+        phone_number = body.get("phone")
+
+    # Call reason: Nutze call_reason, falls vorhanden, sonst content als Fallback
+    call_reason = body.get("call_reason")
+    if not call_reason and content:
+        # Fallback: Nutze content, aber kürze auf max 200 Zeichen
+        call_reason = content[:200] if len(content) > 200 else content
+
+    return {
+        "log_ts": log_ts,
+        "timestamp": int(log_ts),
+        "caller_name": body.get("caller_name"),
+        "caller_gender": body.get("caller_gender"),
+        "caller_dob": body.get("caller_dob"),
+        "phone": phone_number,
+        "phone_e164": to_e164(phone_number),
+        "call_reason": call_reason,
+        "insurance_provider": body.get("insurance_provider"),
+        "category": category_str,
+    }
+
+
+def complete_length(path):
+    """Länge der Datei bis einschließlich des letzten Zeilenumbruchs."""
+    with open(path, "rb") as f:
+        end = f.seek(0, os.SEEK_END)
+        block = 64 * 1024
+        while end > 0:
+            start = max(0, end - block)
+            f.seek(start)
+            data = f.read(end - start)
+            newline = data.rfind(b"\n")
+            if newline != -1:
+                return start + newline + 1
+            end = start
+        return 0
+
+
+def split_log_ranges(path, parts, start=0, end=None):
+    """
+    Teilt die Datei in bis zu ``parts`` Byte-Bereiche, jeweils an Zeilengrenzen.
+
+    Returns:
+        Liste von (start, end) Tupeln, lückenlos und in Dateireihenfolge
+    """
+    if end is None:
+        end = complete_length(path)
+
+    size = end - start
+    if size <= 0:
+        return []
+
+    parts = max(1, min(parts, size // MIN_RANGE_BYTES or 1))
+    step = size // parts
+
+    ranges = []
+    with open(path, "rb") as f:
+        range_start = start
+        for i in range(1, parts):
+            f.seek(start + i * step)
+            f.readline()  # bis zum nächsten Zeilenanfang vorspulen
+            range_end = min(f.tell(), end)
+            if range_end > range_start:
+                ranges.append((range_start, range_end))
+                range_start = range_end
+        if end > range_start:
+            ranges.append((range_start, end))
+
+    return ranges
+
+
+def _prepare_batch(entries):
+    """Bereitet (log_ts, body)-Paare auf; Nummern-Extraktion für alle in einem Aufruf."""
+    phones = extract_phones([body.get("content") for _, body in entries])
+    return [(log_ts, prepare_call(log_ts, body, phone)) for (log_ts, body), phone in zip(entries, phones)]
+
+
+def iter_log_range(path, start, end):
+    """Liefert (log_ts, call) für jede gültige Zeile im Byte-Bereich [start, end)."""
+    entries = []
+
+    with open(path, "rb") as f:
+        f.seek(start)
+        position = start
+        while position < end:
+            line = f.readline()
+            if not line:
+                break
+            position += len(line)
+
+            if not line.strip():
+                continue
+            try:
+                log_entry = json.loads(line)
+            except ValueError:
+                logger.warning("Fehler beim Parsen einer Zeile in der Log-Datei: %r", line)
+                continue
+
+            log_ts = log_entry.get("ts")
+            if not log_ts:
+                continue
+
+            entries.append((log_ts, log_entry.get("body", {})))
+            if len(entries) >= EXTRACT_BATCH:
+                yield from _prepare_batch(entries)
+                entries = []
+
+    if entries:
+        yield from _prepare_batch(entries)
+
+
+def parse_log_range(path, start, end):
+    """Worker-Funktion: parst einen Byte-Bereich komplett (für ProcessPoolExecutor)."""
+    return list(iter_log_range(path, start, end))
@@ -0,0 +1,299 @@
+"""
+Volltextsuche über Anrufe (SQLite FTS5)
+=======================================
+
+``calls_fts`` ist ein FTS5-Index mit externem Inhalt (``content='calls'``):
+er speichert nur die Tokens von Name, Anliegen, Kategorie, Versicherung
+und Telefonnummer, die Texte selbst bleiben in ``calls``. Trigger halten
+ihn bei INSERT, DELETE und bei Änderungen dieser Spalten aktuell - ein
+Statuswechsel ("erledigt") berührt den Index nicht.
+
+Suchbegriffe werden als Präfix gesucht (``mei`` findet "Meier") und mit
+bm25 gewichtet (Name vor Telefonnummer vor Anliegen). Bewertet werden nur
+die neuesten ``RANK_CANDIDATES`` Treffer - bm25 über alle Treffer eines
+häufigen Begriffs wie "müller" würde mit der Tabelle wachsen; ältere
+Treffer folgen nach der sortierten Liste, neueste zuerst. Telefonnummern
+dürfen mit Leerzeichen eingegeben werden; ``0151 234`` findet auch eine
+als ``+49151234…`` gespeicherte Nummer. Ist die Eingabe genau eine
+Telefonnummer, zu der es Anrufe mit dieser kanonischen Nummer gibt, werden
+diese über ``idx_calls_phone_e164`` gefunden (neueste zuerst).
+
+Ohne FTS5 (ältere SQLite-Builds) sucht ``search_calls`` per LIKE über
+dieselben Spalten, unsortiert nach Relevanz, neueste zuerst.
+
+Verwendung:
+    create_search_index(db)                 # in init_db
+    rows, ranked = search_calls(db, "meier 0151", columns, limit=50)
+"""
+
+import re
+import sqlite3
+
+from phone_normalize import DEFAULT_COUNTRY_CODE, to_e164
+
+# Durchsuchte Spalten und ihre bm25-Gewichte (gleiche Reihenfolge wie im Index)
+SEARCH_COLUMNS = ("caller_name", "call_reason", "category", "insurance_provider", "phone")
+RANK_WEIGHTS = (10.0, 2.0, 1.0, 1.0, 5.0)
+# Neueste Treffer, die nach Relevanz sortiert werden
+RANK_CANDIDATES = 500
+
+# Trigger auf calls, die den Index aktuell halten (Bulk-Import entfernt sie vorübergehend)
+SEARCH_TRIGGERS = ("calls_fts_insert", "calls_fts_delete", "calls_fts_update")
+
+_columns = ", ".join(SEARCH_COLUMNS)
+_new_values = ", ".join(f"new.{column}" for column in SEARCH_COLUMNS)
+_old_values = ", ".join(f"old.{column}" for column in SEARCH_COLUMNS)
+
+_CREATE_TABLE_SQL = f"""
+CREATE VIRTUAL TABLE calls_fts USING fts5(
+    {_columns},
+    content='calls', content_rowid='id',
+    tokenize='unicode61 remove_diacritics 2',
+    prefix='2 3'
+)
+"""
+
+_CREATE_TRIGGERS_SQL = (
+    f"""
+    CREATE TRIGGER IF NOT EXISTS calls_fts_insert AFTER INSERT ON calls BEGIN
+        INSERT INTO calls_fts(rowid, {_columns}) VALUES (new.id, {_new_values});
+    END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS calls_fts_delete AFTER DELETE ON calls BEGIN
+        INSERT INTO calls_fts(calls_fts, rowid, {_columns}) VALUES ('delete', old.id, {_old_values});
+    END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS calls_fts_update AFTER UPDATE OF {_columns} ON calls BEGIN
+        INSERT INTO calls_fts(calls_fts, rowid, {_columns}) VALUES ('delete', old.id, {_old_values});
+        INSERT INTO calls_fts(rowid, {_columns}) VALUES (new.id, {_new_values});
+    END
+    """,
+)
+
+# Aufeinanderfolgende Wörter aus Ziffern (und + - / ( )) gehören zu einer Telefonnummer
+_NUMBER_PART = re.compile(r"\+?[\d()/\-]*\d[\d()/\-]*")
+
+
+def _fts5_available():
+    try:
+        sqlite3.connect(":memory:").execute("CREATE VIRTUAL TABLE t USING fts5(x)")
+        return True
+    except sqlite3.OperationalError:
+        return False
+
+
+FTS5_AVAILABLE = _fts5_available()
+
+
+def create_search_index(db):
+    """
+    Legt ``calls_fts`` und die Trigger an; ein neuer Index wird einmal gefüllt.
+
+    Returns:
+        True wenn der Index neu angelegt wurde, False wenn er schon bestand
+        oder FTS5 nicht verfügbar ist
+    """
+    if not FTS5_AVAILABLE:
+        return False
+
+    exists = db.execute("SELECT 1 FROM sqlite_master WHERE name = 'calls_fts'").fetchone() is not None
+    if not exists:
+        db.execute(_CREATE_TABLE_SQL)
+        rebuild_search_index(db)
+    create_search_triggers(db)
+    return not exists
+
+
+def create_search_triggers(db):
+    if not FTS5_AVAILABLE:
+        return
+    for sql in _CREATE_TRIGGERS_SQL:
+        db.execute(sql)
+
+
+def drop_search_triggers(db):
+    for name in SEARCH_TRIGGERS:
+        db.execute(f"DROP TRIGGER IF EXISTS {name}")
+
+
+def rebuild_search_index(db):
+    """Baut den Index in einem Durchgang aus ``calls`` neu auf (z.B. nach dem Bulk-Import)."""
+    if FTS5_AVAILABLE:
+        db.execute("INSERT INTO calls_fts(calls_fts) VALUES ('rebuild')")
+
+
+def _number_variants(part, country_code):
+    """Ziffern einer eingegebenen Nummer, national und international (ohne +)."""
+    digits = re.sub(r"\D", "", part)
+    variants = [digits]
+    if digits.startswith("00"):
+        digits = digits[2:]
+        variants.append(digits)
+    elif digits.startswith("0"):
+        variants.append(country_code + digits[1:])
+        return variants
+    elif not part.startswith("+"):
+        return variants
+    if digits.startswith(country_code):
+        variants.append("0" + digits[len(country_code):])
+    return variants
+
+
+def _split_terms(text):
+    """
+    Zerlegt die Eingabe in Wörter und Telefonnummern.
+
+    Returns:
+        Liste von (Art, Wert): ("word", "meier") oder ("number", "0151 234")
+    """
+    terms = []
+    number = []
+    for word in text.split():
+        if _NUMBER_PART.fullmatch(word):
+            number.append(word)
+            continue
+        if number:
+            terms.append(("number", " ".join(number)))
+            number = []
+        if re.search(r"\w", word):
+            terms.append(("word", word))
+    if number:
+        terms.append(("number", " ".join(number)))
+    return terms
+
+
+def build_fts_query(text, country_code=DEFAULT_COUNTRY_CODE):
+    """
+    FTS5-MATCH-Ausdruck für eine Benutzereingabe: alle Begriffe als Präfix, UND-verknüpft.
+
+    Returns:
+        str oder None, wenn die Eingabe keine suchbaren Zeichen enthält
+    """
+    parts = []
+    for kind, value in _split_terms(text):
+        if kind == "number":
+            variants = dict.fromkeys(_number_variants(value, country_code))
+            parts.append("(" + " OR ".join(f'"{variant}"*' for variant in variants) + ")")
+        else:
+            parts.append('"' + value.replace('"', '""') + '"*')
+    return " AND ".join(parts) or None
+
+
+def _whole_number(db, text, country_code=DEFAULT_COUNTRY_CODE):
+    """
+    Kanonische Nummer der Eingabe, wenn sie genau eine Telefonnummer ist und
+    Anrufe mit dieser Nummer existieren (unabhängig von Filtern und Seite).
+    """
+    terms = _split_terms(text)
+    if len(terms) != 1 or terms[0][0] != "number":
+        return None
+    phone_e164 = to_e164(terms[0][1], country_code)
+    if phone_e164 is None:
+        return None
+    if db.execute("SELECT 1 FROM calls WHERE phone_e164 = ? LIMIT 1", (phone_e164,)).fetchone() is None:
+        return None
+    return phone_e164
+
+
+def _like_conditions(text, country_code=DEFAULT_COUNTRY_CODE):
+    """WHERE-Bedingungen und Parameter für die Suche ohne FTS5."""
+    conditions, params = [], []
+    for kind, value in _split_terms(text):
+        values = dict.fromkeys(_number_variants(value, country_code)) if kind == "number" else [value]
+        patterns = ["%" + v.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_") + "%" for v in values]
+        conditions.append("(" + " OR ".join(
+            f"c.{column} LIKE ? ESCAPE '\\'" for _ in patterns for column in SEARCH_COLUMNS) + ")")
+        params.extend(pattern for pattern in patterns for _ in SEARCH_COLUMNS)
+    return conditions, params
+
+
+def _ranked_page(db, columns, where, params, limit, offset):
+    """
+    Eine Seite der FTS5-Treffer: die neuesten RANK_CANDIDATES nach bm25,
+    danach ältere Treffer nach rowid absteigend.
+
+    FTS5 liefert Treffer in rowid-Reihenfolge; mit LIMIT wird bm25 also nur
+    für die Kandidaten berechnet, nicht für alle Treffer.
+    """
+    source = "FROM calls_fts JOIN calls c ON c.id = calls_fts.rowid WHERE " + " AND ".join(where)
+    weights = ", ".join(map(str, RANK_WEIGHTS))
+    candidates = db.execute(f"""
+        SELECT c.id AS id, c.timestamp AS timestamp, bm25(calls_fts, {weights}) AS score
+        {source} ORDER BY calls_fts.rowid DESC LIMIT ?
+    """, params + [RANK_CANDIDATES]).fetchall()
+
+    calls = []
+    page_ids = [row['id'] for row in sorted(
+        candidates, key=lambda row: (row['score'], -row['timestamp'], -row['id']))[offset:offset + limit]]
+    if page_ids:
+        placeholders = ", ".join("?" * len(page_ids))
+        rows = {row['_id']: row for row in db.execute(
+            f"SELECT c.id AS _id, {columns} FROM calls c WHERE c.id IN ({placeholders})", page_ids)}
+        for call_id in page_ids:
+            call = dict(rows[call_id])
+            del call['_id']
+            calls.append(call)
+
+    if len(candidates) == RANK_CANDIDATES and len(calls) < limit:
+        calls.extend(dict(row) for row in db.execute(
+            f"SELECT {columns} {source} AND calls_fts.rowid < ? ORDER BY calls_fts.rowid DESC LIMIT ? OFFSET ?",
+            params + [candidates[-1]['id'], limit - len(calls), max(0, offset - RANK_CANDIDATES)]))
+    return calls
+
+
+def search_calls(db, text, columns, limit=50, offset=0, status=None, since=None, until=None):
+    """
+    Sucht Anrufe; mit FTS5 nach Relevanz sortiert, sonst neueste zuerst.
+
+    Args:
+        db: Verbindung mit ``row_factory = sqlite3.Row``
+        text: Eingabe aus dem Suchfeld
+        columns: Spaltenliste für SELECT (mit Präfix ``c.``, z.B. "c.id, c.phone")
+        limit, offset: Seite der Trefferliste
+        status, since, until: Filter wie bei der Anrufliste
+
+    Returns:
+        (Liste von dicts, True wenn nach Relevanz sortiert)
+    """
+    where, params = [], []
+    phone_e164 = _whole_number(db, text)
+    if phone_e164 is not None:
+        # Vollständige Telefonnummer: Index-Suche statt Volltext
+        sql = f"SELECT {columns} FROM calls c"
+        where.append("c.phone_e164 = ?")
+        params.append(phone_e164)
+        order = "c.timestamp DESC, c.id DESC"
+    elif FTS5_AVAILABLE:
+        query = build_fts_query(text)
+        if query is None:
+            return [], True
+        sql = None  # Seite wird in _ranked_page zusammengesetzt
+        where.append("calls_fts MATCH ?")
+        params.append(query)
+    else:
+        conditions, like_params = _like_conditions(text)
+        if not conditions:
+            return [], False
+        sql = f"SELECT {columns} FROM calls c"
+        where.extend(conditions)
+        params.extend(like_params)
+        order = "c.timestamp DESC, c.id DESC"
+
+    if status is not None:
+        where.append("c.status = ?")
+        params.append(status)
+    if since is not None:
+        where.append("c.timestamp >= ?")
+        params.append(since)
+    if until is not None:
+        where.append("c.timestamp < ?")
+        params.append(until)
+
+    if sql is None:
+        return _ranked_page(db, columns, where, params, limit, offset), True
+
+    sql += " WHERE " + " AND ".join(where) + f" ORDER BY {order} LIMIT ? OFFSET ?"
+    params.extend([limit, offset])
+    return [dict(row) for row in db.execute(sql, params)], False
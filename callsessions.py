@@ -0,0 +1,147 @@
+"""
+Anruf-Sitzungen aus dem Call Monitor
+====================================
+
+Die FritzBox meldet jeden Anruf als Folge von Events mit derselben
+ConnectionID:
+
+    RING / CALL  ->  CONNECT (nur wenn angenommen)  ->  DISCONNECT (Dauer)
+
+``CallSessions`` führt pro ConnectionID eine offene Sitzung im Speicher.
+Die FritzBox wiederholt den RING bei jedem Klingelton: ein RING vom selben
+Anrufer zu einer offenen ConnectionID, höchstens ``duplicate_window``
+Sekunden nach dem letzten, ist ein Duplikat. Mit dem DISCONNECT ist die
+Sitzung abgeschlossen und wird gespeichert - angenommen oder verpasst, mit Dauer.
+
+Die FritzBox vergibt ConnectionIDs nach dem DISCONNECT neu. Fehlt ein
+DISCONNECT (z.B. Verbindungsabbruch zur FritzBox), löst ein RING mit
+anderem Anrufer oder nach dem Zeitfenster die alte Sitzung ab; nach einem
+Reconnect werden alle offenen Sitzungen mit ``close_all`` abgeschlossen,
+übrig gebliebene spätestens nach ``max_age`` Sekunden.
+"""
+
+
+class CallSessions:
+    """Offene Anruf-Sitzungen, nach ConnectionID."""
+
+    def __init__(self, max_age=12 * 60 * 60, source=None, duplicate_window=10):
+        """
+        Args:
+            max_age: Sekunden, nach denen eine Sitzung ohne DISCONNECT abgeschlossen wird
+            source: Kennung des Anschlusses (wird mit jeder Sitzung gespeichert)
+            duplicate_window: Sekunden nach dem letzten RING, in denen ein
+                gleicher RING als Wiederholung gilt
+        """
+        self.max_age = max_age
+        self.source = source
+        self.duplicate_window = duplicate_window
+        self._active = {}
+        self._last_ring = {}
+        self.stats = {"started": 0, "duplicates": 0, "completed": 0, "expired": 0, "replaced": 0}
+
+    def __len__(self):
+        return len(self._active)
+
+    def _start(self, connection_id, direction, caller, called, now):
+        self._active[connection_id] = {
+            "type": "SESSION",
+            "connection_id": connection_id,
+            "direction": direction,
+            "caller_number": caller,
+            "called_number": called,
+            "extension": None,
+            "started_at": now,
+            "connected_at": None,
+            "ended_at": None,
+            "duration": None,
+            "answered": 0,
+            "source": self.source,
+        }
+        self.stats["started"] += 1
+
+    def _replace(self, connection_id):
+        """Entfernt eine offene Sitzung ohne DISCONNECT, die ein neuer Anruf ablöst."""
+        session = self._active.pop(connection_id, None)
+        self._last_ring.pop(connection_id, None)
+        if session is not None:
+            self.stats["replaced"] += 1
+        return session
+
+    def ring(self, event, now):
+        """
+        Eingehender Anruf.
+
+        Returns:
+            (neu, abgelöst): ``neu`` ist False für eine Wiederholung des RINGs
+            (gleiche ConnectionID und Anrufer innerhalb ``duplicate_window``);
+            ``abgelöst`` ist die offene Sitzung ohne DISCONNECT, die der neue
+            Anruf ersetzt, sonst None
+        """
+        connection_id = event['connection_id']
+        session = self._active.get(connection_id)
+        if (session is not None and session['direction'] == "in"
+                and session['caller_number'] == event['caller']
+                and now - self._last_ring[connection_id] <= self.duplicate_window):
+            self._last_ring[connection_id] = now
+            self.stats["duplicates"] += 1
+            return False, None
+
+        replaced = self._replace(connection_id)
+        self._start(connection_id, "in", event['caller'], event['called'], now)
+        self._last_ring[connection_id] = now
+        return True, replaced
+
+    def call(self, event, now):
+        """
+        Ausgehender Anruf.
+
+        Returns:
+            Abgelöste offene Sitzung zur selben ConnectionID oder None
+        """
+        replaced = self._replace(event['connection_id'])
+        self._start(event['connection_id'], "out", event['caller'], event['called'], now)
+        return replaced
+
+    def connect(self, event, now):
+        """Anruf wurde angenommen."""
+        session = self._active.get(event['connection_id'])
+        if session is not None:
+            session['connected_at'] = now
+            session['extension'] = event['extension']
+            session['answered'] = 1
+
+    def disconnect(self, event, now):
+        """
+        Anruf beendet.
+
+        Returns:
+            Abgeschlossene Sitzung (dict) oder None für unbekannte ConnectionIDs
+        """
+        session = self._active.pop(event['connection_id'], None)
+        self._last_ring.pop(event['connection_id'], None)
+        if session is None:
+            return None
+        session['ended_at'] = now
+        session['duration'] = event['duration']
+        self.stats["completed"] += 1
+        return session
+
+    def expire(self, now):
+        """Schließt Sitzungen ohne DISCONNECT ab, die älter als max_age sind."""
+        expired = [connection_id for connection_id, session in self._active.items()
+                   if now - session['started_at'] > self.max_age]
+        self.stats["expired"] += len(expired)
+        for connection_id in expired:
+            self._last_ring.pop(connection_id, None)
+        return [self._active.pop(connection_id) for connection_id in expired]
+
+    def close_all(self):
+        """
+        Schließt alle offenen Sitzungen ohne DISCONNECT ab (z.B. nach einem
+        Reconnect, wenn Events der alten Verbindung fehlen können).
+        """
+        sessions = list(self._active.values())
+        self.stats["expired"] += len(sessions)
+        self._active.clear()
+        self._last_ring.clear()
+        return sessions
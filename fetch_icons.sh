@@ -0,0 +1,29 @@
+#!/bin/bash
+# Lädt Bootstrap Icons (CSS + Schriftdateien) nach static/vendor/bootstrap-icons,
+# damit das Dashboard ohne CDN auskommt. Fehlen die Dateien, bindet der Server
+# die Icons weiterhin von cdn.jsdelivr.net ein.
+#
+# Verwendung: ./fetch_icons.sh [Version]
+
+set -e
+
+VERSION="${1:-1.11.1}"
+BASE_URL="https://cdn.jsdelivr.net/npm/bootstrap-icons@$VERSION/font"
+TARGET_DIR="$(cd "$(dirname "$0")" && pwd)/static/vendor/bootstrap-icons"
+
+mkdir -p "$TARGET_DIR/fonts"
+TMP_DIR=$(mktemp -d)
+trap 'rm -rf "$TMP_DIR"' EXIT
+
+echo "Lade Bootstrap Icons $VERSION..."
+mkdir -p "$TMP_DIR/fonts"
+curl -fsSL "$BASE_URL/bootstrap-icons.css" -o "$TMP_DIR/bootstrap-icons.css"
+curl -fsSL "$BASE_URL/fonts/bootstrap-icons.woff2" -o "$TMP_DIR/fonts/bootstrap-icons.woff2"
+curl -fsSL "$BASE_URL/fonts/bootstrap-icons.woff" -o "$TMP_DIR/fonts/bootstrap-icons.woff"
+
+# Erst nach vollständigem Download ersetzen
+cp "$TMP_DIR/bootstrap-icons.css" "$TARGET_DIR/"
+cp "$TMP_DIR/fonts/"* "$TARGET_DIR/fonts/"
+
+echo "✓ Bootstrap Icons $VERSION in $TARGET_DIR"
+echo "  Server neu starten, damit das Dashboard die lokalen Dateien verwendet."
@@ -10,6 +10,11 @@ die Rufnummerweiterleitung zu Placetel erfolgt.
 Die echten Nummern werden in einer Lookup-Tabelle gespeichert, sodass
 sie später den Webhook-Daten von Placetel zugeordnet werden können.
 
+Das Lesen von der FritzBox (asyncio, Zeilen-Framing direkt im
+Empfangspuffer) läuft unabhängig vom Speichern: ein Reader-Task legt
+RINGs in eine Queue, ein Writer-Task schreibt sie in SQLite. Beenden
+mit Ctrl+C oder SIGTERM speichert wartende RINGs noch.
+
 Verwendung:
     python3 fritzbox_monitor.py
 
@@ -18,41 +23,64 @@ Voraussetzungen:
     - FritzBox muss im Netzwerk erreichbar sein
 """
 
-import socket
+import asyncio
+import os
+import random
+import signal
 import time
-import sqlite3
-import pathlib
-from datetime import datetime
 import sys
+import atexit
+from collections import namedtuple
+
+import storage
+from storage import DB_FILE
+from log_setup import setup_logging
+from lineframer import LineProtocol
+from phone_normalize import to_e164, same_subscriber
+from ringmatch import RecentCallers
+from callsessions import CallSessions
+from ringservice import RingMatchServer
+from ringservice import SOCKET_PATH as RING_SOCKET
 
 # --- Konfiguration ---
 FRITZBOX_IP = "192.168.100.1"  # Deine FritzBox IP
 FRITZBOX_PORT = 1012  # Call Monitor Port
-PRAXIS_NUMBER = "200893"  # Deine Praxisnummer
+PRAXIS_NUMBER = "03836/200893"  # Deine Praxisnummer mit Vorwahl ("Vorwahl/Rufnummer")
 
-DB_FILE = pathlib.Path(__file__).with_name("database.db")
-LOG_FILE = pathlib.Path(__file__).with_name("fritzbox_calls.log")
+# Mehrere FritzBoxen/Standorte: "host[:port[:praxisnummer]]", kommagetrennt, z.B.
+#   FRITZBOX_ENDPOINTS=192.168.100.1:1012:03836/200893,192.168.200.1:1012:030/300400
+# Leer = eine FritzBox mit FRITZBOX_IP, FRITZBOX_PORT und PRAXIS_NUMBER
+FRITZBOX_ENDPOINTS = os.environ.get('FRITZBOX_ENDPOINTS', '')
 
-# --- Logging ---
-def log(message):
-    """Schreibt eine Log-Nachricht mit Timestamp."""
-    timestamp = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
-    log_message = f"[{timestamp}] {message}"
-    print(log_message)
+CONNECT_TIMEOUT = 10  # Sekunden für den Verbindungsaufbau
+MAX_RETRIES = 5  # Fehlgeschlagene Verbindungsversuche in Folge bis zum Abbruch (nur bei einer FritzBox)
+RECONNECT_DELAY = 5  # Sekunden bis zur Neuverbindung nach einem Abbruch
+CLEANUP_INTERVAL = 600  # 10 Minuten
+WRITE_QUEUE_SIZE = 1000  # RINGs, die auf das Speichern warten dürfen
+WRITE_BATCH_SIZE = 50  # RINGs pro Transaktion
+WRITE_BATCH_DELAY = 0.05  # Sekunden, die nach dem ersten RING auf weitere gewartet wird
+DUPLICATE_WINDOW = 10  # Sekunden, in denen dieselbe Nummer nur einmal gespeichert wird
+SESSION_MAX_AGE = 12 * 60 * 60  # Anrufe ohne DISCONNECT werden danach abgeschlossen
+SHUTDOWN_TIMEOUT = 10  # Sekunden, um wartende RINGs beim Beenden zu speichern
+
+LOG_FILE = storage.DATA_DIR / "fritzbox_calls.log"
 
-    # Optional: In Datei schreiben
-    with open(LOG_FILE, "a", encoding="utf-8") as f:
-        f.write(log_message + "\n")
+# Lookup-Einträge älter als das werden gelöscht bzw. nicht mehr zugeordnet
+LOOKUP_MAX_AGE = 24 * 60 * 60  # 24 Stunden
+
+# --- Logging ---
+# Log-Aufrufe gehen nur in eine Queue; ein Listener-Thread schreibt in die
+# (rotierte) Logdatei und auf die Konsole
+logger = setup_logging("fritzbox_monitor", LOG_FILE)
+log = logger.info
 
 # --- Datenbank ---
 def get_db():
-    """Verbindung zur SQLite-Datenbank."""
-    db = sqlite3.connect(DB_FILE)
-    db.row_factory = sqlite3.Row
-    return db
+    """Verbindung zur SQLite-Datenbank (WAL, Busy-Timeout, gemeinsames Pragma-Profil)."""
+    return storage.connect(DB_FILE)
 
 def create_lookup_table():
-    """Erstellt die Lookup-Tabelle für Telefonnummern."""
+    """Erstellt die Lookup-Tabelle für Telefonnummern und die Tabelle der Anruf-Sitzungen."""
     db = get_db()
     cursor = db.cursor()
 
@@ -61,6 +89,7 @@ def create_lookup_table():
         id INTEGER PRIMARY KEY AUTOINCREMENT,
         timestamp INTEGER NOT NULL,
         caller_number TEXT NOT NULL,
+        caller_e164 TEXT,
         called_number TEXT NOT NULL,
         matched INTEGER DEFAULT 0,
         created_at DATETIME DEFAULT CURRENT_TIMESTAMP
@@ -76,55 +105,150 @@ def create_lookup_table():
     CREATE INDEX IF NOT EXISTS idx_matched ON phone_lookup(matched)
     """)
 
+    # Partieller Index nur über ungematchte Einträge - damit findet der
+    # Webhook-Server den zeitlich nächsten RING per Index-Suche
+    cursor.execute("""
+    CREATE INDEX IF NOT EXISTS idx_unmatched_timestamp
+    ON phone_lookup(timestamp) WHERE matched = 0
+    """)
+
+    # Kanonische Anrufernummer (E.164); ältere Datenbanken nachrüsten
+    if storage.ensure_column(db, "phone_lookup", "caller_e164", "TEXT"):
+        rows = cursor.execute("SELECT id, caller_number FROM phone_lookup").fetchall()
+        cursor.executemany("UPDATE phone_lookup SET caller_e164 = ? WHERE id = ?",
+                           [(to_e164(row['caller_number']), row['id']) for row in rows])
+        log(f"🔧 caller_e164 für {len(rows)} bestehende Einträge nachgetragen")
+
+    # Der Duplikats-Filter arbeitet im Speicher (RecentCallers) - der frühere
+    # Index dafür kostet bei jedem RING nur noch Schreibaufwand
+    cursor.execute("DROP INDEX IF EXISTS idx_caller_e164")
+
+    # Abgeschlossene Anrufe (RING/CALL -> CONNECT -> DISCONNECT), z.B. für verpasste Anrufe
+    cursor.execute("""
+    CREATE TABLE IF NOT EXISTS call_sessions (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        connection_id INTEGER NOT NULL,
+        direction TEXT NOT NULL,
+        caller_number TEXT,
+        caller_e164 TEXT,
+        called_number TEXT,
+        extension TEXT,
+        started_at INTEGER NOT NULL,
+        connected_at INTEGER,
+        ended_at INTEGER,
+        duration INTEGER,
+        answered INTEGER NOT NULL,
+        source TEXT
+    )
+    """)
+    storage.ensure_column(db, "call_sessions", "source", "TEXT")
+
+    cursor.execute("""
+    CREATE INDEX IF NOT EXISTS idx_call_sessions_started ON call_sessions(started_at)
+    """)
+
     db.commit()
     db.close()
     log("✓ Lookup-Tabelle erstellt/geprüft")
 
-def save_caller_number(caller_number, called_number):
-    """Speichert die echte Anrufernummer in der Lookup-Tabelle."""
+# DUPLIKATS-FILTER: FritzBox sendet oft mehrere RING-Events pro Anruf (bei jedem
+# Klingelton!). Gespeichert wird eine Nummer nur, wenn sie in den letzten
+# DUPLICATE_WINDOW Sekunden nicht schon gespeichert wurde - geprüft im Speicher,
+# Duplikate erreichen die Datenbank also gar nicht.
+recent_callers = RecentCallers(window=DUPLICATE_WINDOW)
+
+# Laufende Anrufe pro Anschluss ("host:port" -> CallSessions, nur im Event-Loop benutzt)
+call_sessions = {}
+
+def load_recent_callers():
+    """Übernimmt die zuletzt gespeicherten Nummern (z.B. nach einem Neustart) in den Filter."""
     db = get_db()
-    cursor = db.cursor()
+    rows = db.execute("""
+    SELECT timestamp, caller_number, caller_e164 FROM phone_lookup
+    WHERE timestamp >= ?
+    ORDER BY timestamp
+    """, (int(time.time()) - DUPLICATE_WINDOW,)).fetchall()
+    db.close()
+    for row in rows:
+        recent_callers.is_duplicate(row['caller_e164'] or row['caller_number'], row['timestamp'])
+
+def accept_ring(call_data):
+    """
+    Duplikats-Filter für einen RING; ergänzt timestamp und caller_e164.
 
-    timestamp = int(time.time())
+    Returns:
+        True wenn der RING gespeichert werden soll
+    """
+    call_data['timestamp'] = int(time.time())
+    call_data['caller_e164'] = to_e164(call_data['caller'])
+
+    # Vergleich über die kanonische Nummer ("0151…" und "+49151…" sind derselbe Anrufer);
+    # ohne gültige Nummer (z.B. unterdrückt) wie bisher über den Rohwert
+    key = call_data['caller_e164'] or call_data['caller']
+    if recent_callers.is_duplicate(key, call_data['timestamp']):
+        logger.debug("🔄 Duplikat ignoriert: %s (bereits gespeichert)", call_data['caller'])
+        return False
+    return True
+
+# Langlebige Verbindung des Writer-Tasks (wird aus wechselnden Threads von
+# asyncio.to_thread benutzt, aber nie gleichzeitig)
+_writer_db = None
+
+def save_events(events):
+    """
+    Speichert einen Batch in EINER kurzen Transaktion.
+
+    RINGs gehen in die Lookup-Tabelle, abgeschlossene Sitzungen in call_sessions.
+    """
+    global _writer_db
+    if _writer_db is None:
+        _writer_db = storage.connect(DB_FILE, check_same_thread=False)
+    db = _writer_db
 
-    # DUPLIKATS-FILTER: Verhindere mehrfache Speicherung der gleichen Nummer
-    # FritzBox sendet oft mehrere RING-Events pro Anruf (bei jedem Klingelton!)
-    # Prüfe ob diese Nummer in den letzten 10 Sekunden bereits gespeichert wurde
-    duplicate_window = 10  # Sekunden
-    min_timestamp = timestamp - duplicate_window
+    rings = [event for event in events if event['type'] == 'RING']
+    sessions = [event for event in events if event['type'] == 'SESSION']
 
-    # BEGIN IMMEDIATE: Atomische Transaktion gegen Race Conditions
     try:
+        # BEGIN IMMEDIATE: Schreibsperre nur für die Inserts des Batches
         db.execute("BEGIN IMMEDIATE")
+        entry_ids = []
+        for ring in rings:
+            cursor = db.execute("""
+            INSERT INTO phone_lookup (timestamp, caller_number, caller_e164, called_number)
+            VALUES (?, ?, ?, ?)
+            """, (ring['timestamp'], ring['caller'], ring['caller_e164'], ring['called']))
+            entry_ids.append(cursor.lastrowid)
+
+        if sessions:
+            db.executemany("""
+            INSERT INTO call_sessions (connection_id, direction, caller_number, caller_e164, called_number,
+                                       extension, started_at, connected_at, ended_at, duration, answered, source)
+            VALUES (:connection_id, :direction, :caller_number, :caller_e164, :called_number,
+                    :extension, :started_at, :connected_at, :ended_at, :duration, :answered, :source)
+            """, [dict(session, caller_e164=to_e164(session['caller_number'])) for session in sessions])
+        db.commit()
 
-        cursor.execute("""
-        SELECT id FROM phone_lookup
-        WHERE caller_number = ?
-        AND timestamp >= ?
-        LIMIT 1
-        """, (caller_number, min_timestamp))
-
-        if cursor.fetchone() is not None:
-            db.rollback()
-            db.close()
-            log(f"🔄 Duplikat ignoriert: {caller_number} (bereits gespeichert)")
-            return
+    except Exception as e:
+        db.rollback()
+        logger.error(f"❌ Fehler beim Speichern: {e}")
+        return
 
-        # Nummer ist neu → speichern
-        cursor.execute("""
-        INSERT INTO phone_lookup (timestamp, caller_number, called_number)
-        VALUES (?, ?, ?)
-        """, (timestamp, caller_number, called_number))
+    for ring, entry_id in zip(rings, entry_ids):
+        log(f"📞 Anruf gespeichert: {ring['caller']} → {ring['called']}")
 
-        db.commit()
-        db.close()
+        # Für die Zuordnung über den Socket im Speicher vorhalten
+        if ring_service is not None:
+            ring_service.add(ring['timestamp'], {"id": entry_id, "caller_number": ring['caller']})
 
-        log(f"📞 Anruf gespeichert: {caller_number} → {called_number}")
+    for session in sessions:
+        status = "angenommen" if session['answered'] else "verpasst"
+        logger.debug("📴 Anruf %s beendet (%s, %ss)", session['caller_number'], status, session['duration'])
 
-    except Exception as e:
-        db.rollback()
-        db.close()
-        log(f"❌ Fehler beim Speichern: {e}")
+def close_writer_db():
+    global _writer_db
+    if _writer_db is not None:
+        _writer_db.close()
+        _writer_db = None
 
 def cleanup_old_entries():
     """Löscht alte Lookup-Einträge (älter als 24 Stunden)."""
@@ -132,7 +256,9 @@ def cleanup_old_entries():
     cursor = db.cursor()
 
     # Älter als 24 Stunden
-    cutoff_time = int(time.time()) - (24 * 60 * 60)
+    cutoff_time = int(time.time()) - LOOKUP_MAX_AGE
+    if ring_service is not None:
+        ring_service.prune(cutoff_time)
 
     cursor.execute("""
     DELETE FROM phone_lookup
@@ -146,168 +272,423 @@ def cleanup_old_entries():
     db.commit()
     db.close()
 
+# --- RING-Zuordnung über Socket ---
+# Ungematchte RINGs im Speicher; der Webhook-Server fragt per Unix Socket an
+ring_service = None
+
+def mark_matched(entry):
+    """
+    Trägt eine Zuordnung aus dem Socket-Dienst als matched = 1 ein, bevor sie
+    herausgegeben wird.
+
+    Returns:
+        False, wenn der Webhook-Server den RING schon selbst über SQLite vergeben hat
+    """
+    db = get_db()
+    try:
+        cursor = db.execute("UPDATE phone_lookup SET matched = 1 WHERE id = ? AND matched = 0",
+                            (entry["id"],))
+        db.commit()
+        return cursor.rowcount == 1
+    finally:
+        db.close()
+
+def mark_unmatched(entry):
+    """Nimmt eine vom Webhook-Server nicht bestätigte Zuordnung zurück."""
+    db = get_db()
+    try:
+        db.execute("UPDATE phone_lookup SET matched = 0 WHERE id = ?", (entry["id"],))
+        db.commit()
+    finally:
+        db.close()
+
+def start_ring_service():
+    """Lädt ungematchte RINGs aus SQLite und öffnet den Socket für den Webhook-Server."""
+    global ring_service
+
+    if not RING_SOCKET:
+        log("ℹ️  RING_SOCKET leer - Zuordnung nur über SQLite")
+        return
+
+    service = RingMatchServer(RING_SOCKET, on_claim=mark_matched, on_release=mark_unmatched, log=log)
+
+    db = get_db()
+    rows = db.execute("""
+    SELECT id, timestamp, caller_number FROM phone_lookup
+    WHERE matched = 0 AND timestamp >= ?
+    ORDER BY timestamp, id
+    """, (int(time.time()) - LOOKUP_MAX_AGE,)).fetchall()
+    db.close()
+    for row in rows:
+        service.add(row['timestamp'], {"id": row['id'], "caller_number": row['caller_number']})
+
+    try:
+        service.start()
+    except OSError as e:
+        logger.warning(f"⚠️  Socket {RING_SOCKET} konnte nicht geöffnet werden ({e}) - Zuordnung nur über SQLite")
+        return
+
+    ring_service = service
+    log(f"📋 {len(rows)} ungematchte Anrufe für die Zuordnung geladen")
+    atexit.register(stop_ring_service)
+
+def stop_ring_service():
+    """Schließt den Socket."""
+    global ring_service
+    if ring_service is not None:
+        ring_service.stop()
+        ring_service = None
+
 # --- Call Monitor Parser ---
 def parse_call_monitor_line(line):
     """
     Parst eine Zeile vom FritzBox Call Monitor.
 
-    Format RING (eingehender Anruf):
-    Datum;RING;ConnectionID;CallerNumber;CalledNumber;SIPnumber;
+    Formate:
+    Datum;RING;ConnectionID;CallerNumber;CalledNumber;SIPnumber;       (eingehend)
+    Datum;CALL;ConnectionID;Extension;CallerNumber;CalledNumber;SIP;   (ausgehend)
+    Datum;CONNECT;ConnectionID;Extension;Number;                       (angenommen)
+    Datum;DISCONNECT;ConnectionID;DurationSeconds;                     (beendet)
 
     Beispiel:
     01.01.25 10:30:00;RING;0;0151234567890;200893;SIP0;
+
+    Returns:
+        dict mit 'type', 'connection_id', 'timestamp' (Datum der FritzBox)
+        und den Feldern des Events, oder None
     """
     try:
         parts = line.strip().split(';')
 
-        if len(parts) < 6:
+        if len(parts) < 4:
             return None
 
         event_type = parts[1]
-
-        # Nur RING Events (eingehende Anrufe) interessieren uns
-        if event_type == "RING":
-            caller_number = parts[3]  # Anrufernummer
-            called_number = parts[4]  # Angerufene Nummer
-
-            return {
-                'type': 'RING',
-                'caller': caller_number,
-                'called': called_number,
-                'timestamp': parts[0]
-            }
+        event = {
+            'type': event_type,
+            'connection_id': parts[2],
+            'timestamp': parts[0]
+        }
+
+        if event_type == "RING" and len(parts) >= 6:
+            event['caller'] = parts[3]  # Anrufernummer
+            event['called'] = parts[4]  # Angerufene Nummer
+            return event
+
+        if event_type == "CALL" and len(parts) >= 7:
+            event['extension'] = parts[3]  # Nebenstelle
+            event['caller'] = parts[4]  # Eigene Nummer
+            event['called'] = parts[5]  # Gewählte Nummer
+            return event
+
+        if event_type == "CONNECT" and len(parts) >= 5:
+            event['extension'] = parts[3]
+            event['number'] = parts[4]
+            return event
+
+        if event_type == "DISCONNECT":
+            event['duration'] = int(parts[3] or 0)  # Gesprächsdauer in Sekunden
+            return event
 
         return None
 
     except Exception as e:
-        log(f"⚠️  Fehler beim Parsen: {e}")
+        logger.warning(f"⚠️  Fehler beim Parsen: {e}")
         return None
 
 # --- FritzBox Verbindung ---
-def connect_to_fritzbox():
-    """Verbindet sich mit dem FritzBox Call Monitor."""
-    log(f"🔄 Verbinde mit FritzBox auf {FRITZBOX_IP}:{FRITZBOX_PORT}...")
+# Ein Call-Monitor-Anschluss mit eigener Praxisnummer
+Endpoint = namedtuple("Endpoint", "host port praxis_number")
+
+def parse_endpoints(spec):
+    """Liest FRITZBOX_ENDPOINTS ("host[:port[:praxisnummer]]", kommagetrennt)."""
+    endpoints = []
+    for item in spec.split(','):
+        item = item.strip()
+        if not item:
+            continue
+        host, _, rest = item.partition(':')
+        port, _, praxis_number = rest.partition(':')
+        endpoints.append(Endpoint(host, int(port or FRITZBOX_PORT), praxis_number or PRAXIS_NUMBER))
+    return endpoints
+
+def configured_endpoints():
+    """Alle zu überwachenden Anschlüsse (FRITZBOX_ENDPOINTS oder die Einzel-Konstanten)."""
+    return parse_endpoints(FRITZBOX_ENDPOINTS) or [Endpoint(FRITZBOX_IP, FRITZBOX_PORT, PRAXIS_NUMBER)]
+
+def endpoint_name(endpoint):
+    return f"{endpoint.host}:{endpoint.port}"
+
+async def connect_to_fritzbox(endpoint, on_line):
+    """
+    Verbindet sich mit dem FritzBox Call Monitor.
+
+    Empfangene Bytes landen direkt im Puffer eines ``LineFramer``;
+    ``on_line`` wird für jede vollständige Zeile aufgerufen.
+
+    Returns:
+        (transport, protocol) oder None
+    """
+    name = endpoint_name(endpoint)
+    log(f"🔄 Verbinde mit FritzBox auf {name}...")
+    loop = asyncio.get_running_loop()
+
+    def on_overflow(dropped):
+        logger.warning(f"⚠️  [{name}] Zeile ohne Zeilenende nach {dropped} Bytes verworfen")
 
     try:
-        sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
-        sock.settimeout(10)  # 10 Sekunden Timeout
-        sock.connect((FRITZBOX_IP, FRITZBOX_PORT))
-        log(f"✅ Verbunden mit FritzBox Call Monitor!")
-        return sock
-
-    except socket.timeout:
-        log(f"❌ Timeout: Keine Verbindung zur FritzBox")
+        connection = await asyncio.wait_for(
+            loop.create_connection(lambda: LineProtocol(on_line, on_overflow=on_overflow),
+                                   endpoint.host, endpoint.port),
+            timeout=CONNECT_TIMEOUT
+        )
+        log(f"✅ Verbunden mit FritzBox Call Monitor ({name})!")
+        return connection
+
+    except asyncio.TimeoutError:
+        logger.error(f"❌ Timeout: Keine Verbindung zur FritzBox ({name})")
         return None
 
     except ConnectionRefusedError:
-        log(f"❌ Verbindung verweigert. Ist der Call Monitor aktiviert? (#96*5*)")
+        logger.error(f"❌ Verbindung verweigert ({name}). Ist der Call Monitor aktiviert? (#96*5*)")
         return None
 
-    except Exception as e:
-        log(f"❌ Fehler bei Verbindung: {e}")
+    except OSError as e:
+        logger.error(f"❌ Fehler bei Verbindung zu {name}: {e}")
         return None
 
-def monitor_calls():
-    """Hauptschleife: Überwacht Anrufe von der FritzBox."""
-    log("🚀 FritzBox Call Monitor gestartet")
-    log(f"📋 Praxisnummer: {PRAXIS_NUMBER}")
-    log(f"💾 Datenbank: {DB_FILE}")
-    log("")
-    log("Warte auf Anrufe...")
-    log("(Drücke Ctrl+C zum Beenden)")
-    log("")
+def reconnect_delay(retry_count):
+    """Exponentieller Backoff (max 60s) mit Jitter, damit Neuverbindungen nicht im Gleichtakt laufen."""
+    base = min(2 ** retry_count, 60)
+    return base * random.uniform(0.5, 1.0)
 
-    # Lookup-Tabelle erstellen
-    create_lookup_table()
+def queue_event(queue, event):
+    """Legt ein Event in die Schreib-Queue, ohne den Reader zu blockieren."""
+    try:
+        queue.put_nowait(event)
+    except asyncio.QueueFull:
+        logger.warning(f"⚠️  Schreib-Warteschlange voll - {event['type']} verworfen")
 
+def handle_line(queue, endpoint, sessions, line):
+    """
+    Verarbeitet eine Zeile vom Call Monitor eines Anschlusses.
+
+    Praxis-RINGs kommen sofort in die Schreib-Queue (für die Zuordnung),
+    alle Events führen die Anruf-Sitzung der ConnectionID weiter.
+    """
+    if not line.strip():
+        return
+
+    event = parse_call_monitor_line(line)
+    if event is None:
+        return
+
+    now = int(time.time())
+    event_type = event['type']
+
+    if event_type == "RING":
+        # Nur Anrufe zur Praxisnummer dieses Anschlusses speichern
+        if not same_subscriber(event['called'], endpoint.praxis_number):
+            return
+        # Wiederholter RING desselben Anrufers zur offenen ConnectionID: Duplikat
+        is_new, replaced = sessions.ring(event, now)
+        if replaced is not None:
+            queue_event(queue, replaced)
+        if not is_new:
+            logger.debug("🔄 Duplikat ignoriert: %s (ConnectionID %s)", event['caller'], event['connection_id'])
+            return
+        if accept_ring(event):
+            queue_event(queue, event)
+
+    elif event_type == "CALL":
+        if same_subscriber(event['caller'], endpoint.praxis_number):
+            replaced = sessions.call(event, now)
+            if replaced is not None:
+                queue_event(queue, replaced)
+
+    elif event_type == "CONNECT":
+        sessions.connect(event, now)
+
+    elif event_type == "DISCONNECT":
+        session = sessions.disconnect(event, now)
+        if session is not None:
+            queue_event(queue, session)
+
+async def read_calls(queue, endpoint, max_retries=MAX_RETRIES):
+    """
+    Reader-Task für einen Anschluss: liest Zeilen und legt Praxis-RINGs in die Queue.
+
+    Jeder Anschluss hat seinen eigenen Reconnect-Zustand und eigene
+    Anruf-Sitzungen (ConnectionIDs gelten nur pro FritzBox). Das Speichern
+    übernimmt der gemeinsame ``write_calls`` - ein langsamer Commit hält
+    das Lesen also nicht auf.
+
+    Kehrt nach ``max_retries`` fehlgeschlagenen Verbindungsversuchen in
+    Folge zurück; mit ``max_retries=None`` wird mit gedeckeltem Backoff
+    weiter versucht.
+    """
+    name = endpoint_name(endpoint)
+    sessions = call_sessions[name] = CallSessions(max_age=SESSION_MAX_AGE, source=name,
+                                                  duplicate_window=DUPLICATE_WINDOW)
     retry_count = 0
-    max_retries = 5
 
     while True:
+        connection = await connect_to_fritzbox(
+            endpoint, lambda line: handle_line(queue, endpoint, sessions, line)
+        )
+
+        if not connection:
+            retry_count += 1
+            if max_retries is not None and retry_count >= max_retries:
+                logger.error(f"❌ Max. Verbindungsversuche erreicht ({max_retries}, {name})")
+                logger.error("💡 Prüfe:")
+                logger.error("   1. Ist Call Monitor aktiviert? (#96*5*)")
+                logger.error(f"   2. Ist die FritzBox-IP korrekt? (aktuell: {endpoint.host})")
+                logger.error("   3. Läuft eine Firewall?")
+                return
+
+            wait_time = reconnect_delay(retry_count)
+            if max_retries is None and retry_count >= MAX_RETRIES:
+                logger.error(f"❌ [{name}] {retry_count} Verbindungsversuche in Folge fehlgeschlagen")
+            log(f"⏳ [{name}] Warte {wait_time:.1f} Sekunden vor erneutem Versuch...")
+            await asyncio.sleep(wait_time)
+            continue
+
+        # Verbindung erfolgreich - Reset retry counter
+        retry_count = 0
+        transport, protocol = connection
+
+        try:
+            # Zeilen verarbeitet das Protokoll; hier nur auf das Verbindungsende warten
+            error = await protocol.closed
+            if error is not None:
+                logger.warning(f"⚠️  [{name}] Fehler beim Empfangen: {error}")
+            else:
+                logger.warning(f"⚠️  [{name}] Verbindung getrennt")
+
+        finally:
+            transport.close()
+            # DISCONNECTs der alten Verbindung können fehlen, und die FritzBox
+            # vergibt ConnectionIDs neu - offene Sitzungen ohne Ende abschließen
+            for session in sessions.close_all():
+                queue_event(queue, session)
+
+        # Verbindung geschlossen - neu verbinden
+        log(f"🔄 [{name}] Versuche erneut zu verbinden...")
+        await asyncio.sleep(RECONNECT_DELAY * random.uniform(0.5, 1.0))
+
+async def write_calls(queue):
+    """
+    Writer-Task: speichert RINGs aus der Queue gebündelt, SQLite läuft in einem Thread.
+
+    Nach dem ersten RING wird bis zu WRITE_BATCH_DELAY auf weitere gewartet,
+    die dann in derselben Transaktion geschrieben werden.
+    """
+    loop = asyncio.get_running_loop()
+
+    while True:
+        batch = [await queue.get()]
+        deadline = loop.time() + WRITE_BATCH_DELAY
+        while len(batch) < WRITE_BATCH_SIZE:
+            remaining = deadline - loop.time()
+            if remaining <= 0:
+                break
+            try:
+                batch.append(await asyncio.wait_for(queue.get(), remaining))
+            except asyncio.TimeoutError:
+                break
+
         try:
-            sock = connect_to_fritzbox()
-
-            if not sock:
-                retry_count += 1
-                if retry_count >= max_retries:
-                    log(f"❌ Max. Verbindungsversuche erreicht ({max_retries})")
-                    log("💡 Prüfe:")
-                    log("   1. Ist Call Monitor aktiviert? (#96*5*)")
-                    log("   2. Ist die FritzBox-IP korrekt? (aktuell: {FRITZBOX_IP})")
-                    log("   3. Läuft eine Firewall?")
-                    sys.exit(1)
-
-                wait_time = min(2 ** retry_count, 60)  # Exponentieller Backoff, max 60s
-                log(f"⏳ Warte {wait_time} Sekunden vor erneutem Versuch...")
-                time.sleep(wait_time)
-                continue
-
-            # Verbindung erfolgreich - Reset retry counter
-            retry_count = 0
-
-            # Buffer für empfangene Daten
-            buffer = ""
-
-            # Cleanup-Timer (alle 10 Minuten)
-            last_cleanup = time.time()
-            cleanup_interval = 600  # 10 Minuten
-
-            while True:
-                try:
-                    # Daten empfangen
-                    data = sock.recv(1024).decode('utf-8', errors='ignore')
-
-                    if not data:
-                        log("⚠️  Verbindung getrennt")
-                        break
-
-                    buffer += data
-
-                    # Zeilen verarbeiten
-                    while '\n' in buffer:
-                        line, buffer = buffer.split('\n', 1)
-
-                        if line.strip():
-                            call_data = parse_call_monitor_line(line)
-
-                            if call_data:
-                                # Nur Anrufe zur Praxisnummer speichern
-                                if PRAXIS_NUMBER in call_data['called']:
-                                    save_caller_number(
-                                        call_data['caller'],
-                                        call_data['called']
-                                    )
-
-                    # Periodisches Cleanup
-                    if time.time() - last_cleanup > cleanup_interval:
-                        cleanup_old_entries()
-                        last_cleanup = time.time()
-
-                except socket.timeout:
-                    # Timeout ist OK - warte weiter
-                    continue
-
-                except KeyboardInterrupt:
-                    log("\n⚠️  Beendet durch Benutzer")
-                    sock.close()
-                    sys.exit(0)
-
-                except Exception as e:
-                    log(f"⚠️  Fehler beim Empfangen: {e}")
-                    break
-
-            # Verbindung geschlossen - neu verbinden
-            sock.close()
-            log("🔄 Versuche erneut zu verbinden...")
-            time.sleep(5)
-
-        except KeyboardInterrupt:
-            log("\n⚠️  Beendet durch Benutzer")
-            sys.exit(0)
+            await asyncio.to_thread(save_events, batch)
+        except Exception as e:
+            logger.error(f"❌ Fehler beim Speichern: {e}")
+        finally:
+            for _ in batch:
+                queue.task_done()
 
+async def cleanup_periodically(queue):
+    """Löscht alle CLEANUP_INTERVAL Sekunden alte Lookup-Einträge und schließt hängende Sitzungen ab."""
+    while True:
+        await asyncio.sleep(CLEANUP_INTERVAL)
+        now = int(time.time())
+        for sessions in call_sessions.values():
+            for session in sessions.expire(now):
+                queue_event(queue, session)
+        try:
+            await asyncio.to_thread(cleanup_old_entries)
         except Exception as e:
-            log(f"❌ Unerwarteter Fehler: {e}")
-            time.sleep(5)
+            logger.error(f"❌ Fehler beim Cleanup: {e}")
+
+async def run_monitor(endpoints=None):
+    """
+    Startet je einen Reader-Task pro Anschluss, den gemeinsamen Writer und
+    den Cleanup-Task und beendet sie geordnet.
+
+    Mit einer FritzBox endet der Monitor nach MAX_RETRIES fehlgeschlagenen
+    Verbindungsversuchen mit Exit-Code 1 (systemd startet ihn neu). Mit
+    mehreren versucht jeder Reader es weiter, damit ein nicht erreichbarer
+    Standort nicht unbemerkt aus der Überwachung fällt, während die anderen
+    den Prozess am Leben halten.
+    """
+    endpoints = endpoints or configured_endpoints()
+    loop = asyncio.get_running_loop()
+    main_task = asyncio.current_task()
+    try:
+        loop.add_signal_handler(signal.SIGTERM, main_task.cancel)
+    except (NotImplementedError, RuntimeError):
+        pass  # z.B. Windows oder nicht im Haupt-Thread
+
+    # WAL-Modus aktivieren und Lookup-Tabelle erstellen
+    await asyncio.to_thread(storage.init_storage, DB_FILE, log)
+    await asyncio.to_thread(create_lookup_table)
+    await asyncio.to_thread(start_ring_service)
+    await asyncio.to_thread(load_recent_callers)
+
+    queue = asyncio.Queue(maxsize=WRITE_QUEUE_SIZE)
+    writer_task = asyncio.create_task(write_calls(queue), name="fritzbox-writer")
+    cleanup_task = asyncio.create_task(cleanup_periodically(queue), name="fritzbox-cleanup")
+
+    max_retries = MAX_RETRIES if len(endpoints) == 1 else None
+    readers = [asyncio.create_task(read_calls(queue, endpoint, max_retries), name=f"fritzbox-reader-{endpoint_name(endpoint)}")
+               for endpoint in endpoints]
+
+    try:
+        # Reader kehren nur zurück, wenn die einzige FritzBox dauerhaft nicht erreichbar ist
+        await asyncio.gather(*readers)
+        raise SystemExit(1)
+    finally:
+        for reader in readers:
+            reader.cancel()
+        await asyncio.gather(*readers, return_exceptions=True)
+        cleanup_task.cancel()
+        # Bereits empfangene RINGs noch speichern, dann den Writer beenden
+        try:
+            await asyncio.wait_for(queue.join(), timeout=SHUTDOWN_TIMEOUT)
+        except asyncio.TimeoutError:
+            logger.warning(f"⚠️  {queue.qsize()} RINGs beim Beenden nicht gespeichert")
+        writer_task.cancel()
+        await asyncio.gather(writer_task, cleanup_task, return_exceptions=True)
+        close_writer_db()
+
+def monitor_calls():
+    """Hauptfunktion: Überwacht Anrufe von der FritzBox."""
+    log("🚀 FritzBox Call Monitor gestartet")
+    for endpoint in configured_endpoints():
+        log(f"📋 FritzBox {endpoint_name(endpoint)} - Praxisnummer: {endpoint.praxis_number}")
+        if "/" not in endpoint.praxis_number:
+            logger.warning(f"⚠️  Praxisnummer {endpoint.praxis_number} ohne Vorwahl - "
+                           "Nummern mit Vorwahl werden nicht als Praxis erkannt (Format: Vorwahl/Rufnummer)")
+    log(f"💾 Datenbank: {DB_FILE}")
+    log("")
+    log("Warte auf Anrufe...")
+    log("(Drücke Ctrl+C zum Beenden)")
+    log("")
+
+    try:
+        asyncio.run(run_monitor())
+    except (KeyboardInterrupt, asyncio.CancelledError):
+        logger.warning("\n⚠️  Beendet durch Benutzer")
+        sys.exit(0)
 
 # --- Hilfsfunktion für Webhook-Server ---
 def find_real_phone_number(webhook_timestamp, time_window=300):
@@ -371,5 +752,5 @@ if __name__ == "__main__":
     try:
         monitor_calls()
     except KeyboardInterrupt:
-        log("\n⚠️  Programm beendet")
+        logger.warning("\n⚠️  Programm beendet")
         sys.exit(0)
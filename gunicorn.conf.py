@@ -0,0 +1,88 @@
+"""
+gunicorn-Konfiguration für den Webhook-Server
+=============================================
+
+    gunicorn -c gunicorn.conf.py wsgi:app
+
+- ``preload_app``: Der Master lädt die Anwendung einmal und führt
+  ``prepare_server`` (Schema, Nachimport aus ``placetel_logs.jsonl``)
+  genau einmal aus - nicht pro Worker
+- Jeder Worker verwirft nach ``fork()`` die geerbten SQLite-Verbindungen,
+  startet den Log-Thread neu und erst dann seine Hintergrund-Threads
+  (asynchroner Ingest, Log-Follower)
+- ``max_requests`` ersetzt Worker regelmäßig (mit Jitter, damit nicht alle
+  gleichzeitig neu starten); wartende Events des asynchronen Ingests
+  werden beim Beenden noch geschrieben
+- ``kill -HUP <master>`` (``systemctl reload telefonanlage``) startet die
+  Worker nacheinander neu, ohne laufende Requests abzubrechen. Wegen
+  ``preload_app`` wird dabei nur die Konfiguration neu gelesen - neuer
+  Code braucht ``systemctl restart``
+
+Alle Werte lassen sich per Environment Variable überschreiben (siehe
+``.env.example``).
+"""
+
+import os
+
+from storage import DATA_DIR
+
+# Port wie beim Entwicklungsserver (webhook_server_prod.PORT)
+bind = os.environ.get('WEB_BIND', '0.0.0.0:54351')
+
+# SQLite schreibt ohnehin nacheinander - wenige Prozesse, dafür mehrere Threads
+workers = int(os.environ.get('WEB_CONCURRENCY', '2'))
+worker_class = "gthread"
+threads = int(os.environ.get('WEB_THREADS', '8'))
+
+preload_app = True
+
+# Keep-Alive für wiederholte Webhooks und Dashboard-Requests
+keepalive = int(os.environ.get('WEB_KEEPALIVE', '5'))
+
+# Worker-Recycling
+max_requests = int(os.environ.get('WEB_MAX_REQUESTS', '5000'))
+max_requests_jitter = int(os.environ.get('WEB_MAX_REQUESTS_JITTER', '500'))
+
+timeout = int(os.environ.get('WEB_TIMEOUT', '30'))
+graceful_timeout = int(os.environ.get('WEB_GRACEFUL_TIMEOUT', '30'))
+
+# Fehler ins Journal, Zugriffe optional (z.B. WEB_ACCESS_LOG=-)
+errorlog = "-"
+accesslog = os.environ.get('WEB_ACCESS_LOG') or None
+pidfile = os.environ.get('WEB_PIDFILE') or None
+
+proc_name = "telefonanlage"
+# Steuer-Socket (neuere gunicorn-Versionen) liegt sonst in $HOME - unter systemd mit ProtectHome nicht schreibbar
+control_socket_disable = True
+# Heartbeat-Dateien der Worker im RAM statt auf der Platte (blockiert sonst bei langsamer I/O)
+if os.path.isdir("/dev/shm"):
+    worker_tmp_dir = "/dev/shm"
+
+
+def on_starting(server):
+    """Master, einmal vor dem Start der Worker."""
+    import webhook_server_prod
+
+    webhook_server_prod.prepare_server()
+    server.log.info(f"📁 Datenverzeichnis: {DATA_DIR}")
+
+
+def post_fork(server, worker):
+    """Worker, direkt nach fork()."""
+    import webhook_server_prod
+
+    webhook_server_prod.reset_after_fork()
+
+
+def post_worker_init(worker):
+    """Worker, nachdem die Anwendung geladen ist."""
+    import webhook_server_prod
+
+    webhook_server_prod.start_background_services()
+
+
+def worker_exit(server, worker):
+    """Worker wird beendet (Recycling, Reload, Shutdown)."""
+    import webhook_server_prod
+
+    webhook_server_prod.stop_background_services()
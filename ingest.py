@@ -0,0 +1,190 @@
+"""
+Asynchrone Ingest-Pipeline
+==========================
+
+Hintergrund-Writer mit Group-Commit für eingehende Webhook-Events.
+
+Der Webhook-Handler schreibt das Event zuerst dauerhaft in
+``placetel_logs.jsonl`` und legt es dann nur noch in eine begrenzte
+Warteschlange. Ein eigener Writer-Thread leert die Warteschlange und
+übergibt die Events in Batches an ``handle_batch`` - ein Commit deckt so
+während eines Anruf-Ansturms viele Anrufe ab.
+
+Geht ein Event aus der Warteschlange verloren (Absturz vor dem Commit),
+steht es weiterhin in der JSONL-Datei und wird beim nächsten
+``import_logs_to_db`` nachgetragen.
+
+Verwendung:
+    writer = IngestWriter(handle_batch)
+    writer.start()
+    if not writer.submit(event):
+        ...  # Warteschlange voll -> synchron verarbeiten
+    writer.stop()  # verarbeitet alle wartenden Events
+"""
+
+import queue
+import threading
+import time
+
+# Markiert das Ende der Warteschlange beim Herunterfahren
+_STOP = object()
+
+
+class IngestWriter:
+    """Writer-Thread, der Events aus einer begrenzten Queue in Batches verarbeitet."""
+
+    def __init__(self, handle_batch, max_queue=1000, max_batch=100, max_delay=0.05,
+                 log=print):
+        """
+        Args:
+            handle_batch: Callable, das eine Liste von Events in EINER
+                Transaktion verarbeitet und committet
+            max_queue: Maximale Anzahl wartender Events
+            max_batch: Maximale Anzahl Events pro Batch/Commit
+            max_delay: Sekunden, die nach dem ersten Event auf weitere
+                gewartet wird, bevor der Batch geschrieben wird
+            log: Funktion für Statusmeldungen
+        """
+        self.handle_batch = handle_batch
+        self.max_batch = max_batch
+        self.max_delay = max_delay
+        self.log = log
+
+        self._queue = queue.Queue(maxsize=max_queue)
+        self._thread = None
+        self._accepting = False
+
+        self.stats = {"submitted": 0, "rejected": 0, "batches": 0, "written": 0, "failed": 0}
+
+    def start(self):
+        """Startet den Writer-Thread."""
+        if self._thread is not None:
+            return
+        self._accepting = True
+        self._thread = threading.Thread(target=self._run, name="ingest-writer", daemon=True)
+        self._thread.start()
+
+    def submit(self, event):
+        """
+        Legt ein Event in die Warteschlange, ohne zu blockieren.
+
+        Returns:
+            True wenn angenommen, False wenn der Writer nicht läuft oder
+            die Warteschlange voll ist (Aufrufer verarbeitet dann selbst)
+        """
+        if not self._accepting:
+            return False
+        try:
+            self._queue.put_nowait(event)
+        except queue.Full:
+            self.stats["rejected"] += 1
+            return False
+        self.stats["submitted"] += 1
+        return True
+
+    def stop(self, timeout=30.0):
+        """Nimmt keine neuen Events mehr an und arbeitet die Warteschlange ab."""
+        if self._thread is None:
+            return
+        self._accepting = False
+        self._queue.put(_STOP)
+        self._thread.join(timeout)
+        if self._thread.is_alive():
+            self.log(f"⚠️  Ingest-Writer nach {timeout}s nicht beendet - "
+                     f"{self._queue.qsize()} Events bleiben für den Log-Import")
+        self._thread = None
+
+    def pending(self):
+        """Anzahl wartender Events."""
+        return self._queue.qsize()
+
+    def _collect_batch(self, first):
+        """Sammelt nach dem ersten Event bis zu max_batch Events innerhalb max_delay."""
+        batch = [first]
+        deadline = time.monotonic() + self.max_delay
+        stop = False
+
+        while len(batch) < self.max_batch:
+            remaining = deadline - time.monotonic()
+            try:
+                event = self._queue.get(timeout=remaining) if remaining > 0 else self._queue.get_nowait()
+            except queue.Empty:
+                break
+            if event is _STOP:
+                stop = True
+                break
+            batch.append(event)
+
+        return batch, stop
+
+    def _write(self, batch):
+        """Schreibt einen Batch; bei Fehler einzeln, damit ein defektes Event nicht alle blockiert."""
+        try:
+            self.handle_batch(batch)
+            self.stats["batches"] += 1
+            self.stats["written"] += len(batch)
+            return
+        except Exception as e:
+            if len(batch) == 1:
+                self.stats["failed"] += 1
+                self.log(f"❌ Ingest-Event konnte nicht gespeichert werden: {e}")
+                return
+            self.log(f"⚠️  Batch mit {len(batch)} Events fehlgeschlagen ({e}) - schreibe einzeln")
+
+        for event in batch:
+            self._write([event])
+
+    def _run(self):
+        stop = False
+        while not stop:
+            first = self._queue.get()
+            if first is _STOP:
+                break
+            batch, stop = self._collect_batch(first)
+            self._write(batch)
+
+        # Restliche Events nach dem Stop-Signal (z.B. von submit()-Rennen) abarbeiten
+        leftover = []
+        while True:
+            try:
+                event = self._queue.get_nowait()
+            except queue.Empty:
+                break
+            if event is not _STOP:
+                leftover.append(event)
+        for start in range(0, len(leftover), self.max_batch):
+            self._write(leftover[start:start + self.max_batch])
+
+
+class PeriodicWorker:
+    """Hintergrund-Thread, der ``func`` alle ``interval`` Sekunden aufruft (z.B. Log-Follower)."""
+
+    def __init__(self, func, interval, name="periodic-worker", log=print):
+        self.func = func
+        self.interval = interval
+        self.name = name
+        self.log = log
+
+        self._stop = threading.Event()
+        self._thread = None
+
+    def start(self):
+        if self._thread is not None:
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name=self.name, daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout=30.0):
+        if self._thread is None:
+            return
+        self._stop.set()
+        self._thread.join(timeout)
+        self._thread = None
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            try:
+                self.func()
+            except Exception as e:
+                self.log(f"❌ Fehler in {self.name}: {e}")
@@ -121,8 +121,8 @@ print_success "Installationsverzeichnis: $INSTALL_DIR"
 # ============================================================================
 print_header "Python-Abhängigkeiten installieren"
 
-print_info "Installiere Flask und Flask-HTTPAuth..."
-pip3 install flask Flask-HTTPAuth --quiet
+print_info "Installiere Flask, Flask-HTTPAuth und gunicorn..."
+pip3 install -r "$INSTALL_DIR/requirements.txt" --quiet
 
 if [ $? -eq 0 ]; then
     print_success "Abhängigkeiten erfolgreich installiert"
@@ -131,6 +131,13 @@ else
     exit 1
 fi
 
+print_info "Lade Bootstrap Icons für das Dashboard (static/vendor)..."
+if "$INSTALL_DIR/fetch_icons.sh" > /dev/null 2>&1; then
+    print_success "Bootstrap Icons lokal installiert"
+else
+    print_warning "Download fehlgeschlagen - Dashboard lädt die Icons vom CDN (später: ./fetch_icons.sh)"
+fi
+
 # ============================================================================
 # 5. KONFIGURATIONSDATEI (.env) ERSTELLEN
 # ============================================================================
@@ -252,7 +259,10 @@ Type=simple
 User=$USER
 WorkingDirectory=$INSTALL_DIR
 EnvironmentFile=$INSTALL_DIR/.env
-ExecStart=/usr/bin/python3 $INSTALL_DIR/webhook_server_prod.py
+ExecStart=/usr/bin/python3 -m gunicorn -c $INSTALL_DIR/gunicorn.conf.py wsgi:app
+ExecReload=/bin/kill -HUP \$MAINPID
+KillMode=mixed
+TimeoutStopSec=45
 Restart=always
 RestartSec=10
 
@@ -0,0 +1,167 @@
+"""
+Zeilen-Framing für den Call-Monitor-Socket
+==========================================
+
+Die FritzBox sendet zeilenweise (``...;RING;...\\n``). ``LineFramer``
+zerlegt den Byte-Strom direkt im Empfangspuffer:
+
+- Ein fester ``bytearray`` wird per ``recv_into`` bzw.
+  ``asyncio.BufferedProtocol`` ohne Zwischenkopie befüllt
+- Gesucht wird ``b"\\n"`` nur im neu empfangenen Teil; der Rest hinter der
+  letzten Zeile wird nicht bei jeder Zeile neu kopiert, sondern erst, wenn
+  der Puffer voll ist, einmal an den Anfang verschoben
+- Dekodiert wird erst die vollständige Zeile - ein UTF-8-Zeichen, das auf
+  zwei Reads verteilt ankommt, bleibt heil
+- Eine Zeile länger als ``max_line`` wird verworfen statt den Puffer
+  unbegrenzt wachsen zu lassen
+
+Verwendung (blockierend, z.B. Replay aufgezeichneter Daten):
+    framer = LineFramer()
+    n = sock.recv_into(framer.get_buffer())
+    for line in framer.advance(n):
+        ...
+
+Verwendung (asyncio):
+    await loop.create_connection(lambda: LineProtocol(on_line), host, port)
+"""
+
+import asyncio
+import socket
+
+# Maximale Zeilenlänge in Bytes (FritzBox-Zeilen sind < 200 Bytes)
+MAX_LINE = 4096
+
+
+class LineFramer:
+    """Zerlegt einen Byte-Strom in Textzeilen, in einem Puffer fester Größe."""
+
+    def __init__(self, max_line=MAX_LINE, encoding="utf-8", on_overflow=None):
+        """
+        Args:
+            max_line: Puffergröße = maximale Zeilenlänge in Bytes
+            encoding: Zeichensatz der Zeilen (ungültige Bytes werden ersetzt)
+            on_overflow: Callable(verworfene_bytes) für zu lange Zeilen
+        """
+        self._buf = bytearray(max_line)
+        self._view = memoryview(self._buf)
+        self._start = 0  # Anfang der noch unvollständigen Zeile
+        self._scan = 0   # ab hier wurde noch nicht nach b"\n" gesucht
+        self._end = 0    # Ende der empfangenen Daten
+        self._skipping = False  # Rest einer verworfenen Zeile bis zum nächsten b"\n"
+
+        self.encoding = encoding
+        self.on_overflow = on_overflow
+        self.stats = {"lines": 0, "overflows": 0, "dropped_bytes": 0}
+
+    def get_buffer(self):
+        """Freier Teil des Puffers (memoryview) zum Befüllen per ``recv_into``."""
+        if self._end == len(self._buf):
+            self._compact()
+        return self._view[self._end:]
+
+    def advance(self, nbytes):
+        """
+        Meldet ``nbytes`` neu in ``get_buffer()`` geschriebene Bytes.
+
+        Returns:
+            Liste der dadurch vollständigen Zeilen (str, ohne Zeilenende)
+        """
+        self._end += nbytes
+        lines = []
+
+        while True:
+            newline = self._buf.find(b"\n", self._scan, self._end)
+            if newline < 0:
+                break
+            if self._skipping:
+                self._skipping = False
+            else:
+                stop = newline - 1 if newline > self._start and self._buf[newline - 1] == 0x0D else newline
+                lines.append(str(self._view[self._start:stop], self.encoding, "replace"))
+            self._start = self._scan = newline + 1
+
+        self._scan = self._end
+        if self._start == self._end:
+            # Alles verarbeitet - Puffer ohne Kopie zurücksetzen
+            self._start = self._scan = self._end = 0
+        elif self._end == len(self._buf):
+            if self._start > 0:
+                self._compact()
+            else:
+                self._overflow()
+
+        self.stats["lines"] += len(lines)
+        return lines
+
+    def feed(self, data):
+        """Verarbeitet bereits gelesene Bytes (z.B. aus einer Aufzeichnung)."""
+        lines = []
+        data = memoryview(data)
+        while data:
+            buffer = self.get_buffer()
+            n = min(len(buffer), len(data))
+            buffer[:n] = data[:n]
+            data = data[n:]
+            lines.extend(self.advance(n))
+        return lines
+
+    def pending(self):
+        """Anzahl Bytes der noch unvollständigen Zeile."""
+        return self._end - self._start
+
+    def _compact(self):
+        """Verschiebt die unvollständige Zeile an den Pufferanfang."""
+        n = self._end - self._start
+        self._buf[:n] = self._buf[self._start:self._end]
+        self._scan -= self._start
+        self._start = 0
+        self._end = n
+
+    def _overflow(self):
+        """Puffer voll ohne Zeilenende: Zeile verwerfen, Rest bis zum nächsten b"\\n" überspringen."""
+        dropped = self._end
+        self._start = self._scan = self._end = 0
+        self.stats["dropped_bytes"] += dropped
+        if self._skipping:
+            return  # dieselbe überlange Zeile wurde schon gemeldet
+        self._skipping = True
+        self.stats["overflows"] += 1
+        if self.on_overflow is not None:
+            self.on_overflow(dropped)
+
+
+class LineProtocol(asyncio.BufferedProtocol):
+    """
+    asyncio-Protokoll, das direkt in den Puffer eines ``LineFramer`` liest.
+
+    ``on_line(line)`` wird für jede vollständige Zeile aufgerufen,
+    ``closed`` ist ein Future, das beim Verbindungsende erfüllt wird
+    (Ergebnis: Exception oder None).
+    """
+
+    def __init__(self, on_line, max_line=MAX_LINE, on_overflow=None):
+        self.on_line = on_line
+        self.framer = LineFramer(max_line, on_overflow=on_overflow)
+        self.closed = asyncio.get_running_loop().create_future()
+        self.transport = None
+
+    def connection_made(self, transport):
+        self.transport = transport
+        # TCP-Keepalive erkennt eine stillschweigend abgerissene Verbindung
+        sock = transport.get_extra_info('socket')
+        if sock is not None and sock.family in (socket.AF_INET, socket.AF_INET6):
+            sock.setsockopt(socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1)
+
+    def get_buffer(self, sizehint):
+        return self.framer.get_buffer()
+
+    def buffer_updated(self, nbytes):
+        for line in self.framer.advance(nbytes):
+            self.on_line(line)
+
+    def eof_received(self):
+        return False  # Transport schließen
+
+    def connection_lost(self, exc):
+        if not self.closed.done():
+            self.closed.set_result(exc)
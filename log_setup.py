@@ -0,0 +1,107 @@
+"""
+Logging ohne Datei-I/O im Aufrufer
+==================================
+
+Gemeinsames Logging für Webhook-Server und FritzBox-Monitor.
+
+Log-Aufrufe legen den Eintrag nur in eine Queue (``QueueHandler``); ein
+Listener-Thread formatiert ihn und schreibt ihn in die Logdatei und auf
+die Konsole. Das Lesen vom FritzBox-Socket oder die Antwort auf einen
+Webhook wartet so nie auf die Festplatte.
+
+Die Logdatei wird nach Größe (``LOG_MAX_BYTES``) oder zeitbasiert
+(``LOG_ROTATE_WHEN``, z.B. ``midnight``) rotiert.
+
+Debug-Meldungen mit Parametern statt f-Strings schreiben - bei
+deaktiviertem DEBUG kostet der Aufruf dann nur eine Level-Prüfung:
+
+    logger.debug("Zeile %d: %r", line_no, line)
+
+Verwendung:
+    logger = setup_logging("fritzbox_monitor", DATA_DIR / "fritzbox_calls.log")
+    logger.info("📞 Anruf gespeichert: ...")
+"""
+
+import atexit
+import logging
+import logging.handlers
+import os
+import queue
+import sys
+
+# --- Konfiguration ---
+LOG_LEVEL = os.environ.get('LOG_LEVEL', 'INFO').upper()
+# Größenbasierte Rotation (Bytes pro Datei, Anzahl alter Dateien)
+LOG_MAX_BYTES = int(os.environ.get('LOG_MAX_BYTES', str(10 * 1024 * 1024)))
+LOG_BACKUP_COUNT = int(os.environ.get('LOG_BACKUP_COUNT', '5'))
+# Zeitbasierte Rotation statt Größe, z.B. "midnight" oder "H" (leer = aus)
+LOG_ROTATE_WHEN = os.environ.get('LOG_ROTATE_WHEN', '')
+# Zusätzlich auf stdout ausgeben (z.B. für nohup oder systemd-journal)
+LOG_CONSOLE = os.environ.get('LOG_CONSOLE', '1') not in ('0', 'false', 'no')
+
+LOG_FORMAT = "[%(asctime)s] %(message)s"
+DATE_FORMAT = "%Y-%m-%d %H:%M:%S"
+
+if LOG_LEVEL not in ("DEBUG", "INFO", "WARNING", "ERROR", "CRITICAL"):
+    raise ValueError("LOG_LEVEL must be DEBUG, INFO, WARNING, ERROR or CRITICAL.")
+
+_listeners = {}
+
+
+def _file_handler(log_file):
+    if LOG_ROTATE_WHEN:
+        return logging.handlers.TimedRotatingFileHandler(
+            log_file, when=LOG_ROTATE_WHEN, backupCount=LOG_BACKUP_COUNT, encoding="utf-8"
+        )
+    return logging.handlers.RotatingFileHandler(
+        log_file, maxBytes=LOG_MAX_BYTES, backupCount=LOG_BACKUP_COUNT, encoding="utf-8"
+    )
+
+
+def setup_logging(name, log_file=None, level=LOG_LEVEL):
+    """
+    Richtet einen Logger mit Queue und Listener-Thread ein (einmal pro Prozess).
+
+    Args:
+        name: Name des Loggers
+        log_file: Logdatei mit Rotation (None = nur Konsole)
+        level: Log-Level (Standard: LOG_LEVEL)
+
+    Returns:
+        logging.Logger
+    """
+    logger = logging.getLogger(name)
+    if name in _listeners:
+        return logger
+
+    formatter = logging.Formatter(LOG_FORMAT, DATE_FORMAT)
+    handlers = []
+    if log_file is not None:
+        handlers.append(_file_handler(log_file))
+    if LOG_CONSOLE:
+        handlers.append(logging.StreamHandler(sys.stdout))
+    for handler in handlers:
+        handler.setFormatter(formatter)
+
+    log_queue = queue.SimpleQueue()
+    listener = logging.handlers.QueueListener(log_queue, *handlers, respect_handler_level=True)
+    listener.start()
+    _listeners[name] = listener
+    atexit.register(listener.stop)  # schreibt noch wartende Einträge
+
+    logger.addHandler(logging.handlers.QueueHandler(log_queue))
+    logger.setLevel(level)
+    logger.propagate = False
+    return logger
+
+
+def restart_after_fork():
+    """
+    Startet die Listener-Threads im Kindprozess neu (z.B. gunicorn-Worker).
+
+    Threads überleben ``fork()`` nicht - ohne Neustart würden Log-Einträge
+    im Kindprozess nur noch in der Queue landen.
+    """
+    for listener in _listeners.values():
+        listener._thread = None
+        listener.start()
@@ -0,0 +1,163 @@
+"""
+Rückrufnummern aus dem Webhook-content
+======================================
+
+Der digitale Assistent von Placetel schreibt die Rückrufnummer des
+Anrufers in den Freitext (``content``), z.B.:
+
+    "Rückrufnummer: +49 151 2345678"
+    "Telefonnummer: 0 15 1 234 56 78"
+    "Mobil: 0151/2345678"
+    "Handy: +49 (0)151-2345678"
+
+Alle Schreibweisen werden von EINEM beim Import kompilierten Pattern
+erkannt. Die Nummer wird direkt beim Treffer normalisiert (nur Ziffern,
+internationale Nummern mit führendem ``+``).
+
+Die Nummer endet nur an einem eindeutigen Ende: " / " (Schrägstrich mit
+Leerzeichen) oder eine Gruppe mit neuer Vorwahl (``+``, ``00``, ``0171``)
+beginnt eine zweite Nummer, eine Uhrzeit ("... 12 Uhr") gehört nicht dazu,
+und mehr als 15 Ziffern werden gekürzt. Wie viele Ziffern eine einzelne
+Gruppe hat, spielt keine Rolle ("0176 12345 6789"). Nachgeschnitten wird
+nur, wenn der Treffer einen dieser seltenen Fälle enthalten kann - der
+häufige Fall kostet genau einen Pattern-Durchlauf.
+
+Stehen mehrere Angaben im Text, gewinnt die zuverlässigste:
+Rückrufnummer > Telefonnummer > Rückruf > Handy/Mobil > Telefon/Tel.
+"""
+
+import re
+
+# Mindestanzahl Ziffern für eine gültige Nummer / Maximum nach E.164
+MIN_DIGITS = 6
+MAX_DIGITS = 15
+
+# Ein Pattern für alle Schreibweisen. Die Schlüsselwörter sind nach
+# gemeinsamen Präfixen zusammengefasst (kein Backtracking über viele
+# Alternativen); re.ASCII hält die Groß-/Kleinschreibungs-Prüfung billig,
+# deshalb steht das große Ü explizit im Pattern.
+_PHONE_PATTERN = re.compile(
+    r"\b(?P<keyword>r(?:ü|Ü|ue)ckruf(?:nummer)?|telefon(?:nummer)?|tel\.?"
+    r"|handy(?:nummer)?|mobil(?:funk)?(?:nummer)?)"
+    r"[ \t]*:?[ \t]*"
+    # Nummer: optional +/00, dann Ziffern mit Leerzeichen, -, /, ( ) - nie über
+    # Zeilenenden hinweg. Folgt direkt "Uhr" oder ":30", war die letzte
+    # Zahlengruppe eine Uhrzeit.
+    r"(?P<number>(?:\+|00)?[ \t]*\(?\d[\d \t\-/()]*)(?P<time>uhr\b|[:.]\d)?",
+    re.IGNORECASE | re.ASCII,
+)
+
+# Zuverlässigkeit der Schlüsselwörter (kleiner = besser)
+_KEYWORD_RANKS = {
+    "rückrufnummer": 0,
+    "telefonnummer": 1,
+    "rückruf": 2,
+    "handy": 3, "handynummer": 3,
+    "mobil": 3, "mobilnummer": 3, "mobilfunk": 3, "mobilfunknummer": 3,
+    "telefon": 4, "tel": 4, "tel.": 4,
+}
+
+# Auch in Groß-/ue-Schreibweise, damit der Treffer ohne .lower() nachgeschlagen wird
+_KEYWORD_RANKS.update({
+    spelling: rank
+    for keyword, rank in list(_KEYWORD_RANKS.items())
+    for variant in (keyword, keyword.capitalize(), keyword.upper())
+    for spelling in (variant, variant.replace("ü", "ue").replace("Ü", "UE"))
+})
+
+# Beginn einer zweiten Nummer: " / " oder eine Gruppe mit neuer Vorwahl (+, 00, 0171)
+_SECOND_NUMBER = re.compile(r"[ \t]+/|/[ \t]|[ \t]+(?=\+|0\d\d|00)")
+
+# Trennzeichen, die beim Normalisieren entfernt werden. Die Nummer ist reines
+# ASCII (re.ASCII), bytes.translate löscht deutlich schneller als str.translate.
+_SEPARATORS = b" \t-/()+"
+
+
+def _first_number(raw, time):
+    """
+    Schneidet alles hinter der ersten Nummer ab (seltener Fall, siehe extract_phone).
+
+    "0151 2345678 / 0171 9876543" -> "0151 2345678"
+    "030 12345678 12" + "Uhr"     -> "030 12345678"
+    """
+    second = _SECOND_NUMBER.search(raw)
+    if second:
+        return raw[:second.start()]
+    if time:
+        groups = raw.split()
+        if len(groups) > 1:
+            return " ".join(groups[:-1])
+    return raw
+
+
+def normalize_raw_number(raw):
+    """
+    Normalisiert eine gefundene Nummer: nur Ziffern, international mit "+".
+
+    "+49 (0)151 234567" -> "+49151234567"
+    "0049 151 234567"   -> "+49151234567"
+    "0151/23 45 67"     -> "0151234567"
+
+    Returns:
+        Normalisierte Nummer oder None, wenn zu wenige oder zu viele Ziffern
+    """
+    international = raw[:1] == "+" or raw[:2] == "00"
+    if international and "(0)" in raw:
+        raw = raw.replace("(0)", "", 1)  # nationale 0 in "+49 (0)..." entfällt
+
+    digits = raw.encode().translate(None, _SEPARATORS).decode()
+
+    if len(digits) > MAX_DIGITS:
+        # Selten: länger als E.164 erlaubt - nachfolgende Zahlengruppen abschneiden
+        groups = raw.split()
+        while len(groups) > 1 and len(digits) > MAX_DIGITS:
+            groups.pop()
+            digits = "".join(groups).encode().translate(None, _SEPARATORS).decode()
+
+    if not MIN_DIGITS <= len(digits) <= MAX_DIGITS:
+        return None
+
+    if not international:
+        return digits
+    return "+" + (digits[2:] if raw[0] == "0" else digits)  # "0049..." -> "+49..."
+
+
+def extract_phone(content):
+    """
+    Extrahiert die Rückrufnummer aus dem content-Text des Webhooks.
+
+    Args:
+        content: Der content-String aus dem Webhook
+
+    Returns:
+        Normalisierte Telefonnummer als String oder None
+    """
+    if not content:
+        return None
+
+    best_rank = None
+    best_phone = None
+
+    for keyword, raw, time in _PHONE_PATTERN.findall(content):
+        rank = _KEYWORD_RANKS.get(keyword)
+        if rank is None:  # gemischte Schreibweise, z.B. "TelefonNummer"
+            rank = _KEYWORD_RANKS[keyword.lower().replace("ue", "ü")]
+        if best_rank is not None and rank >= best_rank:
+            continue
+
+        # Nur wenn eine zweite Nummer oder Uhrzeit folgen kann, wird nachgeschnitten
+        if time or " /" in raw or "/ " in raw or " +" in raw or " 0" in raw or "\t" in raw:
+            raw = _first_number(raw, time)
+
+        phone = normalize_raw_number(raw)
+        if phone:
+            best_rank, best_phone = rank, phone
+            if rank == 0:
+                break  # zuverlässigste Angabe gefunden
+
+    return best_phone
+
+
+def extract_phones(contents):
+    """Batch-Variante für den Import: eine Nummer (oder None) pro content-String."""
+    return [extract_phone(content) for content in contents]
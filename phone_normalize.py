@@ -0,0 +1,89 @@
+"""
+Telefonnummern im E.164-Format
+==============================
+
+Gemeinsame Normalisierung für Webhook-Server und FritzBox-Monitor.
+
+Die FritzBox liefert nationale Nummern (``0151…``), Placetel und der
+digitale Assistent internationale (``+49 151 …``, ``0049…``). Für
+Vergleiche und Indizes wird jede Nummer beim Schreiben in die kanonische
+Form ``+<Ländercode><Nummer>`` gebracht:
+
+    "0151 234 567 89"     -> "+4915123456789"
+    "+49 (0)151-23456789" -> "+4915123456789"
+    "0049 151 23456789"   -> "+4915123456789"
+
+Nummern ohne Vorwahl, Platzhalter wie "Weiterleitung (Praxis)" und
+unterdrückte Nummern ergeben ``None``.
+"""
+
+import functools
+import os
+
+# Ländervorwahl für nationale Nummern (0…)
+DEFAULT_COUNTRY_CODE = os.environ.get('PHONE_COUNTRY_CODE', '49')
+
+MIN_DIGITS = 6
+MAX_DIGITS = 15  # E.164
+
+_SEPARATORS = " \t-/().+"
+_DIGITS_ONLY = str.maketrans("", "", _SEPARATORS)
+
+
+def to_e164(number, country_code=DEFAULT_COUNTRY_CODE):
+    """
+    Bringt eine Telefonnummer in die kanonische E.164-Form.
+
+    Returns:
+        "+<Ziffern>" oder None, wenn die Nummer nicht eindeutig ist
+    """
+    if not number:
+        return None
+
+    number = number.strip()
+    international = number.startswith("+")
+    if international and "(0)" in number:
+        number = number.replace("(0)", "", 1)  # nationale 0 in "+49 (0)..." entfällt
+
+    digits = number.translate(_DIGITS_ONLY)
+    if not digits.isdigit():
+        return None  # Buchstaben o.ä. - keine Telefonnummer
+
+    if international:
+        pass
+    elif digits.startswith("00"):
+        digits = digits[2:]
+    elif digits.startswith("0"):
+        digits = country_code + digits[1:]
+    else:
+        return None  # Ortsnummer ohne Vorwahl
+
+    if not MIN_DIGITS <= len(digits) <= MAX_DIGITS:
+        return None
+
+    return "+" + digits
+
+
+def same_subscriber(number, practice_number):
+    """
+    Prüft, ob ``number`` die Anschlussnummer ``practice_number`` ist.
+
+    ``practice_number`` enthält die Vorwahl, durch "/" von der Rufnummer
+    getrennt (z.B. "03836/200893"). Verglichen wird die kanonische Nummer
+    exakt - ein Mobilanrufer "+4915111200893" ist nicht die Praxis. Nur
+    Ortsnummern ohne Vorwahl (so meldet die FritzBox die angerufene Nummer)
+    werden mit der Rufnummer hinter dem "/" verglichen.
+    """
+    practice_e164, local_number = _practice_numbers(practice_number)
+    canonical = to_e164(number)
+    if canonical is None:
+        # Ortsnummer ohne Vorwahl: Ziffern müssen exakt übereinstimmen
+        return bool(number) and number.translate(_DIGITS_ONLY) == local_number
+    return canonical == practice_e164
+
+
+@functools.lru_cache(maxsize=32)
+def _practice_numbers(practice_number):
+    """"03836/200893" -> ("+493836200893", "200893")"""
+    area_code, _, local_number = practice_number.rpartition("/")
+    return to_e164(area_code + local_number), local_number
@@ -0,0 +1,101 @@
+"""
+RING-Zuordnung im Speicher
+==========================
+
+Zeitlich sortierte Liste ungematchter FritzBox-RING-Events.
+
+Bildet dieselbe Regel ab wie ``find_real_phone_number`` in SQL: Kandidaten
+sind alle Einträge mit ``timestamp >= webhook_timestamp - time_window``,
+genommen wird der zeitlich nächste. Die Suche ist eine binäre Suche
+(``bisect``) statt eines Sortierens aller Kandidaten.
+
+``RecentCallers`` ist der Duplikats-Filter des FritzBox-Monitors: die
+FritzBox sendet pro Anruf mehrere RINGs, gespeichert wird nur der erste.
+"""
+
+import bisect
+from collections import OrderedDict
+
+
+class RingIndex:
+    """Ungematchte RING-Events, sortiert nach Timestamp."""
+
+    def __init__(self):
+        self._timestamps = []
+        self._entries = []
+
+    def __len__(self):
+        return len(self._entries)
+
+    def add(self, timestamp, entry):
+        """Fügt ein Event hinzu (``entry`` ist frei wählbar, z.B. dict oder ID)."""
+        i = bisect.bisect_right(self._timestamps, timestamp)
+        self._timestamps.insert(i, timestamp)
+        self._entries.insert(i, entry)
+
+    def claim_nearest(self, timestamp, time_window=300):
+        """
+        Entfernt das zeitlich nächste Event im Zeitfenster und gibt es zurück.
+
+        Returns:
+            (timestamp, entry) oder None
+        """
+        i = bisect.bisect_left(self._timestamps, timestamp)
+        min_time = timestamp - time_window
+
+        best = None
+        if i > 0 and self._timestamps[i - 1] >= min_time:
+            best = i - 1
+        if i < len(self._timestamps):
+            # Bei gleichem Abstand gewinnt das frühere Event
+            if best is None or self._timestamps[i] - timestamp < timestamp - self._timestamps[best]:
+                best = i
+
+        if best is None:
+            return None
+
+        return self._timestamps.pop(best), self._entries.pop(best)
+
+    def prune(self, before):
+        """Entfernt alle Events älter als ``before``; gibt die Anzahl zurück."""
+        i = bisect.bisect_left(self._timestamps, before)
+        del self._timestamps[:i]
+        del self._entries[:i]
+        return i
+
+
+class RecentCallers:
+    """Zuletzt gespeicherte Anrufernummern (begrenzt, verfallen nach ``window`` Sekunden)."""
+
+    def __init__(self, window=10, max_size=10000):
+        self.window = window
+        self.max_size = max_size
+        self._last_seen = OrderedDict()  # Nummer -> Timestamp, älteste zuerst
+
+    def __len__(self):
+        return len(self._last_seen)
+
+    def is_duplicate(self, number, timestamp):
+        """
+        Prüft, ob ``number`` innerhalb des Fensters schon gespeichert wurde.
+
+        Ist das nicht der Fall, wird ``timestamp`` als neuer Zeitpunkt gemerkt.
+        """
+        self._evict(timestamp)
+
+        last = self._last_seen.get(number)
+        if last is not None and timestamp - last <= self.window:
+            return True
+
+        self._last_seen[number] = timestamp
+        self._last_seen.move_to_end(number)
+        if len(self._last_seen) > self.max_size:
+            self._last_seen.popitem(last=False)
+        return False
+
+    def _evict(self, now):
+        while self._last_seen:
+            number, timestamp = next(iter(self._last_seen.items()))
+            if now - timestamp <= self.window:
+                break
+            del self._last_seen[number]
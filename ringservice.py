@@ -0,0 +1,288 @@
+"""
+RING-Zuordnung über einen lokalen Socket
+========================================
+
+Der FritzBox-Monitor hält die ungematchten RING-Events im Speicher
+(``RingIndex``) und beantwortet Zuordnungs-Anfragen des Webhook-Servers
+über einen Unix Domain Socket. Eine Weiterleitung kostet damit keine
+Schreibsperre auf ``phone_lookup`` im Webhook-Prozess mehr.
+
+Protokoll (eine JSON-Zeile pro Anfrage und Antwort):
+
+    -> {"op": "claim", "timestamp": 1735725000, "time_window": 300}
+    <- {"ok": true, "match": {"id": 17, "timestamp": 1735724990, "caller_number": "0151…"}}
+    -> {"op": "ack", "id": 17}
+    <- {"ok": true}
+
+    <- {"ok": true, "match": null}
+    <- {"ok": false, "error": "..."}
+
+Die Zuordnung ist zweiphasig: vor der Antwort trägt der Monitor
+``matched = 1`` in SQLite ein (``on_claim``) - hat die SQLite-Suche des
+Webhook-Servers den RING inzwischen selbst vergeben, wird der nächste
+genommen. Bestätigt der Webhook-Server den Treffer nicht innerhalb von
+``ACK_TIMEOUT`` (z.B. weil er nach RING_SOCKET_TIMEOUT schon in SQLite
+sucht), nimmt der Monitor die Zuordnung zurück (``on_release``).
+
+Ist der Socket nicht erreichbar (Monitor läuft nicht, alte Version),
+wirft ``claim_nearest_ring`` ``RingServiceUnavailable`` und der Aufrufer
+sucht wie bisher in SQLite.
+
+Verwendung (Monitor):
+    service = RingMatchServer(SOCKET_PATH, on_claim=mark_matched, on_release=mark_unmatched)
+    service.start()
+    service.add(timestamp, {"id": row_id, "caller_number": caller})
+
+Verwendung (Webhook):
+    match = claim_nearest_ring(webhook_timestamp)  # Socket aus RING_SOCKET
+"""
+
+import json
+import os
+import socket
+import socketserver
+import threading
+
+from ringmatch import RingIndex
+from storage import DATA_DIR
+
+# Socket-Pfad; leer = Zuordnung nur über SQLite
+SOCKET_PATH = os.environ.get('RING_SOCKET', str(DATA_DIR / "ringmatch.sock"))
+# Timeout (Sekunden) für eine Anfrage des Webhook-Servers
+CLIENT_TIMEOUT = float(os.environ.get('RING_SOCKET_TIMEOUT', '0.5'))
+# Sekunden, die der Monitor nach einem Treffer auf die Bestätigung wartet
+ACK_TIMEOUT = max(2.0, 4 * CLIENT_TIMEOUT)
+
+# Maximale Länge einer Anfrage-Zeile
+_MAX_LINE = 4096
+
+
+class RingServiceUnavailable(Exception):
+    """Der Zuordnungs-Dienst ist nicht erreichbar oder antwortet fehlerhaft."""
+
+
+class _Handler(socketserver.StreamRequestHandler):
+    """Beantwortet Anfragen einer Verbindung, eine JSON-Zeile nach der anderen."""
+
+    def handle(self):
+        service = self.server.service
+        while True:
+            line = self.rfile.readline(_MAX_LINE)
+            if not line:
+                return
+            try:
+                response = service.handle_request(json.loads(line))
+            except Exception as e:
+                response = {"ok": False, "error": str(e)}
+
+            match = response.get("match")
+            try:
+                self._send(response)
+            except OSError:
+                if match is not None:
+                    service.release(match["id"])
+                return
+
+            if match is not None and not self._await_ack(match["id"]):
+                return
+
+    def _send(self, response):
+        self.wfile.write(json.dumps(response).encode("utf-8") + b"\n")
+        self.wfile.flush()
+
+    def _await_ack(self, entry_id):
+        """Wartet auf die Bestätigung eines Treffers; ohne sie wird er zurückgenommen."""
+        self.connection.settimeout(ACK_TIMEOUT)
+        try:
+            ack = json.loads(self.rfile.readline(_MAX_LINE) or b"null")
+        except (OSError, ValueError):
+            ack = None
+        finally:
+            self.connection.settimeout(None)
+
+        if not (isinstance(ack, dict) and ack.get("op") == "ack" and ack.get("id") == entry_id):
+            self.server.service.release(entry_id)
+            return False
+        self.server.service.confirm(entry_id)
+        try:
+            self._send({"ok": True})
+        except OSError:
+            return False
+        return True
+
+
+class _Server(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    daemon_threads = True
+    # Mehrere gleichzeitige Webhooks dürfen nicht an einer vollen Accept-Queue scheitern
+    request_queue_size = 128
+
+
+class RingMatchServer:
+    """Ungematchte RING-Events im Speicher, abfragbar über einen Unix Socket."""
+
+    def __init__(self, socket_path=SOCKET_PATH, on_claim=None, on_release=None, log=print):
+        """
+        Args:
+            socket_path: Pfad des Unix Domain Sockets
+            on_claim: Callable(entry) -> bool, wird vor der Antwort aufgerufen
+                (z.B. ``matched = 1`` in SQLite); False = Eintrag ist schon
+                anderweitig vergeben und wird verworfen
+            on_release: Callable(entry), nimmt eine unbestätigte Zuordnung
+                zurück (z.B. ``matched = 0``)
+            log: Funktion für Statusmeldungen
+        """
+        self.socket_path = socket_path
+        self.on_claim = on_claim
+        self.on_release = on_release
+        self.log = log
+
+        self._rings = RingIndex()
+        self._pending = {}
+        self._lock = threading.Lock()
+        self._server = None
+        self._thread = None
+
+        self.stats = {"added": 0, "claims": 0, "matched": 0, "taken": 0, "released": 0}
+
+    def __len__(self):
+        with self._lock:
+            return len(self._rings)
+
+    def add(self, timestamp, entry):
+        """Nimmt ein RING-Event auf (``entry``: dict mit id und caller_number)."""
+        with self._lock:
+            self._rings.add(timestamp, entry)
+        self.stats["added"] += 1
+
+    def claim(self, timestamp, time_window=300):
+        """
+        Entfernt das zeitlich nächste Event im Zeitfenster.
+
+        Der Treffer bleibt vorgemerkt, bis ``confirm`` oder ``release``
+        aufgerufen wird.
+
+        Returns:
+            dict mit id, timestamp, caller_number oder None
+        """
+        self.stats["claims"] += 1
+        while True:
+            with self._lock:
+                match = self._rings.claim_nearest(timestamp, time_window)
+            if match is None:
+                return None
+
+            ring_ts, entry = match
+            try:
+                claimed = self.on_claim is None or self.on_claim(entry)
+            except Exception:
+                with self._lock:
+                    self._rings.add(ring_ts, entry)
+                raise
+            if claimed:
+                break
+            # In SQLite schon vergeben (Zuordnung ohne Socket) - nächsten nehmen
+            self.stats["taken"] += 1
+
+        with self._lock:
+            self._pending[entry["id"]] = (ring_ts, entry)
+        self.stats["matched"] += 1
+        return dict(entry, timestamp=ring_ts)
+
+    def confirm(self, entry_id):
+        """Der Webhook-Server hat den Treffer übernommen."""
+        with self._lock:
+            self._pending.pop(entry_id, None)
+
+    def release(self, entry_id):
+        """Nimmt einen unbestätigten Treffer zurück und stellt ihn wieder zur Verfügung."""
+        with self._lock:
+            pending = self._pending.pop(entry_id, None)
+        if pending is None:
+            return
+        ring_ts, entry = pending
+        if self.on_release is not None:
+            self.on_release(entry)
+        with self._lock:
+            self._rings.add(ring_ts, entry)
+        self.stats["released"] += 1
+
+    def prune(self, before):
+        """Entfernt Events älter als ``before``; gibt die Anzahl zurück."""
+        with self._lock:
+            return self._rings.prune(before)
+
+    def handle_request(self, request):
+        if request.get("op") == "claim":
+            match = self.claim(int(request["timestamp"]), int(request.get("time_window", 300)))
+            return {"ok": True, "match": match}
+        if request.get("op") == "stats":
+            return {"ok": True, "stats": dict(self.stats, pending=len(self))}
+        return {"ok": False, "error": f"unbekannte Operation: {request.get('op')!r}"}
+
+    def start(self):
+        """Öffnet den Socket und beantwortet Anfragen in einem Hintergrund-Thread."""
+        if self._server is not None:
+            return
+
+        # Verwaister Socket eines beendeten Monitors
+        if os.path.exists(self.socket_path):
+            os.unlink(self.socket_path)
+
+        self._server = _Server(self.socket_path, _Handler)
+        self._server.service = self
+        self._thread = threading.Thread(target=self._server.serve_forever, name="ring-service", daemon=True)
+        self._thread.start()
+        self.log(f"🔌 RING-Zuordnung über Socket: {self.socket_path}")
+
+    def stop(self):
+        """Schließt den Socket."""
+        if self._server is None:
+            return
+        self._server.shutdown()
+        self._server.server_close()
+        self._thread.join()
+        self._server = None
+        self._thread = None
+        try:
+            os.unlink(self.socket_path)
+        except FileNotFoundError:
+            pass
+
+
+def claim_nearest_ring(webhook_timestamp, time_window=300, socket_path=SOCKET_PATH,
+                       timeout=CLIENT_TIMEOUT):
+    """
+    Fragt beim FritzBox-Monitor die zeitlich nächste ungematchte Anrufernummer an
+    und bestätigt den Treffer.
+
+    Returns:
+        dict mit id, timestamp, caller_number oder None (kein RING im Zeitfenster)
+
+    Raises:
+        RingServiceUnavailable: Socket nicht erreichbar oder ungültige Antwort
+    """
+    request = {"op": "claim", "timestamp": int(webhook_timestamp), "time_window": time_window}
+    try:
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+            sock.settimeout(timeout)
+            sock.connect(socket_path)
+            sock.sendall(json.dumps(request).encode("utf-8") + b"\n")
+            with sock.makefile("rb") as f:
+                response = json.loads(f.readline(_MAX_LINE))
+                if not response.get("ok"):
+                    raise RingServiceUnavailable(response.get("error", "ungültige Antwort"))
+                match = response["match"]
+                if match is None:
+                    return None
+
+                # Ohne Bestätigung nimmt der Monitor die Zuordnung zurück; kommt die
+                # Quittung nicht an, sucht der Aufrufer in SQLite (der RING bleibt
+                # dann im Zweifel unvergeben statt doppelt vergeben)
+                sock.sendall(json.dumps({"op": "ack", "id": match["id"]}).encode("utf-8") + b"\n")
+                ack = json.loads(f.readline(_MAX_LINE))
+    except (OSError, ValueError) as e:
+        raise RingServiceUnavailable(str(e)) from e
+
+    if not ack.get("ok"):
+        raise RingServiceUnavailable(ack.get("error", "Bestätigung abgelehnt"))
+    return match
@@ -11,6 +11,6 @@ else
     exit 1
 fi
 
-# Start the production server
+# Start the production server (gunicorn, see gunicorn.conf.py)
 echo "Starting production server..."
-python3 webhook_server_prod.py
+exec python3 -m gunicorn -c gunicorn.conf.py wsgi:app
@@ -0,0 +1,337 @@
+// Anruf-Dashboard - Uhr, Statistik-Karten, Anrufliste mit Suche und Auto-Refresh
+// (eingebunden in templates/dashboard.html, Daten der ersten Seite als JSON im Template)
+
+// --- Live Clock ---
+function updateClock() {
+    const now = new Date();
+    const timeString = now.toLocaleTimeString('de-DE', {
+        hour: '2-digit',
+        minute: '2-digit',
+        second: '2-digit'
+    });
+    const dateString = now.toLocaleDateString('de-DE', {
+        weekday: 'short',
+        day: '2-digit',
+        month: '2-digit',
+        year: 'numeric'
+    });
+    document.getElementById('current-time').textContent = `${dateString} - ${timeString}`;
+}
+updateClock();
+setInterval(updateClock, 1000);
+
+// --- Statistik-Karten ---
+function startOfToday() {
+    const today = new Date();
+    today.setHours(0, 0, 0, 0);
+    return Math.floor(today.getTime() / 1000);
+}
+
+// Zahlen kommen aus den Zählern des Servers (/api/stats), nicht aus den geladenen Zeilen
+function refreshStats() {
+    fetch('/api/stats')
+        .then(response => {
+            if (!response.ok) {
+                throw new Error(`HTTP ${response.status}`);
+            }
+            return response.json();
+        })
+        .then(stats => {
+            document.getElementById('total-calls').textContent = stats.total;
+            document.getElementById('new-calls').textContent = stats.new;
+            document.getElementById('done-calls').textContent = stats.done;
+            document.getElementById('today-calls').textContent = stats.today;
+        })
+        .catch(error => console.error('Error:', error));
+}
+
+// --- Anrufliste (seitenweise über /api/calls) ---
+// Erste Seite und Seitengröße liefert das Template (dashboard.html)
+const INITIAL_PAGE = JSON.parse(document.getElementById('initial-page').textContent);
+const PAGE_SIZE = parseInt(document.currentScript.dataset.pageSize);
+const SEARCH_DELAY_MS = 250;
+
+const searchBox = document.getElementById('search-box');
+const tableBody = document.getElementById('calls-body');
+const loadMoreBtn = document.getElementById('load-more');
+const statusFilter = document.getElementById('status-filter');
+const periodFilter = document.getElementById('period-filter');
+let nextCursor = null;
+let pagesLoaded = 0;
+let loading = false;
+let requestSeq = 0;
+
+function formatTimestamp(ts) {
+    if (ts === null || ts === undefined) {
+        return 'N/A';
+    }
+    return new Date(ts * 1000).toLocaleString('de-DE', {
+        day: '2-digit', month: '2-digit', year: 'numeric',
+        hour: '2-digit', minute: '2-digit', second: '2-digit'
+    }).replace(',', '');
+}
+
+function createElement(tag, className, text) {
+    const element = document.createElement(tag);
+    if (className) {
+        element.className = className;
+    }
+    if (text !== undefined && text !== null) {
+        element.textContent = text;
+    }
+    return element;
+}
+
+function badge(className, iconName, text) {
+    const span = createElement('span', className);
+    span.appendChild(createElement('i', `bi ${iconName}`));
+    span.appendChild(document.createTextNode(text ?? ''));
+    return span;
+}
+
+function renderRow(call) {
+    const row = document.createElement('tr');
+    row.dataset.id = call.id;
+    row.dataset.status = call.status;
+    row.dataset.timestamp = call.timestamp;
+
+    const checkbox = createElement('input', 'status-checkbox');
+    checkbox.type = 'checkbox';
+    checkbox.checked = call.status === 'done';
+    row.appendChild(createElement('td')).appendChild(checkbox);
+
+    row.appendChild(createElement('td')).appendChild(badge('time-badge', 'bi-clock', formatTimestamp(call.timestamp)));
+
+    const nameCell = createElement('div', 'name-cell');
+    nameCell.appendChild(createElement('div', 'name-icon', call.caller_name ? call.caller_name.slice(0, 1) : '?'));
+    nameCell.appendChild(createElement('strong', null, call.caller_name));
+    row.appendChild(createElement('td')).appendChild(nameCell);
+
+    row.appendChild(createElement('td', null, call.caller_dob));
+    row.appendChild(createElement('td')).appendChild(badge('phone-badge', 'bi-phone', call.phone));
+    row.appendChild(createElement('td')).appendChild(badge('reason-badge', 'bi-chat-dots', call.call_reason));
+
+    const categoryCell = createElement('td');
+    if (call.category) {
+        categoryCell.appendChild(badge('category-badge', 'bi-tags', call.category));
+    } else {
+        const empty = createElement('span', null, '-');
+        empty.style.color = '#999';
+        categoryCell.appendChild(empty);
+    }
+    row.appendChild(categoryCell);
+
+    const deleteBtn = createElement('button', 'delete-btn');
+    deleteBtn.appendChild(createElement('i', 'bi bi-trash3-fill'));
+    row.appendChild(createElement('td')).appendChild(deleteBtn);
+    return row;
+}
+
+function showEmptyMessage() {
+    const cell = createElement('td', 'no-results');
+    cell.colSpan = 8;
+    cell.appendChild(createElement('i', 'bi bi-inbox'));
+    let message = 'Noch keine Anrufe in der Datenbank.';
+    if (searchQuery()) {
+        message = `Keine Treffer für "${searchQuery()}".`;
+    } else if (filtersActive()) {
+        message = 'Keine Anrufe für diesen Filter.';
+    }
+    cell.appendChild(createElement('p', null, message));
+    tableBody.appendChild(createElement('tr')).appendChild(cell);
+}
+
+function renderPage(page, append) {
+    if (!append) {
+        tableBody.replaceChildren();
+        pagesLoaded = 0;
+    }
+    page.calls.forEach(call => tableBody.appendChild(renderRow(call)));
+    pagesLoaded++;
+    nextCursor = page.next_cursor;
+    loadMoreBtn.hidden = !nextCursor;
+    if (!tableBody.querySelector('tr[data-id]')) {
+        showEmptyMessage();
+    }
+}
+
+function searchQuery() {
+    return searchBox.value.trim();
+}
+
+function filtersActive() {
+    return Boolean(statusFilter.value || periodFilter.value || searchQuery());
+}
+
+function filterParams() {
+    const params = new URLSearchParams({ limit: PAGE_SIZE });
+    if (statusFilter.value) {
+        params.set('status', statusFilter.value);
+    }
+    if (periodFilter.value === 'today') {
+        params.set('since', startOfToday());
+    } else if (periodFilter.value) {
+        params.set('since', startOfToday() - (parseInt(periodFilter.value) - 1) * 86400);
+    }
+    return params;
+}
+
+function fetchPage(cursor) {
+    const params = filterParams();
+    if (cursor) {
+        params.set('cursor', cursor);
+    }
+    // Mit Suchbegriff: Volltextsuche auf dem Server, nach Relevanz sortiert
+    let url = '/api/calls';
+    if (searchQuery()) {
+        params.set('q', searchQuery());
+        url = '/api/calls/search';
+    }
+    return fetch(`${url}?${params}`).then(response => {
+        if (!response.ok) {
+            throw new Error(`HTTP ${response.status}`);
+        }
+        return response.json();
+    });
+}
+
+// Neue Filter oder Suchbegriffe ersetzen eine laufende Anfrage;
+// Antworten älterer Anfragen werden verworfen
+function loadCalls(append) {
+    if (append && loading) {
+        return;
+    }
+    const seq = ++requestSeq;
+    loading = true;
+    loadMoreBtn.disabled = true;
+    fetchPage(append ? nextCursor : null)
+        .then(page => {
+            if (seq === requestSeq) {
+                renderPage(page, append);
+            }
+        })
+        .catch(error => {
+            if (seq === requestSeq) {
+                console.error('Error:', error);
+                alert("Fehler beim Laden der Anrufe.");
+            }
+        })
+        .finally(() => {
+            if (seq === requestSeq) {
+                loading = false;
+                loadMoreBtn.disabled = false;
+            }
+        });
+}
+
+loadMoreBtn.addEventListener('click', () => loadCalls(true));
+statusFilter.addEventListener('change', () => loadCalls(false));
+periodFilter.addEventListener('change', () => loadCalls(false));
+
+// --- Suchfunktion (Volltextsuche auf dem Server, erst nach einer Tipp-Pause) ---
+let searchTimer = null;
+searchBox.addEventListener('input', () => {
+    clearTimeout(searchTimer);
+    searchTimer = setTimeout(() => loadCalls(false), SEARCH_DELAY_MS);
+});
+
+renderPage(INITIAL_PAGE, false);
+
+// --- Event Delegation für dynamische Inhalte ---
+tableBody.addEventListener('click', function(event) {
+    // --- "Erledigt"-Funktion ---
+    if (event.target.classList.contains('status-checkbox')) {
+        const checkbox = event.target;
+        const callId = checkbox.closest('tr').dataset.id;
+        const isDone = checkbox.checked;
+
+        fetch(`/call/${callId}/status`, {
+            method: 'POST',
+            headers: { 'Content-Type': 'application/json' },
+            body: JSON.stringify({ status: isDone ? 'done' : 'new' })
+        })
+        .then(response => response.json())
+        .then(data => {
+            if (data.status === 'ok') {
+                checkbox.closest('tr').dataset.status = isDone ? 'done' : 'new';
+                refreshStats();
+            } else {
+                alert("Fehler beim Speichern des Status.");
+                checkbox.checked = !isDone;
+            }
+        })
+        .catch(error => {
+            console.error('Error:', error);
+            alert("Netzwerkfehler beim Speichern des Status.");
+            checkbox.checked = !isDone;
+        });
+    }
+
+    // --- "Löschen"-Funktion ---
+    if (event.target.closest('.delete-btn')) {
+        const deleteBtn = event.target.closest('.delete-btn');
+        const row = deleteBtn.closest('tr');
+        const callId = row.dataset.id;
+        const nameCell = row.querySelector('.name-cell strong');
+        const callName = nameCell ? nameCell.textContent : 'diesen Anruf';
+
+        if (confirm(`Sind Sie sicher, dass Sie den Anruf von "${callName}" endgültig löschen möchten?`)) {
+            fetch(`/call/${callId}/delete`, {
+                method: 'POST',
+            })
+            .then(response => response.json())
+            .then(data => {
+                if (data.status === 'ok') {
+                    row.style.transition = 'opacity 0.5s ease';
+                    row.style.opacity = '0';
+                    setTimeout(() => {
+                        row.remove();
+                        refreshStats();
+                        if (!tableBody.querySelector('tr[data-id]')) {
+                            showEmptyMessage();
+                        }
+                    }, 500);
+                } else {
+                    alert("Fehler beim Löschen des Anrufs.");
+                }
+            })
+            .catch(error => {
+                console.error('Error:', error);
+                alert("Netzwerkfehler beim Löschen des Anrufs.");
+            });
+        }
+    }
+});
+
+// --- Auto-Refresh ---
+// Nur die erste Seite ohne Filter und Suche: Seite neu laden (Zahlen und Status aktuell).
+// Sonst Zahlen über /api/stats aktualisieren und neue Anrufe oben einfügen, ohne die
+// geladenen Seiten zu verlieren. Suchergebnisse sind nach Relevanz sortiert und bleiben unverändert.
+function refreshCalls() {
+    if (loading || document.hidden) {
+        return;
+    }
+    if (pagesLoaded <= 1 && !filtersActive()) {
+        window.location.reload();
+        return;
+    }
+    refreshStats();
+    if (searchQuery()) {
+        return;
+    }
+    fetchPage(null).then(page => {
+        const firstRow = tableBody.querySelector('tr[data-id]');
+        const newest = firstRow ? parseInt(firstRow.dataset.timestamp) : 0;
+        const fresh = page.calls.filter(call =>
+            call.timestamp >= newest && !tableBody.querySelector(`tr[data-id="${call.id}"]`));
+        if (!fresh.length) {
+            return;
+        }
+        const placeholder = tableBody.querySelector('.no-results');
+        if (placeholder) {
+            placeholder.closest('tr').remove();
+        }
+        fresh.reverse().forEach(call => tableBody.prepend(renderRow(call)));
+    }).catch(error => console.error('Error:', error));
+}
+setInterval(refreshCalls, 30000);
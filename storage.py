@@ -0,0 +1,291 @@
+"""
+SQLite Verbindungsverwaltung
+============================
+
+Gemeinsame Datenbank-Schicht für Webhook-Server und FritzBox-Monitor.
+
+Beide Prozesse schreiben in dieselbe ``database.db``. Damit sich Leser und
+Schreiber nicht gegenseitig blockieren, läuft die Datenbank im WAL-Modus
+und jede Verbindung bekommt dasselbe Pragma-Profil (Busy-Timeout,
+``synchronous``, Cache, mmap, temp_store). Alle Werte sind über
+Environment Variables konfigurierbar.
+
+Statt für jeden Request eine neue Verbindung per ``sqlite3.connect()`` zu
+öffnen (Datei öffnen, Schema parsen, Statement-Cache aufwärmen), verwaltet
+der ``ConnectionPool`` eine begrenzte Anzahl langlebiger Verbindungen:
+
+- Verbindungen werden ausgeliehen und nach Gebrauch zurückgegeben
+- Maximal ``max_size`` Verbindungen gleichzeitig offen
+- Health-Check (``SELECT 1``) für Verbindungen, die länger ungenutzt waren
+- Statement-Cache pro Verbindung (``cached_statements``)
+- Sauberes Schließen aller Verbindungen beim Herunterfahren
+
+Verwendung:
+    init_storage(DB_FILE)          # einmal beim Start: WAL + Bericht
+    pool = ConnectionPool(DB_FILE)
+
+    with pool.connection() as db:
+        db.execute("SELECT ...")
+"""
+
+import os
+import pathlib
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+
+# --- Konfiguration ---
+# Verzeichnis für Datenbank und Logdateien (Standard: neben den Skripten)
+DATA_DIR = pathlib.Path(os.environ.get('DATA_DIR', pathlib.Path(__file__).parent))
+DB_FILE = DATA_DIR / "database.db"
+
+# Wie lange auf eine gesperrte DB gewartet wird, bevor "database is locked" kommt
+BUSY_TIMEOUT_MS = int(os.environ.get('SQLITE_BUSY_TIMEOUT_MS', '5000'))
+# NORMAL ist im WAL-Modus sicher gegen Korruption, nur der letzte Commit kann
+# bei Stromausfall verloren gehen (steht dann noch in placetel_logs.jsonl)
+SYNCHRONOUS = os.environ.get('SQLITE_SYNCHRONOUS', 'NORMAL').upper()
+CACHE_SIZE_KB = int(os.environ.get('SQLITE_CACHE_SIZE_KB', '16384'))
+MMAP_SIZE = int(os.environ.get('SQLITE_MMAP_SIZE', str(256 * 1024 * 1024)))
+TEMP_STORE = os.environ.get('SQLITE_TEMP_STORE', 'MEMORY').upper()
+
+_SYNCHRONOUS_VALUES = ("OFF", "NORMAL", "FULL", "EXTRA")
+_TEMP_STORE_VALUES = ("DEFAULT", "FILE", "MEMORY")
+
+if SYNCHRONOUS not in _SYNCHRONOUS_VALUES:
+    raise ValueError(f"SQLITE_SYNCHRONOUS must be one of {', '.join(_SYNCHRONOUS_VALUES)}")
+if TEMP_STORE not in _TEMP_STORE_VALUES:
+    raise ValueError(f"SQLITE_TEMP_STORE must be one of {', '.join(_TEMP_STORE_VALUES)}")
+
+
+def apply_pragmas(db):
+    """Setzt das gemeinsame Pragma-Profil auf einer Verbindung."""
+    db.execute(f"PRAGMA busy_timeout = {BUSY_TIMEOUT_MS}")
+    db.execute(f"PRAGMA synchronous = {SYNCHRONOUS}")
+    db.execute(f"PRAGMA cache_size = {-CACHE_SIZE_KB}")  # negativ = KiB statt Seiten
+    db.execute(f"PRAGMA mmap_size = {MMAP_SIZE}")
+    db.execute(f"PRAGMA temp_store = {TEMP_STORE}")
+
+
+def connect(db_file=DB_FILE, **kwargs):
+    """Öffnet eine Verbindung mit Row-Factory und dem gemeinsamen Pragma-Profil."""
+    db = sqlite3.connect(db_file, timeout=BUSY_TIMEOUT_MS / 1000, **kwargs)
+    db.row_factory = sqlite3.Row  # Ermöglicht den Zugriff auf Spalten per Namen
+    apply_pragmas(db)
+    return db
+
+
+def init_storage(db_file=DB_FILE, log=print):
+    """
+    Schaltet die Datenbank in den WAL-Modus und meldet die aktiven Einstellungen.
+
+    Sollte von jedem Prozess einmal beim Start aufgerufen werden. Der
+    Journal-Modus ist persistent in der Datei gespeichert, die übrigen
+    Pragmas gelten pro Verbindung und werden von ``connect()`` gesetzt.
+
+    Returns:
+        dict mit den tatsächlich aktiven Werten
+    """
+    db = connect(db_file)
+    try:
+        journal_mode = db.execute("PRAGMA journal_mode = WAL").fetchone()[0]
+        settings = {
+            "journal_mode": journal_mode,
+            "busy_timeout": db.execute("PRAGMA busy_timeout").fetchone()[0],
+            "synchronous": _SYNCHRONOUS_VALUES[db.execute("PRAGMA synchronous").fetchone()[0]],
+            "cache_size": db.execute("PRAGMA cache_size").fetchone()[0],
+            "mmap_size": db.execute("PRAGMA mmap_size").fetchone()[0],
+            "temp_store": _TEMP_STORE_VALUES[db.execute("PRAGMA temp_store").fetchone()[0]],
+        }
+    finally:
+        db.close()
+
+    if journal_mode.lower() != "wal":
+        log(f"⚠️  WAL-Modus konnte nicht aktiviert werden (journal_mode={journal_mode})")
+
+    log("💾 SQLite: " + ", ".join(f"{key}={value}" for key, value in settings.items()))
+    return settings
+
+
+def ensure_column(db, table, column, definition):
+    """
+    Fügt einer bestehenden Tabelle eine Spalte hinzu, falls sie noch fehlt.
+
+    Returns:
+        True wenn die Spalte neu angelegt wurde (Aufrufer füllt Altdaten nach)
+    """
+    columns = {row[1] for row in db.execute(f"PRAGMA table_info({table})")}
+    if column in columns:
+        return False
+    db.execute(f"ALTER TABLE {table} ADD COLUMN {column} {definition}")
+    return True
+
+
+class PoolTimeout(Exception):
+    """Keine Verbindung innerhalb des Timeouts verfügbar."""
+
+
+class ConnectionPool:
+    """Begrenzter Pool von SQLite-Verbindungen, thread-übergreifend nutzbar."""
+
+    def __init__(self, db_file=DB_FILE, max_size=8, timeout=10.0, cached_statements=256,
+                 health_check_interval=30.0):
+        """
+        Args:
+            db_file: Pfad zur SQLite-Datenbank
+            max_size: Maximale Anzahl gleichzeitig offener Verbindungen
+            timeout: Sekunden, die auf eine freie Verbindung gewartet wird
+            cached_statements: Größe des Statement-Caches pro Verbindung
+            health_check_interval: Verbindungen, die länger als so viele
+                Sekunden ungenutzt waren, werden vor der Ausgabe geprüft
+        """
+        self.db_file = db_file
+        self.max_size = max_size
+        self.timeout = timeout
+        self.cached_statements = cached_statements
+        self.health_check_interval = health_check_interval
+
+        self._lock = threading.Condition()
+        self._idle = []  # LIFO: zuletzt genutzte Verbindung ist am "wärmsten"
+        self._open = 0
+        self._closed = False
+
+    def _connect(self):
+        """Öffnet eine neue Verbindung mit den Standard-Einstellungen."""
+        return connect(
+            self.db_file,
+            check_same_thread=False,  # Verbindung wandert zwischen Request-Threads
+            cached_statements=self.cached_statements,
+        )
+
+    @staticmethod
+    def _is_healthy(db):
+        """Prüft, ob eine Verbindung noch benutzbar ist."""
+        try:
+            db.execute("SELECT 1").fetchone()
+            return True
+        except sqlite3.Error:
+            return False
+
+    def acquire(self):
+        """Leiht eine Verbindung aus (blockiert bis max. ``timeout`` Sekunden)."""
+        deadline = time.monotonic() + self.timeout
+
+        with self._lock:
+            while True:
+                if self._closed:
+                    raise PoolTimeout("Connection-Pool ist bereits geschlossen")
+
+                if self._idle:
+                    db, last_used = self._idle.pop()
+                    break
+
+                if self._open < self.max_size:
+                    self._open += 1
+                    db, last_used = None, None
+                    break
+
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    raise PoolTimeout(
+                        f"Keine freie DB-Verbindung nach {self.timeout}s "
+                        f"(max_size={self.max_size})"
+                    )
+                self._lock.wait(remaining)
+
+        # Verbinden / prüfen außerhalb des Locks
+        try:
+            if db is None:
+                return self._connect()
+
+            if time.monotonic() - last_used > self.health_check_interval and not self._is_healthy(db):
+                try:
+                    db.close()
+                except sqlite3.Error:
+                    pass
+                return self._connect()
+
+            return db
+
+        except Exception:
+            with self._lock:
+                self._open -= 1
+                self._lock.notify()
+            raise
+
+    def release(self, db):
+        """Gibt eine Verbindung an den Pool zurück."""
+        # Offene Transaktionen nie an den nächsten Benutzer weitergeben
+        try:
+            if db.in_transaction:
+                db.rollback()
+        except sqlite3.Error:
+            self._discard(db)
+            return
+
+        with self._lock:
+            if self._closed:
+                self._open -= 1
+                db.close()
+            else:
+                self._idle.append((db, time.monotonic()))
+            self._lock.notify()
+
+    def _discard(self, db):
+        """Verwirft eine defekte Verbindung."""
+        try:
+            db.close()
+        except sqlite3.Error:
+            pass
+        with self._lock:
+            self._open -= 1
+            self._lock.notify()
+
+    @contextmanager
+    def connection(self):
+        """Context-Manager: Verbindung ausleihen und automatisch zurückgeben."""
+        db = self.acquire()
+        try:
+            yield db
+        finally:
+            self.release(db)
+
+    def close(self):
+        """Schließt alle freien Verbindungen; ausgeliehene werden bei Rückgabe geschlossen."""
+        with self._lock:
+            self._closed = True
+            idle, self._idle = self._idle, []
+            self._open -= len(idle)
+            self._lock.notify_all()
+
+        for db, _ in idle:
+            try:
+                db.close()
+            except sqlite3.Error:
+                pass
+
+    def reset(self, close=True):
+        """
+        Verwirft alle Verbindungen; der Pool bleibt danach benutzbar.
+
+        Vor einem ``fork()`` (z.B. im gunicorn-Master nach ``init_db``) mit
+        ``close=True`` aufrufen. Im Kindprozess ``close=False``: geerbte
+        Verbindungen dürfen dort weder benutzt noch geschlossen werden -
+        ein ``close`` könnte den WAL des Elternprozesses checkpointen.
+        """
+        idle = self._idle if close else []
+        self._lock = threading.Condition()
+        self._idle = []
+        self._open = 0
+        self._closed = False
+
+        for db, _ in idle:
+            try:
+                db.close()
+            except sqlite3.Error:
+                pass
+
+    def stats(self):
+        """Aktueller Zustand des Pools (für Diagnose)."""
+        with self._lock:
+            return {"open": self._open, "idle": len(self._idle), "max_size": self.max_size}
@@ -1,28 +1,89 @@
-from flask import Flask, request, jsonify, render_template_string, Response
+from flask import Flask, request, jsonify, render_template, make_response, Response, url_for
+import functools
+import hashlib
 import json
 import time
-import pathlib
 import sqlite3
-from datetime import datetime
+from datetime import date, datetime
 import os
+import sys
+import argparse
+from concurrent.futures import ProcessPoolExecutor
+from itertools import repeat
+import atexit
+import threading
 from flask_httpauth import HTTPBasicAuth
+from storage import ConnectionPool, DATA_DIR, DB_FILE, ensure_column, init_storage
+from storage import SYNCHRONOUS as SQLITE_SYNCHRONOUS
+from ringmatch import RingIndex
+from ringservice import RingServiceUnavailable, claim_nearest_ring
+from ringservice import SOCKET_PATH as RING_SOCKET
+from phone_normalize import to_e164, same_subscriber
+from call_records import prepare_call, complete_length, iter_log_range, parse_log_range, split_log_ranges
+from call_search import FTS5_AVAILABLE, create_search_index, create_search_triggers, drop_search_triggers
+from call_search import rebuild_search_index, search_calls
+from call_counters import create_counters, create_counter_triggers, drop_counter_triggers
+from call_counters import read_stats, read_version, recompute_counters
+from ingest import IngestWriter, PeriodicWorker
+from appendlog import AppendLog
+from log_setup import setup_logging
+from log_setup import restart_after_fork as restart_logging_after_fork
 
 app = Flask(__name__)
 app.config["JSON_AS_ASCII"] = False
 
 # --- Konfiguration ---
 PORT = 54351
+# Werkzeug-Debugger und Reloader nur in der Entwicklung (python3 webhook_server_*.py)
+DEBUG = os.environ.get('FLASK_ENV', 'production').lower() == 'development'
 
 # Security: Secrets must be provided via environment variables
 SECRET = os.environ.get('PLACETEL_SECRET')
 if not SECRET:
     raise ValueError("PLACETEL_SECRET environment variable is required. Please set it before starting the server.")
 
-LOG_FILE = pathlib.Path(__file__).with_name("placetel_logs.jsonl")
-DB_FILE = pathlib.Path(__file__).with_name("database.db")
-
-# Praxisnummer - wird gefiltert bei Rufnummernweiterleitungen
-PRAXIS_NUMBER = "200893"
+LOG_FILE = DATA_DIR / "placetel_logs.jsonl"
+
+# Server-Log (rotiert, geschrieben von einem Listener-Thread - nie im Request)
+logger = setup_logging("webhook_server", DATA_DIR / "webhook_server.log")
+
+# Haltbarkeit der Roh-Logdatei: none | interval | batch (fsync nach jedem Schreib-Batch)
+LOG_FSYNC = os.environ.get('LOG_FSYNC', 'none').lower()
+LOG_FSYNC_INTERVAL = float(os.environ.get('LOG_FSYNC_INTERVAL', '1.0'))
+
+# Maximale Anzahl gleichzeitig offener DB-Verbindungen im Pool
+DB_POOL_SIZE = int(os.environ.get('DB_POOL_SIZE', '8'))
+
+# Praxisnummer mit Vorwahl ("Vorwahl/Rufnummer") - wird gefiltert bei Rufnummernweiterleitungen
+PRAXIS_NUMBER = "03836/200893"
+
+# Ingest-Modus für /placetel:
+#   sync  - Anruf wird im Request verarbeitet und in die DB geschrieben (Standard)
+#   async - Request schreibt nur ins JSONL-Log und antwortet sofort,
+#           ein Writer-Thread schreibt die Anrufe gebündelt in die DB
+INGEST_MODE = os.environ.get('INGEST_MODE', 'sync').lower()
+if INGEST_MODE not in ('sync', 'async'):
+    raise ValueError("INGEST_MODE must be 'sync' or 'async'.")
+INGEST_QUEUE_SIZE = int(os.environ.get('INGEST_QUEUE_SIZE', '1000'))
+INGEST_BATCH_SIZE = int(os.environ.get('INGEST_BATCH_SIZE', '100'))
+INGEST_BATCH_DELAY_MS = int(os.environ.get('INGEST_BATCH_DELAY_MS', '50'))
+
+# Log-Import: Zeilen pro Transaktion, Follower-Intervall in Sekunden (0 = aus)
+IMPORT_BATCH_LINES = int(os.environ.get('IMPORT_BATCH_LINES', '1000'))
+IMPORT_FOLLOW_INTERVAL = float(os.environ.get('IMPORT_FOLLOW_INTERVAL', '0'))
+# Bulk-Import (--bulk-import / --rebuild): Zeilen pro executemany
+BULK_IMPORT_CHUNK = int(os.environ.get('BULK_IMPORT_CHUNK', '10000'))
+BULK_IMPORT_WORKERS = int(os.environ.get('BULK_IMPORT_WORKERS', '1'))
+
+# Anrufliste (/api/calls und Dashboard): Einträge pro Seite und Obergrenze für ?limit=
+API_PAGE_SIZE = int(os.environ.get('API_PAGE_SIZE', '50'))
+API_MAX_PAGE_SIZE = int(os.environ.get('API_MAX_PAGE_SIZE', '500'))
+
+# Browser-Cache für CSS/JS des Dashboards (Sekunden); die URLs enthalten einen Inhalts-Hash
+STATIC_MAX_AGE = int(os.environ.get('STATIC_MAX_AGE', str(365 * 24 * 3600)))
+# Bootstrap Icons: lokal unter static/vendor (./fetch_icons.sh), sonst vom CDN
+BOOTSTRAP_ICONS_CSS = "vendor/bootstrap-icons/bootstrap-icons.css"
+BOOTSTRAP_ICONS_CDN = "https://cdn.jsdelivr.net/npm/bootstrap-icons@1.11.1/font/bootstrap-icons.css"
 
 # --- Dashboard Authentifizierung ---
 auth = HTTPBasicAuth()
@@ -43,828 +104,129 @@ def verify_password(username, password):
 def auth_error(status):
     return Response("Zugriff verweigert. Bitte melden Sie sich an.", 401, {'WWW-Authenticate': 'Basic realm="Login Required"'})
 
-# --- HTML-Vorlage ---
-DASHBOARD_TEMPLATE = """
-<!DOCTYPE html>
-<html lang="de">
-<head>
-    <meta charset="UTF-8">
-    <title>Anruf-Dashboard</title>
-    <meta name="viewport" content="width=device-width, initial-scale=1.0">
-    <link rel="stylesheet" href="https://cdn.jsdelivr.net/npm/bootstrap-icons@1.11.1/font/bootstrap-icons.css">
-    <style>
-        :root {
-            --primary-gradient: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
-            --success-gradient: linear-gradient(135deg, #11998e 0%, #38ef7d 100%);
-            --info-gradient: linear-gradient(135deg, #4facfe 0%, #00f2fe 100%);
-            --warning-gradient: linear-gradient(135deg, #fa709a 0%, #fee140 100%);
-            --danger-gradient: linear-gradient(135deg, #f093fb 0%, #f5576c 100%);
-
-            --primary-color: #667eea;
-            --primary-light: #f0f3ff;
-            --success-color: #38ef7d;
-            --success-bg: #d4ffe9;
-            --success-text: #0d6832;
-            --info-color: #00f2fe;
-            --warning-color: #feca57;
-            --danger-color: #f5576c;
-            --danger-light: #ffe6ea;
-
-            --light-grey: #f7f9fc;
-            --medium-grey: #e1e8ed;
-            --dark-grey: #2c3e50;
-            --text-color: #2c3e50;
-            --white: #fff;
-
-            --shadow-sm: 0 2px 8px rgba(0, 0, 0, 0.08);
-            --shadow-md: 0 4px 20px rgba(0, 0, 0, 0.12);
-            --shadow-lg: 0 8px 30px rgba(0, 0, 0, 0.15);
-        }
-
-        * {
-            box-sizing: border-box;
-        }
-
-        body {
-            font-family: -apple-system, BlinkMacSystemFont, "Segoe UI", Roboto, Helvetica, Arial, sans-serif;
-            margin: 0;
-            padding: 0;
-            background: linear-gradient(135deg, #667eea 0%, #764ba2 50%, #f093fb 100%);
-            background-attachment: fixed;
-            color: var(--text-color);
-            line-height: 1.6;
-            min-height: 100vh;
-        }
-
-        .navbar {
-            background: rgba(255, 255, 255, 0.95);
-            backdrop-filter: blur(10px);
-            padding: 1.2rem 2rem;
-            box-shadow: var(--shadow-md);
-            position: sticky;
-            top: 0;
-            z-index: 1000;
-            border-bottom: 3px solid transparent;
-            border-image: var(--primary-gradient) 1;
-        }
-
-        .navbar-content {
-            max-width: 1400px;
-            margin: 0 auto;
-            display: flex;
-            align-items: center;
-            justify-content: space-between;
-        }
-
-        .navbar-title {
-            display: flex;
-            align-items: center;
-            gap: 1rem;
-        }
-
-        .navbar-icon {
-            width: 48px;
-            height: 48px;
-            background: var(--primary-gradient);
-            border-radius: 12px;
-            display: flex;
-            align-items: center;
-            justify-content: center;
-            color: white;
-            font-size: 24px;
-            box-shadow: var(--shadow-sm);
-            animation: pulse 2s ease-in-out infinite;
-        }
-
-        @keyframes pulse {
-            0%, 100% { transform: scale(1); }
-            50% { transform: scale(1.05); }
-        }
-
-        .navbar h1 {
-            margin: 0;
-            font-size: 1.8rem;
-            background: var(--primary-gradient);
-            -webkit-background-clip: text;
-            -webkit-text-fill-color: transparent;
-            background-clip: text;
-            font-weight: 700;
-        }
-
-        .navbar-time {
-            color: var(--dark-grey);
-            font-size: 0.9rem;
-            display: flex;
-            align-items: center;
-            gap: 0.5rem;
-        }
-
-        .container {
-            max-width: 1400px;
-            margin: 2rem auto;
-            padding: 0 2rem 2rem;
-        }
-
-        .stats-grid {
-            display: grid;
-            grid-template-columns: repeat(auto-fit, minmax(250px, 1fr));
-            gap: 1.5rem;
-            margin-bottom: 2rem;
-        }
-
-        .stat-card {
-            background: var(--white);
-            border-radius: 16px;
-            padding: 1.5rem;
-            box-shadow: var(--shadow-md);
-            position: relative;
-            overflow: hidden;
-            transition: transform 0.3s ease, box-shadow 0.3s ease;
-        }
-
-        .stat-card:hover {
-            transform: translateY(-5px);
-            box-shadow: var(--shadow-lg);
-        }
-
-        .stat-card::before {
-            content: '';
-            position: absolute;
-            top: 0;
-            left: 0;
-            right: 0;
-            height: 4px;
-            background: var(--card-gradient);
-        }
-
-        .stat-card.total::before {
-            background: var(--info-gradient);
-        }
-
-        .stat-card.new::before {
-            background: var(--warning-gradient);
-        }
-
-        .stat-card.done::before {
-            background: var(--success-gradient);
-        }
-
-        .stat-card.today::before {
-            background: var(--primary-gradient);
-        }
-
-        .stat-header {
-            display: flex;
-            justify-content: space-between;
-            align-items: flex-start;
-            margin-bottom: 0.5rem;
-        }
-
-        .stat-icon {
-            width: 50px;
-            height: 50px;
-            border-radius: 12px;
-            display: flex;
-            align-items: center;
-            justify-content: center;
-            font-size: 24px;
-            color: white;
-        }
-
-        .stat-card.total .stat-icon {
-            background: var(--info-gradient);
-        }
-
-        .stat-card.new .stat-icon {
-            background: var(--warning-gradient);
-        }
-
-        .stat-card.done .stat-icon {
-            background: var(--success-gradient);
-        }
-
-        .stat-card.today .stat-icon {
-            background: var(--primary-gradient);
-        }
-
-        .stat-content h3 {
-            margin: 0 0 0.25rem;
-            font-size: 0.85rem;
-            color: #6c757d;
-            text-transform: uppercase;
-            letter-spacing: 0.5px;
-            font-weight: 600;
-        }
-
-        .stat-content .stat-number {
-            font-size: 2.5rem;
-            font-weight: 700;
-            margin: 0;
-            background: var(--primary-gradient);
-            -webkit-background-clip: text;
-            -webkit-text-fill-color: transparent;
-            background-clip: text;
-        }
-
-        .main-content {
-            background: var(--white);
-            border-radius: 20px;
-            padding: 2rem;
-            box-shadow: var(--shadow-lg);
-        }
-
-        .search-container {
-            margin-bottom: 2rem;
-            position: relative;
-        }
-
-        .search-icon {
-            position: absolute;
-            left: 1rem;
-            top: 50%;
-            transform: translateY(-50%);
-            color: #6c757d;
-            font-size: 1.2rem;
-            pointer-events: none;
-        }
-
-        #search-box {
-            width: 100%;
-            padding: 1rem 1rem 1rem 3rem;
-            font-size: 1rem;
-            border-radius: 12px;
-            border: 2px solid var(--medium-grey);
-            background: var(--white);
-            transition: all 0.3s ease;
-        }
-
-        #search-box:focus {
-            outline: none;
-            border-color: var(--primary-color);
-            box-shadow: 0 0 0 4px rgba(102, 126, 234, 0.1);
-        }
-
-        .table-container {
-            overflow-x: auto;
-            border-radius: 12px;
-            box-shadow: var(--shadow-sm);
-        }
-
-        table {
-            width: 100%;
-            border-collapse: separate;
-            border-spacing: 0;
-        }
-
-        th, td {
-            padding: 1rem 1.25rem;
-            text-align: left;
-            border-bottom: 1px solid var(--medium-grey);
-        }
-
-        thead th {
-            background: var(--primary-gradient);
-            color: var(--white);
-            font-weight: 600;
-            font-size: 0.9rem;
-            text-transform: uppercase;
-            letter-spacing: 0.5px;
-            position: sticky;
-            top: 0;
-            z-index: 10;
-        }
-
-        thead th:first-child {
-            border-top-left-radius: 12px;
-        }
-
-        thead th:last-child {
-            border-top-right-radius: 12px;
-        }
-
-        thead th i {
-            margin-right: 0.5rem;
-        }
-
-        tbody tr {
-            background: var(--white);
-            transition: all 0.3s ease;
-        }
-
-        tbody tr:hover {
-            background: var(--primary-light);
-            transform: scale(1.01);
-            box-shadow: var(--shadow-sm);
-        }
-
-        tbody tr:last-child td:first-child {
-            border-bottom-left-radius: 12px;
-        }
-
-        tbody tr:last-child td:last-child {
-            border-bottom-right-radius: 12px;
-        }
-
-        tr[data-status="new"] {
-            border-left: 4px solid #feca57;
-        }
-
-        tr[data-status="done"] {
-            background: var(--success-bg) !important;
-            border-left: 4px solid var(--success-color);
-            opacity: 0.7;
-        }
-
-        tr[data-status="done"] td {
-            color: var(--success-text);
-        }
-
-        .status-checkbox {
-            cursor: pointer;
-            width: 22px;
-            height: 22px;
-            accent-color: var(--success-color);
-            transition: transform 0.2s ease;
-        }
-
-        .status-checkbox:hover {
-            transform: scale(1.2);
-        }
-
-        .phone-badge {
-            display: inline-flex;
-            align-items: center;
-            gap: 0.4rem;
-            padding: 0.4rem 0.8rem;
-            background: var(--info-gradient);
-            color: white;
-            border-radius: 8px;
-            font-size: 0.9rem;
-            font-weight: 500;
-        }
-
-        .reason-badge {
-            display: inline-flex;
-            align-items: center;
-            gap: 0.4rem;
-            padding: 0.4rem 0.8rem;
-            background: linear-gradient(135deg, #fbc2eb 0%, #a6c1ee 100%);
-            color: var(--dark-grey);
-            border-radius: 8px;
-            font-size: 0.9rem;
-            font-weight: 500;
-        }
-
-        .category-badge {
-            display: inline-flex;
-            align-items: center;
-            gap: 0.4rem;
-            padding: 0.4rem 0.8rem;
-            background: linear-gradient(135deg, #f093fb 0%, #f5576c 100%);
-            color: white;
-            border-radius: 8px;
-            font-size: 0.85rem;
-            font-weight: 500;
-            box-shadow: 0 2px 4px rgba(240, 147, 251, 0.2);
-        }
-
-        .name-cell {
-            display: flex;
-            align-items: center;
-            gap: 0.5rem;
-        }
-
-        .name-icon {
-            width: 36px;
-            height: 36px;
-            border-radius: 50%;
-            background: var(--primary-gradient);
-            color: white;
-            display: flex;
-            align-items: center;
-            justify-content: center;
-            font-weight: 600;
-            font-size: 0.9rem;
-        }
-
-        .delete-btn {
-            background: var(--danger-gradient);
-            border: none;
-            cursor: pointer;
-            padding: 0.5rem 1rem;
-            border-radius: 8px;
-            display: inline-flex;
-            align-items: center;
-            justify-content: center;
-            color: white;
-            transition: all 0.3s ease;
-            box-shadow: var(--shadow-sm);
-        }
-
-        .delete-btn:hover {
-            transform: translateY(-2px);
-            box-shadow: var(--shadow-md);
-        }
-
-        .delete-btn i {
-            font-size: 1rem;
-        }
-
-        .no-results {
-            text-align: center;
-            padding: 3rem;
-            color: #6c757d;
-        }
-
-        .no-results i {
-            font-size: 3rem;
-            margin-bottom: 1rem;
-            display: block;
-            opacity: 0.5;
-        }
-
-        .time-badge {
-            display: inline-flex;
-            align-items: center;
-            gap: 0.4rem;
-            padding: 0.4rem 0.8rem;
-            background: linear-gradient(135deg, #ffecd2 0%, #fcb69f 100%);
-            border-radius: 8px;
-            font-size: 0.9rem;
-            font-weight: 500;
-            color: var(--dark-grey);
-        }
-
-        @media (max-width: 768px) {
-            .navbar {
-                padding: 1rem;
-            }
-
-            .navbar-content {
-                flex-direction: column;
-                gap: 1rem;
-            }
-
-            .container {
-                padding: 0 1rem 1rem;
-            }
-
-            .stats-grid {
-                grid-template-columns: 1fr;
-            }
-
-            .main-content {
-                padding: 1rem;
-            }
-
-            table {
-                font-size: 0.9rem;
-            }
-
-            th, td {
-                padding: 0.75rem;
-            }
-        }
-
-        @keyframes slideIn {
-            from {
-                opacity: 0;
-                transform: translateY(20px);
-            }
-            to {
-                opacity: 1;
-                transform: translateY(0);
-            }
-        }
-
-        .stat-card, tbody tr {
-            animation: slideIn 0.5s ease-out;
-        }
-    </style>
-</head>
-<body>
-    <nav class="navbar">
-        <div class="navbar-content">
-            <div class="navbar-title">
-                <div class="navbar-icon">
-                    <i class="bi bi-telephone-fill"></i>
-                </div>
-                <h1>Anruf-Dashboard</h1>
-            </div>
-            <div class="navbar-time">
-                <i class="bi bi-clock-fill"></i>
-                <span id="current-time"></span>
-            </div>
-        </div>
-    </nav>
-
-    <div class="container">
-        <div class="stats-grid">
-            <div class="stat-card total">
-                <div class="stat-header">
-                    <div class="stat-content">
-                        <h3>Gesamt Anrufe</h3>
-                        <p class="stat-number" id="total-calls">{{ calls|length }}</p>
-                    </div>
-                    <div class="stat-icon">
-                        <i class="bi bi-telephone-inbound"></i>
-                    </div>
-                </div>
-            </div>
-
-            <div class="stat-card new">
-                <div class="stat-header">
-                    <div class="stat-content">
-                        <h3>Offen</h3>
-                        <p class="stat-number" id="new-calls">{{ calls|selectattr('status', 'equalto', 'new')|list|length }}</p>
-                    </div>
-                    <div class="stat-icon">
-                        <i class="bi bi-exclamation-circle-fill"></i>
-                    </div>
-                </div>
-            </div>
-
-            <div class="stat-card done">
-                <div class="stat-header">
-                    <div class="stat-content">
-                        <h3>Erledigt</h3>
-                        <p class="stat-number" id="done-calls">{{ calls|selectattr('status', 'equalto', 'done')|list|length }}</p>
-                    </div>
-                    <div class="stat-icon">
-                        <i class="bi bi-check-circle-fill"></i>
-                    </div>
-                </div>
-            </div>
-
-            <div class="stat-card today">
-                <div class="stat-header">
-                    <div class="stat-content">
-                        <h3>Heute</h3>
-                        <p class="stat-number" id="today-calls">0</p>
-                    </div>
-                    <div class="stat-icon">
-                        <i class="bi bi-calendar-check-fill"></i>
-                    </div>
-                </div>
-            </div>
-        </div>
-
-        <div class="main-content">
-            <div class="search-container">
-                <i class="bi bi-search search-icon"></i>
-                <input type="search" id="search-box" placeholder="Nach Name, Telefonnummer oder Anliegen suchen...">
-            </div>
-
-            <div class="table-container">
-                <table>
-                    <thead>
-                        <tr>
-                            <th><i class="bi bi-check2-square"></i>Erledigt</th>
-                            <th><i class="bi bi-clock-history"></i>Zeitpunkt</th>
-                            <th><i class="bi bi-person-fill"></i>Name</th>
-                            <th><i class="bi bi-calendar3"></i>Geburtsdatum</th>
-                            <th><i class="bi bi-telephone-fill"></i>Telefonnummer</th>
-                            <th><i class="bi bi-chat-left-text-fill"></i>Anliegen</th>
-                            <th><i class="bi bi-tags-fill"></i>Kategorie</th>
-                            <th><i class="bi bi-trash3"></i>Löschen</th>
-                        </tr>
-                    </thead>
-                    <tbody>
-                        {% for call in calls %}
-                        <tr data-id="{{ call.id }}" data-status="{{ call.status }}" data-timestamp="{{ call.timestamp }}">
-                            <td><input type="checkbox" class="status-checkbox" {% if call.status == 'done' %}checked{% endif %}></td>
-                            <td><span class="time-badge"><i class="bi bi-clock"></i>{{ call.timestamp | format_ts }}</span></td>
-                            <td>
-                                <div class="name-cell">
-                                    <div class="name-icon">{{ call.caller_name[:1] if call.caller_name else '?' }}</div>
-                                    <strong>{{ call.caller_name }}</strong>
-                                </div>
-                            </td>
-                            <td>{{ call.caller_dob }}</td>
-                            <td><span class="phone-badge"><i class="bi bi-phone"></i>{{ call.phone }}</span></td>
-                            <td><span class="reason-badge"><i class="bi bi-chat-dots"></i>{{ call.call_reason }}</span></td>
-                            <td>
-                                {% if call.category %}
-                                <span class="category-badge"><i class="bi bi-tags"></i>{{ call.category }}</span>
-                                {% else %}
-                                <span style="color: #999;">-</span>
-                                {% endif %}
-                            </td>
-                            <td>
-                                <button class="delete-btn">
-                                    <i class="bi bi-trash3-fill"></i>
-                                </button>
-                            </td>
-                        </tr>
-                        {% else %}
-                        <tr>
-                            <td colspan="8" class="no-results">
-                                <i class="bi bi-inbox"></i>
-                                <p>Noch keine Anrufe in der Datenbank.</p>
-                            </td>
-                        </tr>
-                        {% endfor %}
-                    </tbody>
-                </table>
-            </div>
-        </div>
-    </div>
-
-    <script>
-        // --- Live Clock ---
-        function updateClock() {
-            const now = new Date();
-            const timeString = now.toLocaleTimeString('de-DE', {
-                hour: '2-digit',
-                minute: '2-digit',
-                second: '2-digit'
-            });
-            const dateString = now.toLocaleDateString('de-DE', {
-                weekday: 'short',
-                day: '2-digit',
-                month: '2-digit',
-                year: 'numeric'
-            });
-            document.getElementById('current-time').textContent = `${dateString} - ${timeString}`;
-        }
-        updateClock();
-        setInterval(updateClock, 1000);
-
-        // --- Count Today's Calls ---
-        function countTodayCalls() {
-            const today = new Date();
-            today.setHours(0, 0, 0, 0);
-            const todayTimestamp = today.getTime() / 1000;
-
-            const rows = document.querySelectorAll('tbody tr[data-timestamp]');
-            let count = 0;
-            rows.forEach(row => {
-                const timestamp = parseInt(row.dataset.timestamp);
-                if (timestamp >= todayTimestamp) {
-                    count++;
-                }
-            });
-
-            document.getElementById('today-calls').textContent = count;
-        }
-        countTodayCalls();
-
-        // --- Suchfunktion ---
-        const searchBox = document.getElementById('search-box');
-        const tableBody = document.querySelector('table tbody');
-        const rows = tableBody.getElementsByTagName('tr');
-
-        searchBox.addEventListener('keyup', function() {
-            const filter = searchBox.value.toLowerCase();
-            for (let i = 0; i < rows.length; i++) {
-                const cells = rows[i].getElementsByTagName('td');
-                if (cells.length > 1) {
-                    let found = false;
-                    for (let j = 1; j < cells.length; j++) {
-                        if (cells[j].textContent.toLowerCase().indexOf(filter) > -1) {
-                            found = true;
-                            break;
-                        }
-                    }
-                    rows[i].style.display = found ? "" : "none";
-                }
-            }
-        });
-
-        // --- Event Delegation für dynamische Inhalte ---
-        tableBody.addEventListener('click', function(event) {
-            // --- "Erledigt"-Funktion ---
-            if (event.target.classList.contains('status-checkbox')) {
-                const checkbox = event.target;
-                const callId = checkbox.closest('tr').dataset.id;
-                const isDone = checkbox.checked;
-
-                fetch(`/call/${callId}/status`, {
-                    method: 'POST',
-                    headers: { 'Content-Type': 'application/json' },
-                    body: JSON.stringify({ status: isDone ? 'done' : 'new' })
-                })
-                .then(response => response.json())
-                .then(data => {
-                    if (data.status === 'ok') {
-                        const row = checkbox.closest('tr');
-                        row.dataset.status = isDone ? 'done' : 'new';
-                        // Update statistics
-                        const newCount = document.querySelectorAll('tr[data-status="new"]').length;
-                        const doneCount = document.querySelectorAll('tr[data-status="done"]').length;
-                        document.getElementById('new-calls').textContent = newCount;
-                        document.getElementById('done-calls').textContent = doneCount;
-                    } else {
-                        alert("Fehler beim Speichern des Status.");
-                        checkbox.checked = !isDone;
-                    }
-                })
-                .catch(error => {
-                    console.error('Error:', error);
-                    alert("Netzwerkfehler beim Speichern des Status.");
-                    checkbox.checked = !isDone;
-                });
-            }
-
-            // --- "Löschen"-Funktion ---
-            if (event.target.closest('.delete-btn')) {
-                const deleteBtn = event.target.closest('.delete-btn');
-                const row = deleteBtn.closest('tr');
-                const callId = row.dataset.id;
-                const nameCell = row.querySelector('.name-cell strong');
-                const callName = nameCell ? nameCell.textContent : 'diesen Anruf';
-
-                if (confirm(`Sind Sie sicher, dass Sie den Anruf von "${callName}" endgültig löschen möchten?`)) {
-                    fetch(`/call/${callId}/delete`, {
-                        method: 'POST',
-                    })
-                    .then(response => response.json())
-                    .then(data => {
-                        if (data.status === 'ok') {
-                            row.style.transition = 'opacity 0.5s ease';
-                            row.style.opacity = '0';
-                            setTimeout(() => {
-                                row.remove();
-                                // Update statistics
-                                const totalCount = document.querySelectorAll('tbody tr[data-id]').length;
-                                const newCount = document.querySelectorAll('tr[data-status="new"]').length;
-                                const doneCount = document.querySelectorAll('tr[data-status="done"]').length;
-                                document.getElementById('total-calls').textContent = totalCount;
-                                document.getElementById('new-calls').textContent = newCount;
-                                document.getElementById('done-calls').textContent = doneCount;
-                                countTodayCalls();
-                            }, 500);
-                        } else {
-                            alert("Fehler beim Löschen des Anrufs.");
-                        }
-                    })
-                    .catch(error => {
-                        console.error('Error:', error);
-                        alert("Netzwerkfehler beim Löschen des Anrufs.");
-                    });
-                }
-            }
-        });
-
-        // --- Auto-Reload ---
-        setTimeout(() => { window.location.reload(); }, 30000);
-    </script>
-</body>
-</html>
-"""
+# --- Statische Dateien (templates/dashboard.html, static/) ---
+_asset_versions = {}
 
-# --- Datenbankfunktionen ---
-def get_db():
-    """Stellt eine Verbindung zur DB her und gibt ein Connection-Objekt zurück."""
-    db = sqlite3.connect(DB_FILE)
-    db.row_factory = sqlite3.Row  # Ermöglicht den Zugriff auf Spalten per Namen
-    return db
+def asset_version(filename):
+    """Kurzer Inhalts-Hash einer Datei unter static/ (None wenn sie fehlt)."""
+    if filename in _asset_versions and not DEBUG:
+        return _asset_versions[filename]
+    try:
+        with open(os.path.join(app.static_folder, filename), "rb") as f:
+            version = hashlib.sha256(f.read()).hexdigest()[:12]
+    except OSError:
+        version = None
+    _asset_versions[filename] = version
+    return version
+
+@app.template_global()
+def static_url(filename):
+    """URL mit Inhalts-Hash (``/static/dashboard.js?v=…``) - ändert sich mit jeder neuen Version."""
+    return url_for("static", filename=filename, v=asset_version(filename))
+
+@app.template_global()
+def bootstrap_icons_url():
+    if asset_version(BOOTSTRAP_ICONS_CSS) is None:
+        return BOOTSTRAP_ICONS_CDN
+    return static_url(BOOTSTRAP_ICONS_CSS)
+
+@app.after_request
+def cache_static_assets(response):
+    """Dateien mit passendem Hash in der URL darf der Browser dauerhaft cachen."""
+    if request.endpoint == "static" and response.status_code == 200:
+        version = request.args.get("v")
+        if version and version == asset_version(request.view_args["filename"]):
+            response.cache_control.no_cache = None
+            response.cache_control.public = True
+            response.cache_control.max_age = STATIC_MAX_AGE
+            response.cache_control.immutable = True
+    return response
+
+def release_version():
+    """
+    Hash über Dashboard-Template und Assets - gleich in allen Workern, neu nach jedem Deployment.
 
-def extract_phone_from_content(content):
+    Geht in die ETags ein, damit Browser nach einem Update nicht die alte Seite behalten.
     """
-    Extrahiert die Rückrufnummer aus dem content-Text des Webhooks.
+    if "release" in _asset_versions and not DEBUG:
+        return _asset_versions["release"]
+    with open(os.path.join(app.root_path, app.template_folder, "dashboard.html"), "rb") as f:
+        digest = hashlib.sha256(f.read())
+    for filename in ("dashboard.css", "dashboard.js", BOOTSTRAP_ICONS_CSS):
+        digest.update(str(asset_version(filename)).encode())
+    _asset_versions["release"] = digest.hexdigest()[:12]
+    return _asset_versions["release"]
+
+def warm_templates():
+    """Kompiliert das Dashboard-Template und hasht die Assets vorab (im gunicorn-Master vor fork())."""
+    app.jinja_env.get_template("dashboard.html")
+    for filename in ("dashboard.css", "dashboard.js", BOOTSTRAP_ICONS_CSS):
+        asset_version(filename)
+    release_version()
 
-    Die echte Telefonnummer steht oft im content als:
-    - "Rückrufnummer: +49xxx..."
-    - "R\u00fcckrufnummer: +49xxx..."
-    - "Telefonnummer: 0xxx..."
 
-    Das ist die ZUVERLÄSSIGSTE Methode, da die Nummer direkt vom
-    digitalen Assistenten erfasst wurde!
+# --- Datenbankfunktionen ---
+# Roh-Log bleibt offen, gleichzeitige Webhooks werden in einem write() gebündelt
+audit_log = AppendLog(LOG_FILE, fsync=LOG_FSYNC, fsync_interval=LOG_FSYNC_INTERVAL)
+atexit.register(audit_log.close)
 
-    Args:
-        content: Der content-String aus dem Webhook
+# Verhindert parallele Importe im selben Prozess (Follower + /import-logs)
+_import_lock = threading.Lock()
 
-    Returns:
-        Telefonnummer als String oder None
+# Ein Pool langlebiger Verbindungen für alle Routen, Import und FritzBox-Lookup
+db_pool = ConnectionPool(DB_FILE, max_size=DB_POOL_SIZE)
+atexit.register(db_pool.close)
+
+def get_db():
     """
-    if not content:
-        return None
+    Leiht eine Verbindung aus dem Connection-Pool aus.
+
+    Verwendung als Context-Manager - die Verbindung wird danach automatisch
+    zurückgegeben (offene Transaktionen werden zurückgerollt):
 
-    import re
+        with get_db() as db:
+            db.execute(...)
+    """
+    return db_pool.connection()
+
+# Nächster ungematchter RING vor bzw. nach dem Webhook - je eine Index-Suche
+# auf idx_unmatched_timestamp (partieller Index über matched = 0), kein Sortieren
+_NEAREST_BEFORE_SQL = """
+SELECT id, caller_number, timestamp
+FROM phone_lookup
+WHERE matched = 0 AND timestamp >= ? AND timestamp <= ?
+ORDER BY timestamp DESC
+LIMIT 1
+"""
+_NEAREST_AFTER_SQL = """
+SELECT id, caller_number, timestamp
+FROM phone_lookup
+WHERE matched = 0 AND timestamp > ?
+ORDER BY timestamp ASC
+LIMIT 1
+"""
 
-    # Pattern für verschiedene Schreibweisen
-    patterns = [
-        r'[Rr]ückrufnummer:\s*(\+?\d[\d\s\-\(\)]+)',
-        r'[Tt]elefonnummer:\s*(\+?\d[\d\s\-\(\)]+)',
-        r'[Rr]ückruf:\s*(\+?\d[\d\s\-\(\)]+)',
-    ]
+# Maximale Versuche, wenn ein gefundener Eintrag inzwischen gematcht wurde
+MATCH_MAX_ATTEMPTS = 3
 
-    for pattern in patterns:
-        match = re.search(pattern, content)
-        if match:
-            # Telefonnummer gefunden - bereinigen (nur Ziffern und +)
-            phone = match.group(1)
-            phone = re.sub(r'[\s\-\(\)]', '', phone)  # Leerzeichen, -, ( ) entfernen
+# Zähler für die FritzBox-Zuordnung (seit Prozessstart)
+match_stats = {"lookups": 0, "matched": 0, "retries": 0, "exhausted": 0,
+               "socket_matched": 0, "socket_fallbacks": 0}
 
-            # Nur gültige Nummern (mindestens 6 Ziffern)
-            if len(re.sub(r'[^\d]', '', phone)) >= 6:
-                print(f"📱 Rückrufnummer aus content extrahiert: {phone}")
-                return phone
+def _nearest_unmatched(cursor, webhook_timestamp, min_time):
+    """Zeitlich nächster ungematchter Eintrag ab min_time (bei gleichem Abstand der frühere)."""
+    before = cursor.execute(_NEAREST_BEFORE_SQL, (min_time, webhook_timestamp)).fetchone()
+    after = cursor.execute(_NEAREST_AFTER_SQL, (webhook_timestamp,)).fetchone()
 
-    return None
+    if before is None:
+        return after
+    if after is None:
+        return before
+    if after['timestamp'] - webhook_timestamp < webhook_timestamp - before['timestamp']:
+        return after
+    return before
 
-def find_real_phone_number(webhook_timestamp, time_window=300):
+def find_real_phone_number(webhook_timestamp, time_window=300, db=None):
     """
     Sucht die echte Telefonnummer aus der FritzBox-Lookup-Tabelle.
 
@@ -874,15 +236,49 @@ def find_real_phone_number(webhook_timestamp, time_window=300):
     - Verhindert dass mehrere Webhooks die gleiche Nummer bekommen (atomische Transaktion)
     - Zeitfenster: Nur Anrufe der letzten 5 Minuten
 
+    Zuerst wird der FritzBox-Monitor über seinen Socket gefragt (Suche im
+    Speicher, ``matched = 1`` trägt der Monitor vor der Antwort ein und nimmt
+    es zurück, wenn der Treffer nicht bestätigt wird). Ist er nicht erreichbar, wird in
+    SQLite mit zwei Index-Suchen (nächster Eintrag davor / danach) gesucht,
+    die Schreibsperre wird also nur kurz gehalten - auch wenn sich viele
+    ungematchte RINGs ansammeln.
+
     Args:
         webhook_timestamp: Unix-Timestamp des Webhooks
         time_window: Maximales Zeitfenster in Sekunden (default: 5 Minuten = 300s)
+        db: Optionale bereits ausgeliehene Verbindung. Läuft darauf schon eine
+            Transaktion (z.B. im Import), wird sie mitbenutzt statt eine eigene
+            zu öffnen - sonst würde sich der Aufruf selbst aussperren. Der
+            Socket wird dann nicht gefragt: der Monitor bräuchte für
+            ``matched = 1`` die Schreibsperre, die diese Transaktion hält.
 
     Returns:
         Echte Telefonnummer oder None
     """
+    if RING_SOCKET and not (db is not None and db.in_transaction):
+        try:
+            match = claim_nearest_ring(webhook_timestamp, time_window, RING_SOCKET)
+        except RingServiceUnavailable:
+            match_stats["socket_fallbacks"] += 1
+        else:
+            if match is None:
+                return None
+            match_stats["socket_matched"] += 1
+            time_diff = abs(webhook_timestamp - match['timestamp'])
+            logger.info(f"🔗 Echte Nummer vom FritzBox-Monitor (ID #{match['id']}, Δ{time_diff}s): {match['caller_number']}")
+            return match['caller_number']
+
+    return _find_real_phone_number_db(webhook_timestamp, time_window, db)
+
+def _find_real_phone_number_db(webhook_timestamp, time_window=300, db=None):
+    """SQLite-Variante von ``find_real_phone_number`` (Monitor-Socket nicht erreichbar)."""
+    if db is None:
+        with get_db() as db:
+            return _find_real_phone_number_db(webhook_timestamp, time_window, db)
+
+    match_stats["lookups"] += 1
+
     try:
-        db = get_db()
         cursor = db.cursor()
 
         # Zeitfenster: Nur Anrufe der letzten X Minuten berücksichtigen
@@ -890,25 +286,21 @@ def find_real_phone_number(webhook_timestamp, time_window=300):
         min_time = webhook_timestamp - time_window
 
         # WICHTIG: Exklusive Transaktion starten (verhindert Race Conditions!)
-        # BEGIN IMMEDIATE sperrt die DB sofort für andere Schreibzugriffe
-        db.execute("BEGIN IMMEDIATE")
+        # BEGIN IMMEDIATE sperrt die DB sofort für andere Schreibzugriffe.
+        # Bei einer bereits laufenden Transaktion des Aufrufers übernimmt diese das.
+        own_transaction = not db.in_transaction
+        if own_transaction:
+            db.execute("BEGIN IMMEDIATE")
 
         try:
-            # ZEITBASIERTES MATCHING: Nimm die Nummer die ZEITLICH AM NÄCHSTEN zum Webhook ist
-            # Nicht FIFO (ältester), sondern "closest match" im Zeitfenster!
-            # Das löst das Problem wenn Webhooks nicht in der richtigen Reihenfolge ankommen
-            cursor.execute("""
-            SELECT id, caller_number, timestamp
-            FROM phone_lookup
-            WHERE timestamp >= ?
-            AND matched = 0
-            ORDER BY ABS(timestamp - ?) ASC
-            LIMIT 1
-            """, (min_time, webhook_timestamp))
+            for attempt in range(MATCH_MAX_ATTEMPTS):
+                result = _nearest_unmatched(cursor, webhook_timestamp, min_time)
 
-            result = cursor.fetchone()
+                if result is None:
+                    if own_transaction:
+                        db.rollback()
+                    return None
 
-            if result:
                 entry_id = result['id']
                 caller_number = result['caller_number']
 
@@ -921,157 +313,595 @@ def find_real_phone_number(webhook_timestamp, time_window=300):
                 AND matched = 0
                 """, (entry_id,))
 
-                # Prüfe ob UPDATE erfolgreich war (könnte von anderem Thread bereits gematcht sein)
-                if cursor.rowcount == 0:
-                    # Ein anderer Thread hat diesen Eintrag bereits gematcht!
-                    db.rollback()
-                    db.close()
-                    print(f"⚠️  Race Condition: Eintrag #{entry_id} bereits gematcht - versuche erneut")
-                    # Rekursiver Aufruf, um nächsten freien Eintrag zu holen
-                    return find_real_phone_number(webhook_timestamp, time_window)
-
-                db.commit()
-                db.close()
-
-                time_diff = abs(webhook_timestamp - result['timestamp'])
-                print(f"🔗 Echte Nummer gefunden (ID #{entry_id}, Δ{time_diff}s): {caller_number}")
-                return caller_number
-
-            else:
+                if cursor.rowcount == 1:
+                    if own_transaction:
+                        db.commit()
+                    match_stats["matched"] += 1
+                    time_diff = abs(webhook_timestamp - result['timestamp'])
+                    logger.info(f"🔗 Echte Nummer gefunden (ID #{entry_id}, Δ{time_diff}s): {caller_number}")
+                    return caller_number
+
+                # Eintrag wurde zwischen Suche und UPDATE bereits gematcht - nächsten versuchen
+                match_stats["retries"] += 1
+                logger.warning(f"⚠️  Race Condition: Eintrag #{entry_id} bereits gematcht - "
+                      f"Versuch {attempt + 2}/{MATCH_MAX_ATTEMPTS}")
+
+            match_stats["exhausted"] += 1
+            logger.warning(f"⚠️  Keine Zuordnung nach {MATCH_MAX_ATTEMPTS} Versuchen")
+            if own_transaction:
                 db.rollback()
-                db.close()
-                return None
+            return None
 
         except Exception as e:
-            db.rollback()
-            db.close()
+            if own_transaction:
+                db.rollback()
             raise e
 
     except sqlite3.OperationalError:
         # Tabelle phone_lookup existiert nicht - FritzBox Monitor nicht aktiv
         return None
     except Exception as e:
-        print(f"Fehler beim Suchen der echten Nummer: {e}")
+        logger.error(f"Fehler beim Suchen der echten Nummer: {e}")
         return None
 
+INSERT_CALL_SQL = """
+INSERT INTO calls (log_ts, timestamp, caller_name, caller_gender, caller_dob, phone, phone_e164, call_reason, insurance_provider, category)
+VALUES (:log_ts, :timestamp, :caller_name, :caller_gender, :caller_dob, :phone, :phone_e164, :call_reason, :insurance_provider, :category)
+"""
+
+def resolve_forwarding(call, db=None):
+    """
+    Ersetzt bei einer Weiterleitung die Praxisnummer durch die echte Nummer von der FritzBox.
+
+    Neue Anrufe (Webhook, Ingest-Writer) rufen das VOR ``BEGIN IMMEDIATE``
+    auf, ohne ``db``: dann wird zuerst der Socket des FritzBox-Monitors
+    gefragt, der ``matched = 1`` selbst in SQLite einträgt und sonst auf die
+    eigene Transaktion warten müsste. Mit ``db`` in einer laufenden
+    Transaktion (Log-Import) wird nur in SQLite gesucht.
+
+    Returns:
+        call (verändert)
+    """
+    phone_number = call["phone"]
+
+    # STRATEGIE 3: Falls phone die Praxisnummer ist, versuche FritzBox Lookup (Fallback)
+    if same_subscriber(phone_number, PRAXIS_NUMBER):
+        logger.info(f"⚠️  Praxisnummer erkannt: {phone_number}")
+        real_number = find_real_phone_number(call["timestamp"], db=db)
+
+        if real_number:
+            call["phone"] = real_number
+            call["phone_e164"] = to_e164(real_number)
+            logger.info(f"✅ Ersetzt durch FritzBox-Nummer: {real_number}")
+        else:
+            logger.info("ℹ️  Keine echte Nummer gefunden - verwende 'Weiterleitung (Praxis)'")
+            call["phone"] = "Weiterleitung (Praxis)"
+            call["phone_e164"] = None
+
+    return call
+
+def store_call(db, log_ts, body, call=None):
+    """
+    Bereitet einen Anruf auf und fügt ihn in die calls-Tabelle ein (ohne Commit).
+
+    Der Aufrufer sollte die Transaktion mit BEGIN IMMEDIATE geöffnet haben,
+    damit Prüfung und Insert nicht mit einem parallelen Log-Import kollidieren.
+
+    Args:
+        call: Vor der Transaktion mit ``resolve_forwarding`` aufbereiteter
+            Anruf; ohne wird er hier aufbereitet (Weiterleitung nur über SQLite)
+
+    Returns:
+        dict mit den gespeicherten Spaltenwerten, oder None wenn der
+        Eintrag (z.B. durch den Log-Import) bereits existiert
+    """
+    if db.execute("SELECT 1 FROM calls WHERE log_ts = ?", (log_ts,)).fetchone() is not None:
+        return None
+
+    if call is None:
+        call = resolve_forwarding(prepare_call(log_ts, body), db)
+
+    db.execute(INSERT_CALL_SQL, call)
+    return call
+
+def write_call_batch(events):
+    """Speichert einen Batch (log_ts, body) aus der Ingest-Warteschlange mit EINEM Commit."""
+    # Weiterleitungen vor der Schreibsperre zuordnen (Socket-Zuordnung braucht sie selbst)
+    calls = [(log_ts, body, resolve_forwarding(prepare_call(log_ts, body))) for log_ts, body in events]
+    with get_db() as db:
+        db.execute("BEGIN IMMEDIATE")
+        for log_ts, body, call in calls:
+            store_call(db, log_ts, body, call)
+        db.commit()
+
+# Log-Follower: importiert regelmäßig neu angehängte Zeilen (IMPORT_FOLLOW_INTERVAL > 0)
+log_follower = PeriodicWorker(lambda: import_logs_to_db(), IMPORT_FOLLOW_INTERVAL, name="log-follower",
+                              log=logger.error)
+
+# Hintergrund-Writer für INGEST_MODE=async (wird in start_background_services gestartet)
+ingest_writer = IngestWriter(
+    write_call_batch,
+    max_queue=INGEST_QUEUE_SIZE,
+    max_batch=INGEST_BATCH_SIZE,
+    max_delay=INGEST_BATCH_DELAY_MS / 1000,
+    log=logger.warning,
+)
+
+def start_background_services():
+    """Startet Hintergrund-Threads (einmal pro Server-Prozess)."""
+    if INGEST_MODE == "async":
+        ingest_writer.start()
+        logger.info(f"🚀 Asynchroner Ingest aktiv (Queue: {INGEST_QUEUE_SIZE}, Batch: {INGEST_BATCH_SIZE})")
+    if IMPORT_FOLLOW_INTERVAL > 0:
+        log_follower.start()
+        logger.info(f"👀 Log-Follower aktiv (alle {IMPORT_FOLLOW_INTERVAL}s)")
+
+def stop_background_services():
+    """Stoppt Hintergrund-Threads; wartende Events werden noch geschrieben."""
+    log_follower.stop()
+    ingest_writer.stop()
+
+def prepare_server():
+    """Einmal beim Serverstart: Storage, Schema und Nachimport aus placetel_logs.jsonl."""
+    init_storage(DB_FILE, log=logger.info)
+    init_db()
+    import_logs_to_db()
+    warm_templates()
+    # Keine offenen SQLite-Verbindungen über fork() an Worker vererben
+    db_pool.reset()
+
+def reset_after_fork():
+    """Im Worker-Prozess nach fork(): geerbten Pool verwerfen, Log-Thread neu starten."""
+    db_pool.reset(close=False)
+    restart_logging_after_fork()
+
 def init_db():
     """Initialisiert die Datenbank und erstellt die Tabelle, falls sie nicht existiert."""
-    db = get_db()
-    cursor = db.cursor()
-    cursor.execute("""
-    CREATE TABLE IF NOT EXISTS calls (
-        id INTEGER PRIMARY KEY AUTOINCREMENT,
-        log_ts REAL UNIQUE NOT NULL,
-        status TEXT NOT NULL DEFAULT 'new',
-        timestamp INTEGER,
-        caller_name TEXT,
-        caller_gender TEXT,
-        caller_dob TEXT,
-        phone TEXT,
-        call_reason TEXT,
-        insurance_provider TEXT,
-        category TEXT
-    );
-    """)
-    cursor.execute("""
-    CREATE TABLE IF NOT EXISTS deleted_calls (
-        log_ts REAL PRIMARY KEY,
-        deleted_at INTEGER NOT NULL,
-        deleted_by TEXT
-    );
-    """)
-    db.commit()
-    db.close()
-    print("Datenbank initialisiert.")
+    with get_db() as db:
+        cursor = db.cursor()
+        cursor.execute("""
+        CREATE TABLE IF NOT EXISTS calls (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            log_ts REAL UNIQUE NOT NULL,
+            status TEXT NOT NULL DEFAULT 'new',
+            timestamp INTEGER,
+            caller_name TEXT,
+            caller_gender TEXT,
+            caller_dob TEXT,
+            phone TEXT,
+            phone_e164 TEXT,
+            call_reason TEXT,
+            insurance_provider TEXT,
+            category TEXT
+        );
+        """)
+        cursor.execute("""
+        CREATE TABLE IF NOT EXISTS deleted_calls (
+            log_ts REAL PRIMARY KEY,
+            deleted_at INTEGER NOT NULL,
+            deleted_by TEXT
+        );
+        """)
+        cursor.execute("""
+        CREATE TABLE IF NOT EXISTS import_checkpoint (
+            source TEXT PRIMARY KEY,
+            file_dev INTEGER NOT NULL,
+            file_ino INTEGER NOT NULL,
+            offset INTEGER NOT NULL,
+            last_ts REAL,
+            updated_at INTEGER NOT NULL
+        );
+        """)
+
+        # Kanonische Rufnummer (E.164) für exakte Index-Suchen; ältere Datenbanken nachrüsten
+        if ensure_column(db, "calls", "phone_e164", "TEXT"):
+            rows = db.execute("SELECT id, phone FROM calls WHERE phone IS NOT NULL").fetchall()
+            db.executemany("UPDATE calls SET phone_e164 = ? WHERE id = ?",
+                           [(to_e164(row['phone']), row['id']) for row in rows])
+            logger.info(f"🔧 phone_e164 für {len(rows)} bestehende Anrufe nachgetragen")
+        cursor.execute("CREATE INDEX IF NOT EXISTS idx_calls_phone_e164 ON calls(phone_e164)")
+
+        # Keyset-Paginierung nach (timestamp, id): die rowid ist implizit letzte Index-Spalte,
+        # ORDER BY timestamp DESC, id DESC läuft so ohne Sortieren direkt über den Index
+        cursor.execute("CREATE INDEX IF NOT EXISTS idx_calls_timestamp ON calls(timestamp)")
+        cursor.execute("CREATE INDEX IF NOT EXISTS idx_calls_status_timestamp ON calls(status, timestamp)")
+
+        # Volltextsuche über Name, Anliegen, Kategorie, Versicherung und Telefonnummer
+        if create_search_index(db):
+            logger.info("🔎 Volltextindex calls_fts aufgebaut")
+        elif not FTS5_AVAILABLE:
+            logger.warning("⚠️  SQLite ohne FTS5 - Suche läuft ohne Index (LIKE)")
+
+        # Zähler für die Statistik-Karten (gesamt, je Status, je Tag)
+        if create_counters(db):
+            logger.info("🔢 Zähler call_counters angelegt")
+
+        # Partieller Index für die Suche nach ungematchten FritzBox-RINGs
+        try:
+            cursor.execute("""
+            CREATE INDEX IF NOT EXISTS idx_unmatched_timestamp
+            ON phone_lookup(timestamp) WHERE matched = 0
+            """)
+        except sqlite3.OperationalError:
+            pass  # Tabelle phone_lookup existiert nicht - FritzBox Monitor nicht aktiv
+        db.commit()
+    logger.info("Datenbank initialisiert.")
+
+def _resume_offset(db, f):
+    """
+    Liefert die Byte-Position, ab der der Import fortgesetzt wird.
+
+    Beginnt von vorne (0), wenn die Datei ersetzt (Rotation, andere Inode)
+    oder gekürzt wurde, oder die gespeicherte Position nicht mehr auf einem
+    Zeilenanfang liegt. Das ist unkritisch: bereits importierte und
+    gelöschte Einträge werden anhand von log_ts übersprungen.
+    """
+    checkpoint = db.execute(
+        "SELECT file_dev, file_ino, offset FROM import_checkpoint WHERE source = ?",
+        (LOG_FILE.name,)
+    ).fetchone()
+    if checkpoint is None:
+        return 0
+
+    st = os.fstat(f.fileno())
+    offset = checkpoint['offset']
+
+    if (checkpoint['file_dev'], checkpoint['file_ino']) != (st.st_dev, st.st_ino):
+        logger.warning("🔄 Log-Datei wurde ersetzt - Import beginnt von vorne")
+        return 0
+
+    if offset > st.st_size:
+        logger.warning("🔄 Log-Datei wurde gekürzt - Import beginnt von vorne")
+        return 0
+
+    if offset > 0:
+        f.seek(offset - 1)
+        if f.read(1) != b"\n":
+            logger.warning("🔄 Import-Checkpoint passt nicht zur Log-Datei - Import beginnt von vorne")
+            return 0
+
+    return offset
+
+def _save_checkpoint(db, f, offset, last_ts):
+    st = os.fstat(f.fileno())
+    db.execute("""
+    INSERT INTO import_checkpoint (source, file_dev, file_ino, offset, last_ts, updated_at)
+    VALUES (?, ?, ?, ?, ?, ?)
+    ON CONFLICT(source) DO UPDATE SET
+        file_dev = excluded.file_dev,
+        file_ino = excluded.file_ino,
+        offset = excluded.offset,
+        last_ts = COALESCE(excluded.last_ts, import_checkpoint.last_ts),
+        updated_at = excluded.updated_at
+    """, (LOG_FILE.name, st.st_dev, st.st_ino, offset, last_ts, int(time.time())))
 
 def import_logs_to_db():
-    """Importiert neue Einträge aus der JSONL-Datei in die Datenbank."""
+    """
+    Importiert neue Einträge aus der JSONL-Datei in die Datenbank.
+
+    Der Import ist inkrementell: Nach jedem Batch werden Datei-Identität,
+    Byte-Position und letzter ts in ``import_checkpoint`` gespeichert (in
+    derselben Transaktion wie die Anrufe), der nächste Aufruf liest nur die
+    seitdem angehängten Zeilen. Eine noch unvollständige letzte Zeile wird
+    erst beim nächsten Durchlauf gelesen.
+
+    Returns:
+        Anzahl neu importierter Anrufe
+    """
     if not LOG_FILE.exists():
+        return 0
+
+    imported = 0
+
+    with _import_lock, get_db() as db, open(LOG_FILE, "rb") as f:
+        cursor = db.cursor()
+
+        while True:
+            # Schreibsperre für den ganzen Batch: andere Prozesse importieren nicht parallel dieselben Zeilen
+            db.execute("BEGIN IMMEDIATE")
+            offset = _resume_offset(db, f)
+            f.seek(offset)
+
+            last_ts = None
+            lines = 0
+            for line in f:
+                if not line.endswith(b"\n"):
+                    break  # Zeile wird gerade noch geschrieben
+
+                offset += len(line)
+                lines += 1
+
+                if line.strip():
+                    try:
+                        log_entry = json.loads(line)
+                        log_ts = log_entry.get("ts")
+                        if log_ts:
+                            last_ts = log_ts
+
+                            # Check if this entry was deleted by a user
+                            cursor.execute("SELECT log_ts FROM deleted_calls WHERE log_ts = ?", (log_ts,))
+                            deleted = cursor.fetchone() is not None
+
+                            # Skip entries that were intentionally deleted (store_call skips already imported ones)
+                            if not deleted:
+                                body = log_entry.get("body", {})
+                                if store_call(db, log_ts, body) is not None:
+                                    imported += 1
+                                    logger.debug("Neuer Anruf von %s importiert.", body.get('caller_name'))
+                    except ValueError:
+                        logger.warning(f"Fehler beim Parsen einer Zeile in der Log-Datei: {line!r}")
+
+                if lines >= IMPORT_BATCH_LINES:
+                    break
+
+            _save_checkpoint(db, f, offset, last_ts)
+            db.commit()
+
+            if lines < IMPORT_BATCH_LINES:
+                break
+
+    return imported
+
+
+def _iter_log_records(end, workers):
+    """
+    Liefert (log_ts, call) für alle Zeilen bis ``end`` in Dateireihenfolge.
+
+    Mit ``workers > 1`` wird die Datei in zeilengenaue Byte-Bereiche geteilt,
+    die in einem Prozess-Pool geparst werden (JSON + Nummern-Extraktion sind
+    CPU-lastig). ``map`` liefert die Ergebnisse in der Reihenfolge der
+    Bereiche, der einzige Schreiber sieht also dieselbe Reihenfolge wie beim
+    seriellen Lesen.
+    """
+    if workers <= 1:
+        yield from iter_log_range(LOG_FILE, 0, end)
         return
 
-    db = get_db()
-    cursor = db.cursor()
+    # Mehr Bereiche als Worker, damit ungleich große Bereiche sich ausgleichen
+    ranges = split_log_ranges(LOG_FILE, workers * 4, end=end)
+    logger.info(f"⚙️  Parse {len(ranges)} Bereiche mit {workers} Prozessen")
+
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        starts = [start for start, _ in ranges]
+        ends = [range_end for _, range_end in ranges]
+        for records in executor.map(parse_log_range, repeat(LOG_FILE), starts, ends):
+            yield from records
+
+def bulk_import_logs(rebuild=False, workers=1):
+    """
+    Schneller Komplett-Import der JSONL-Datei (z.B. nach Migration oder Korruption).
+
+    Unterschiede zum inkrementellen ``import_logs_to_db``:
+    - Bekannte log_ts und gelöschte Einträge (Tombstones) werden einmal in
+      Sets geladen statt pro Zeile abgefragt
+    - Inserts per ``executemany`` in großen Blöcken, eine Transaktion
+    - Sekundäre Indizes auf ``calls`` werden vor dem Laden entfernt und
+      danach neu aufgebaut
+    - FritzBox-Zuordnung für Weiterleitungen im Speicher (``RingIndex``)
+
+    Args:
+        rebuild: True = calls-Tabelle vorher leeren und komplett neu aufbauen.
+            Status ("erledigt") und bereits zugeordnete FritzBox-Nummern
+            vorhandener Anrufe bleiben erhalten.
+        workers: Anzahl Prozesse zum Parsen der Log-Datei (1 = seriell)
+
+    Returns:
+        Anzahl importierter Anrufe
+    """
+    if not LOG_FILE.exists():
+        logger.error(f"❌ Log-Datei nicht gefunden: {LOG_FILE}")
+        return 0
+
+    started = time.monotonic()
+    imported = 0
 
-    with open(LOG_FILE, "r", encoding="utf-8") as f:
-        for line in f:
-            if not line.strip():
-                continue
+    # Nur vollständige Zeilen - eine gerade geschriebene Zeile holt der nächste Import
+    end = complete_length(LOG_FILE)
 
+    with _import_lock, get_db() as db, open(LOG_FILE, "rb") as f:
+        db.execute("PRAGMA synchronous = OFF")
+        try:
+            db.execute("BEGIN IMMEDIATE")
+
+            # Volltextindex und Zähler nicht pro Zeile per Trigger pflegen, sondern am Ende neu aufbauen
+            drop_search_triggers(db)
+            drop_counter_triggers(db)
+
+            tombstones = {row[0] for row in db.execute("SELECT log_ts FROM deleted_calls")}
+
+            statuses = {}
+            previous_phones = {}
+            if rebuild:
+                for row in db.execute("SELECT log_ts, status, phone FROM calls"):
+                    if row['status'] != 'new':
+                        statuses[row['log_ts']] = row['status']
+                    previous_phones[row['log_ts']] = row['phone']
+                db.execute("DELETE FROM calls")
+                logger.info(f"🗑️  calls-Tabelle geleert ({len(statuses)} Status-Werte werden übernommen)")
+
+            known = {row[0] for row in db.execute("SELECT log_ts FROM calls")}
+            logger.info(f"📋 {len(known)} bekannte Anrufe, {len(tombstones)} gelöschte Einträge")
+
+            # Ungematchte FritzBox-Nummern für Weiterleitungen
+            rings = RingIndex()
             try:
-                log_entry = json.loads(line)
-                log_ts = log_entry.get("ts")
-                if not log_ts: continue
-
-                # Check if this entry was deleted by a user
-                cursor.execute("SELECT log_ts FROM deleted_calls WHERE log_ts = ?", (log_ts,))
-                if cursor.fetchone() is not None:
-                    # Skip this entry - it was intentionally deleted
+                for row in db.execute("SELECT id, timestamp, caller_number FROM phone_lookup WHERE matched = 0 ORDER BY timestamp, id"):
+                    rings.add(row['timestamp'], (row['id'], row['caller_number']))
+            except sqlite3.OperationalError:
+                pass  # Tabelle phone_lookup existiert nicht - FritzBox Monitor nicht aktiv
+            matched_ids = []
+
+            # Sekundäre Indizes entfernen (werden nach dem Laden in einem Durchgang neu gebaut)
+            indexes = db.execute(
+                "SELECT name, sql FROM sqlite_master WHERE type = 'index' AND tbl_name = 'calls' AND sql IS NOT NULL"
+            ).fetchall()
+            for index in indexes:
+                db.execute(f'DROP INDEX "{index["name"]}"')
+
+            batch = []
+
+            def flush():
+                nonlocal imported
+                db.executemany(INSERT_CALL_SQL, batch)
+                imported += len(batch)
+                batch.clear()
+                elapsed = time.monotonic() - started
+                logger.info(f"⏳ {imported} Anrufe importiert ({imported / elapsed:,.0f} Zeilen/s)")
+
+            skip = known | tombstones
+            for log_ts, call in _iter_log_records(end, workers):
+                if log_ts in skip:
                     continue
+                skip.add(log_ts)  # doppelte Zeilen im Log nur einmal importieren
+
+                phone_number = call["phone"]
+
+                # Weiterleitung: echte Nummer aus dem FritzBox-Lookup im Speicher zuordnen
+                if same_subscriber(phone_number, PRAXIS_NUMBER):
+                    previous_phone = previous_phones.get(log_ts)
+                    match = None if previous_phone else rings.claim_nearest(call["timestamp"])
+                    if previous_phone:
+                        # Beim Rebuild: frühere Zuordnung behalten (Lookup-Eintrag ist schon gematcht)
+                        call["phone"] = previous_phone
+                    elif match:
+                        entry_id, caller_number = match[1]
+                        matched_ids.append((entry_id,))
+                        call["phone"] = caller_number
+                    else:
+                        call["phone"] = "Weiterleitung (Praxis)"
+                    call["phone_e164"] = to_e164(call["phone"])
 
-                cursor.execute("SELECT id FROM calls WHERE log_ts = ?", (log_ts,))
-                if cursor.fetchone() is not None:
-                    continue
+                batch.append(call)
 
-                body = log_entry.get("body", {})
+                if len(batch) >= BULK_IMPORT_CHUNK:
+                    flush()
 
-                # Extract category (comes as array, store as comma-separated string)
-                category_data = body.get("category")
-                category_str = None
-                if category_data:
-                    if isinstance(category_data, list):
-                        category_str = ", ".join(category_data)
-                    else:
-                        category_str = str(category_data)
+            if batch:
+                flush()
 
-                # STRATEGIE 1: Versuche Rückrufnummer aus content zu extrahieren (BESTE Methode!)
-                phone_number = None
-                content = body.get("content")
+            if statuses:
+                db.executemany("UPDATE calls SET status = ? WHERE log_ts = ?",
+                               [(status, log_ts) for log_ts, status in statuses.items()])
 
-                if content:
-                    extracted_phone = extract_phone_from_content(content)
-                    if extracted_phone:
-                        phone_number = extracted_phone
+            if matched_ids:
+                db.executemany("UPDATE phone_lookup SET matched = 1 WHERE id = ? AND matched = 0", matched_ids)
+                logger.info(f"🔗 {len(matched_ids)} Weiterleitungen FritzBox-Nummern zugeordnet")
 
-                # STRATEGIE 2: Falls keine Nummer im content, nutze phone-Feld
-                if not phone_number:
-                    phone_number = body.get("phone")
+            logger.info(f"🔧 Baue {len(indexes)} Indizes neu auf...")
+            for index in indexes:
+                db.execute(index["sql"])
+            rebuild_search_index(db)
+            create_search_triggers(db)
+            recompute_counters(db)
+            create_counter_triggers(db)
 
-                # STRATEGIE 3: Falls phone die Praxisnummer enthält, versuche FritzBox Lookup (Fallback)
-                if phone_number and PRAXIS_NUMBER in phone_number:
-                    real_number = find_real_phone_number(int(log_ts))
+            # Inkrementeller Import macht am Dateiende weiter
+            _save_checkpoint(db, f, end, None)
+            db.commit()
 
-                    if real_number:
-                        phone_number = real_number
-                    else:
-                        phone_number = "Weiterleitung (Praxis)"
+        except Exception:
+            db.rollback()
+            raise
 
-                # Call reason: Nutze call_reason, falls vorhanden, sonst content als Fallback
-                call_reason = body.get("call_reason")
-                if not call_reason and content:
-                    # Fallback: Nutze content, aber kürze auf max 200 Zeichen
-                    call_reason = content[:200] if len(content) > 200 else content
+        finally:
+            db.execute(f"PRAGMA synchronous = {SQLITE_SYNCHRONOUS}")
 
-                cursor.execute("""
-                INSERT INTO calls (log_ts, timestamp, caller_name, caller_gender, caller_dob, phone, call_reason, insurance_provider, category)
-                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
-                """, (
-                    log_ts,
-                    int(log_ts),
-                    body.get("caller_name"),
-                    body.get("caller_gender"),
-                    body.get("caller_dob"),
-                    phone_number,
-                    call_reason,
-                    body.get("insurance_provider"),
-                    category_str
-                ))
-                print(f"Neuer Anruf von {body.get('caller_name')} importiert.")
-            except json.JSONDecodeError:
-                print(f"Fehler beim Parsen einer Zeile in der Log-Datei: {line}")
-    
-    db.commit()
-    db.close()
+    elapsed = time.monotonic() - started
+    rate = imported / elapsed if elapsed > 0 else 0
+    logger.info(f"✅ Bulk-Import fertig: {imported} Anrufe in {elapsed:.1f}s ({rate:,.0f} Zeilen/s)")
+    return imported
+
+
+# --- Anrufliste (Keyset-Paginierung) ---
+CALL_LIST_COLUMNS = ("id, status, timestamp, caller_name, caller_dob, phone, "
+                     "call_reason, insurance_provider, category")
+
+def encode_cursor(call):
+    """Cursor für die Seite nach ``call`` (letzter Eintrag der aktuellen Seite)."""
+    return f"{call['timestamp']}:{call['id']}"
+
+def decode_cursor(value):
+    """``"timestamp:id"`` -> (timestamp, id); ValueError bei ungültigem Cursor."""
+    timestamp, _, call_id = value.partition(":")
+    return int(timestamp), int(call_id)
+
+def query_calls(db, limit=API_PAGE_SIZE, cursor=None, status=None, since=None, until=None):
+    """
+    Eine Seite der Anrufliste, neueste zuerst (ORDER BY timestamp DESC, id DESC).
+
+    Statt OFFSET setzt die nächste Seite hinter dem letzten Eintrag der
+    vorherigen an (``cursor``) - jede Seite ist eine Index-Suche, egal wie
+    weit zurückgeblättert wird, und neue Anrufe verschieben nichts.
+
+    Args:
+        limit: Anzahl Einträge
+        cursor: (timestamp, id) des letzten Eintrags der vorherigen Seite
+        status: 'new' / 'done' oder None
+        since: Nur Anrufe mit timestamp >= since
+        until: Nur Anrufe mit timestamp < until
 
+    Returns:
+        (Liste von dicts, Cursor der nächsten Seite oder None)
+    """
+    where, params = [], []
+    if status is not None:
+        where.append("status = ?")
+        params.append(status)
+    if since is not None:
+        where.append("timestamp >= ?")
+        params.append(since)
+    if cursor is not None:
+        where.append("(timestamp, id) < (?, ?)")
+        params.extend(cursor)
+    # until nur, wenn der Cursor nicht ohnehin darunter liegt - sonst wählt
+    # SQLite die until-Grenze für die Index-Suche und überspringt Zeile für Zeile
+    if until is not None and (cursor is None or cursor[0] >= until):
+        where.append("timestamp < ?")
+        params.append(until)
+
+    sql = f"SELECT {CALL_LIST_COLUMNS} FROM calls"
+    if where:
+        sql += " WHERE " + " AND ".join(where)
+    sql += " ORDER BY timestamp DESC, id DESC LIMIT ?"
+    params.append(limit + 1)
+
+    rows = [dict(row) for row in db.execute(sql, params)]
+    if len(rows) > limit:
+        return rows[:limit], encode_cursor(rows[limit - 1])
+    return rows, None
+
+# --- Conditional GET ---
+def conditional_get(view):
+    """
+    Antwortet mit 304, solange sich an den Anrufen nichts geändert hat.
+
+    Der (starke) ETag ergibt sich aus dem Datenstand in ``call_counters``
+    (``version``, per Trigger bei jeder Änderung an ``calls`` erhöht), dem
+    Tag (für "Heute"), der Version von Template/Assets und der URL samt
+    Query-Parametern. Bei passendem ``If-None-Match`` wird ``calls`` gar
+    nicht gelesen.
+    """
+    @functools.wraps(view)
+    def wrapper(*args, **kwargs):
+        # Datenstand vor dem Rendern lesen: ändert sich etwas dazwischen, passt der ETag
+        # beim nächsten Mal nicht mehr und die Seite wird neu geladen
+        with get_db() as db:
+            version = read_version(db)
+        key = f"{version}|{date.today()}|{release_version()}|{request.full_path}"
+        etag = hashlib.sha256(key.encode()).hexdigest()[:24]
+
+        if request.if_none_match.contains(etag):
+            response = Response(status=304)
+        else:
+            response = make_response(view(*args, **kwargs))
+            if response.status_code != 200:
+                return response
+        response.set_etag(etag)
+        # Browser darf die Antwort speichern, muss aber jedes Mal nachfragen
+        response.cache_control.private = True
+        response.cache_control.no_cache = True
+        return response
+    return wrapper
 
 # --- Flask Routen ---
 @app.template_filter('format_ts')
@@ -1111,76 +941,24 @@ def placetel_webhook():
 
     try:
         # Write to log file
-        with open(LOG_FILE, "a", encoding="utf-8") as f:
-            f.write(json.dumps(log_entry, ensure_ascii=False) + "\n")
+        audit_log.append(log_entry)
 
-        # Write to database
-        db = get_db()
-        cursor = db.cursor()
+        # Async-Modus: Event ist in der JSONL-Datei gesichert, DB-Insert macht der Writer-Thread
+        if ingest_writer.submit((log_ts, data)):
+            return jsonify({"status": "ok", "log_ts": log_ts, "queued": True}), 200
 
-        # Extract category (comes as array, store as comma-separated string)
-        category_data = data.get("category")
-        category_str = None
-        if category_data:
-            if isinstance(category_data, list):
-                category_str = ", ".join(category_data)
-            else:
-                category_str = str(category_data)
-
-        # STRATEGIE 1: Versuche Rückrufnummer aus content zu extrahieren (BESTE Methode!)
-        phone_number = None
-        content = data.get("content")
-
-        if content:
-            extracted_phone = extract_phone_from_content(content)
-            if extracted_phone:
-                phone_number = extracted_phone
-                print(f"✅ Nummer aus content extrahiert: {phone_number}")
-
-        # STRATEGIE 2: Falls keine Nummer im content, nutze phone-Feld
-        if not phone_number:
-            phone_number = data.get("phone")
-
-        # STRATEGIE 3: Falls phone die Praxisnummer enthält, versuche FritzBox Lookup (Fallback)
-        if phone_number and PRAXIS_NUMBER in phone_number:
-            print(f"⚠️  Praxisnummer erkannt in Webhook: {phone_number}")
-            real_number = find_real_phone_number(int(log_ts))
-
-            if real_number:
-                phone_number = real_number
-                print(f"✅ Ersetzt durch FritzBox-Nummer: {real_number}")
-            else:
-                print(f"ℹ️  Keine echte Nummer gefunden - verwende 'Weiterleitung (Praxis)'")
-                phone_number = "Weiterleitung (Praxis)"
-
-        # Call reason: Nutze call_reason, falls vorhanden, sonst content als Fallback
-        call_reason = data.get("call_reason")
-        if not call_reason and content:
-            # Fallback: Nutze content, aber kürze auf max 200 Zeichen
-            call_reason = content[:200] if len(content) > 200 else content
-
-        cursor.execute("""
-        INSERT INTO calls (log_ts, timestamp, caller_name, caller_gender, caller_dob, phone, call_reason, insurance_provider, category)
-        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
-        """, (
-            log_ts,
-            int(log_ts),
-            data.get("caller_name"),
-            data.get("caller_gender"),
-            data.get("caller_dob"),
-            phone_number,
-            call_reason,
-            data.get("insurance_provider"),
-            category_str
-        ))
-        db.commit()
-        db.close()
+        # Write to database - Weiterleitung vor der Schreibsperre zuordnen
+        call = resolve_forwarding(prepare_call(log_ts, data))
+        with get_db() as db:
+            db.execute("BEGIN IMMEDIATE")
+            store_call(db, log_ts, data, call)
+            db.commit()
 
         return jsonify({"status": "ok", "log_ts": log_ts}), 200
 
     except Exception as e:
         # Log error but don't expose internal details to client
-        print(f"Error processing webhook: {e}")
+        logger.error(f"Error processing webhook: {e}")
         return jsonify({"error": "Internal server error"}), 500
 
 @app.get("/")
@@ -1189,12 +967,97 @@ def health_check():
 
 @app.get("/dashboard")
 @auth.login_required
+@conditional_get
 def dashboard():
     """Zeigt das Dashboard mit Daten aus der SQLite-DB."""
-    db = get_db()
-    calls = db.execute("SELECT * FROM calls ORDER BY timestamp DESC").fetchall()
-    db.close()
-    return render_template_string(DASHBOARD_TEMPLATE, calls=calls)
+    with get_db() as db:
+        calls, next_cursor = query_calls(db, API_PAGE_SIZE)
+        stats = read_stats(db)
+    return render_template("dashboard.html", stats=stats, page_size=API_PAGE_SIZE,
+                           initial_page={"calls": calls, "next_cursor": next_cursor})
+
+@app.get("/api/calls")
+@auth.login_required
+@conditional_get
+def api_calls():
+    """
+    Anrufliste als JSON, seitenweise (neueste zuerst).
+
+    Query-Parameter: limit, cursor (``next_cursor`` der vorherigen Antwort),
+    status (new/done), since / until (Unix-Zeitstempel).
+    """
+    args = request.args
+    try:
+        limit = int(args.get("limit", API_PAGE_SIZE))
+        cursor = decode_cursor(args["cursor"]) if args.get("cursor") else None
+        since = int(args["since"]) if args.get("since") else None
+        until = int(args["until"]) if args.get("until") else None
+    except ValueError:
+        return jsonify({"status": "error", "message": "Invalid limit, cursor, since or until"}), 400
+
+    status = args.get("status") or None
+    if status not in (None, 'new', 'done'):
+        return jsonify({"status": "error", "message": "Invalid status"}), 400
+    limit = max(1, min(limit, API_MAX_PAGE_SIZE))
+
+    with get_db() as db:
+        calls, next_cursor = query_calls(db, limit, cursor, status, since, until)
+    return jsonify({"calls": calls, "next_cursor": next_cursor})
+
+@app.get("/api/stats")
+@auth.login_required
+@conditional_get
+def api_stats():
+    """
+    Zahlen der Statistik-Karten aus ``call_counters`` (unabhängig von der Anzahl der Anrufe).
+
+    Query-Parameter: days (optional, 1-366) - zusätzlich Anrufe pro Tag als ``by_day``.
+    """
+    try:
+        days = int(request.args.get("days", 0))
+    except ValueError:
+        return jsonify({"status": "error", "message": "Invalid days"}), 400
+    if not 0 <= days <= 366:
+        return jsonify({"status": "error", "message": "days must be between 0 and 366"}), 400
+
+    with get_db() as db:
+        return jsonify(read_stats(db, days=days))
+
+@app.get("/api/calls/search")
+@auth.login_required
+@conditional_get
+def api_calls_search():
+    """
+    Volltextsuche (Präfix, nach Relevanz sortiert), seitenweise.
+
+    Query-Parameter: q, limit, cursor (``next_cursor`` der vorherigen
+    Antwort), status, since, until wie bei ``/api/calls``.
+    """
+    args = request.args
+    text = args.get("q", "").strip()
+    if not text:
+        return jsonify({"status": "error", "message": "Missing q"}), 400
+    try:
+        limit = int(args.get("limit", API_PAGE_SIZE))
+        offset = int(args.get("cursor") or 0)
+        since = int(args["since"]) if args.get("since") else None
+        until = int(args["until"]) if args.get("until") else None
+    except ValueError:
+        return jsonify({"status": "error", "message": "Invalid limit, cursor, since or until"}), 400
+
+    status = args.get("status") or None
+    if status not in (None, 'new', 'done'):
+        return jsonify({"status": "error", "message": "Invalid status"}), 400
+    limit = max(1, min(limit, API_MAX_PAGE_SIZE))
+    offset = max(0, offset)
+
+    columns = ", ".join(f"c.{column.strip()}" for column in CALL_LIST_COLUMNS.split(","))
+    with get_db() as db:
+        # Ein Eintrag mehr zeigt an, ob es eine weitere Seite gibt
+        calls, ranked = search_calls(db, text, columns, limit + 1, offset, status, since, until)
+
+    next_cursor = str(offset + limit) if len(calls) > limit else None
+    return jsonify({"calls": calls[:limit], "next_cursor": next_cursor, "ranked": ranked})
 
 @app.post("/call/<int:call_id>/status")
 @auth.login_required
@@ -1206,58 +1069,73 @@ def update_call_status(call_id):
     if new_status not in ['new', 'done']:
         return jsonify({"status": "error", "message": "Invalid status"}), 400
 
-    db = get_db()
-    cursor = db.cursor()
-    cursor.execute("UPDATE calls SET status = ? WHERE id = ?", (new_status, call_id))
-    db.commit()
+    with get_db() as db:
+        cursor = db.cursor()
+        cursor.execute("UPDATE calls SET status = ? WHERE id = ?", (new_status, call_id))
+        db.commit()
 
     if cursor.rowcount == 0:
-        db.close()
         return jsonify({"status": "error", "message": "Call not found"}), 404
 
-    db.close()
     return jsonify({"status": "ok"})
 
 @app.post("/call/<int:call_id>/delete")
 @auth.login_required
 def delete_call(call_id):
     """Löscht einen Anruf aus der Datenbank."""
-    db = get_db()
-    cursor = db.cursor()
+    with get_db() as db:
+        cursor = db.cursor()
 
-    # First, retrieve the log_ts value before deleting
-    cursor.execute("SELECT log_ts FROM calls WHERE id = ?", (call_id,))
-    result = cursor.fetchone()
+        # First, retrieve the log_ts value before deleting
+        cursor.execute("SELECT log_ts FROM calls WHERE id = ?", (call_id,))
+        result = cursor.fetchone()
 
-    if result is None:
-        db.close()
-        return jsonify({"status": "error", "message": "Call not found"}), 404
+        if result is None:
+            return jsonify({"status": "error", "message": "Call not found"}), 404
 
-    log_ts = result['log_ts']
+        log_ts = result['log_ts']
 
-    # Insert into deleted_calls table to track this deletion
-    cursor.execute("""
-    INSERT OR IGNORE INTO deleted_calls (log_ts, deleted_at, deleted_by)
-    VALUES (?, ?, ?)
-    """, (log_ts, int(time.time()), auth.current_user()))
+        # Insert into deleted_calls table to track this deletion
+        cursor.execute("""
+        INSERT OR IGNORE INTO deleted_calls (log_ts, deleted_at, deleted_by)
+        VALUES (?, ?, ?)
+        """, (log_ts, int(time.time()), auth.current_user()))
 
-    # Now delete the call
-    cursor.execute("DELETE FROM calls WHERE id = ?", (call_id,))
-    db.commit()
-    db.close()
+        # Now delete the call
+        cursor.execute("DELETE FROM calls WHERE id = ?", (call_id,))
+        db.commit()
 
-    print(f"Anruf gelöscht und in deleted_calls gespeichert: log_ts={log_ts}")
+    logger.info(f"Anruf gelöscht und in deleted_calls gespeichert: log_ts={log_ts}")
     return jsonify({"status": "ok"})
 
 @app.post("/import-logs")
 @auth.login_required
 def trigger_import():
     """Manueller Endpunkt, um den Import aus der JSONL-Datei anzustoßen."""
-    import_logs_to_db()
-    return jsonify({"status": "ok", "message": "Import finished."})
+    imported = import_logs_to_db()
+    return jsonify({"status": "ok", "message": "Import finished.", "imported": imported})
 
 
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Placetel Webhook-Server mit Anruf-Dashboard")
+    parser.add_argument("--bulk-import", action="store_true",
+                        help="Alle fehlenden Anrufe aus placetel_logs.jsonl schnell importieren und beenden")
+    parser.add_argument("--rebuild", action="store_true",
+                        help="calls-Tabelle komplett aus placetel_logs.jsonl neu aufbauen und beenden")
+    parser.add_argument("--workers", type=int, default=BULK_IMPORT_WORKERS,
+                        help="Prozesse zum Parsen beim Bulk-Import (Standard: BULK_IMPORT_WORKERS oder 1)")
+    args = parser.parse_args()
+
+    init_storage(DB_FILE, log=logger.info)
     init_db()
+
+    if args.bulk_import or args.rebuild:
+        bulk_import_logs(rebuild=args.rebuild, workers=args.workers)
+        sys.exit(0)
+
     import_logs_to_db()
-    app.run(host="0.0.0.0", port=PORT, debug=True)
\ No newline at end of file
+    start_background_services()
+    atexit.register(stop_background_services)
+    if not DEBUG:
+        logger.warning("⚠️  Entwicklungsserver - im Betrieb gunicorn verwenden: gunicorn -c gunicorn.conf.py wsgi:app")
+    app.run(host="0.0.0.0", port=PORT, debug=DEBUG)
\ No newline at end of file
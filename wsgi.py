@@ -0,0 +1,14 @@
+"""
+WSGI-Einstiegspunkt für den Betrieb mit gunicorn
+================================================
+
+    gunicorn -c gunicorn.conf.py wsgi:app
+
+Schema-Initialisierung, Nachimport und Hintergrund-Threads übernehmen die
+Hooks in ``gunicorn.conf.py``; der Import hier liest nur Konfiguration
+und richtet das Logging ein.
+"""
+
+from webhook_server_prod import app
+
+__all__ = ["app"]